@@ -0,0 +1,138 @@
+"""Memory and throughput benchmarks for PyPPArray storage.
+
+Compares compact typed storage against the old list-of-boxed-objects
+storage on million-element arrays, and streaming pipelines over lazy
+ranges against materializing every stage.
+    
+    python benchmarks/bench_arrays.py [--size N]
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+import tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advanced import PyPPArray, ArrayMath
+from src.builtins_advanced import builtin_range
+
+def list_backed(items):
+    """An array forced onto list storage, as before compact arrays."""
+    arr = PyPPArray()
+    arr.items = list(items)
+    return arr
+
+def measure_memory(build):
+    tracemalloc.start()
+    arr = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return arr, size
+
+def measure_time(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=1000000)
+    args = parser.parse_args()
+    n = args.size
+    
+    cases = [
+        ('range(n) list', lambda: list_backed(range(n))),
+        ('range(n) compact', lambda: PyPPArray(list(range(n)))),
+        ('range(n) lazy', lambda: builtin_range(n)),
+        ('floats list', lambda: list_backed(i * 0.5 for i in range(n))),
+        ('floats compact', lambda: PyPPArray([i * 0.5 for i in range(n)])),
+    ]
+    print(f"{'case':<20}{'memory MB':>12}{'build s':>10}{'push s':>10}{'get s':>10}{'sort s':>10}")
+    for name, build in cases:
+        arr, size = measure_memory(build)
+        build_time = measure_time(build)
+        
+        def push_all():
+            if name.endswith('list'):
+                # The old push was a bare list append
+                push = [].append
+            else:
+                push = PyPPArray().push
+            for i in range(n):
+                push(i)
+        
+        def get_all():
+            for i in range(n):
+                arr.get(i)
+        
+        def sort_copy():
+            copy = build()
+            copy.sort()
+        
+        print(f"{name:<20}{size / 1e6:>12.1f}{build_time:>10.3f}"
+              f"{measure_time(push_all, 1):>10.3f}{measure_time(get_all, 1):>10.3f}"
+              f"{measure_time(sort_copy, 1):>10.3f}")
+    
+    queue_benchmark(n)
+    streaming_benchmark(n)
+
+def queue_workload(arr, n):
+    """Fill a queue with n items, then alternate shift and push."""
+    for i in range(n):
+        arr.push(i)
+    for i in range(n):
+        arr.push(arr.shift() + 1)
+    while arr.length():
+        arr.shift()
+
+class OldQueueArray(PyPPArray):
+    """Front operations as they were before the head offset: O(n) each."""
+    
+    def shift(self):
+        return self.items.pop(0)
+    
+    def length(self):
+        return len(self.items)
+
+def queue_benchmark(n):
+    print()
+    print(f"{'queue size':<20}{'old s':>12}{'new s':>12}{'new ns/op':>12}")
+    for size in (n // 40, n // 10, n // 4, n // 2, n):
+        old = '-'
+        if size <= 100000:
+            old = f"{measure_time(lambda: queue_workload(OldQueueArray(), size), 1):.3f}"
+        new = measure_time(lambda: queue_workload(PyPPArray(), size), 1)
+        print(f"{size:<20}{old:>12}{new:>12.3f}{new / (4 * size) * 1e9:>12.0f}")
+
+def pipeline_peak(n, eager):
+    """Peak traced memory of sum(take(filter(map(range(n), sqrt), ...), n))."""
+    def pipeline():
+        arr = builtin_range(n)
+        if eager:
+            arr = PyPPArray(list(arr))
+        return arr.map(math.sqrt).filter(lambda x: x > 1).take(n)
+    
+    tracemalloc.start()
+    start = time.perf_counter()
+    ArrayMath.sum(pipeline())
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed
+
+def streaming_benchmark(n):
+    print()
+    print(f"{'pipeline size':<20}{'eager MB':>12}{'lazy MB':>12}{'eager s':>10}{'lazy s':>10}")
+    for size in (n // 10, n):
+        eager_peak, eager_time = pipeline_peak(size, True)
+        lazy_peak, lazy_time = pipeline_peak(size, False)
+        print(f"{size:<20}{eager_peak / 1e6:>12.2f}{lazy_peak / 1e6:>12.2f}"
+              f"{eager_time:>10.3f}{lazy_time:>10.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Independent waits run one after another versus concurrently.
+
+Times --n waits of --seconds each: with sleep() in a loop (run on a
+sample of --sample waits and scaled up), and as async functions awaiting
+sleepAsync() whose calls are run together by gather().
+    
+    python benchmarks/bench_async.py [--n N] [--seconds S] [--sample N]
+"""
+
+import argparse
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.evaluator import Evaluator
+
+BLOCKING = """
+for (let i = 0; i < n; i = i + 1) {
+    sleep(seconds);
+}
+"""
+
+CONCURRENT = """
+async fn wait(i) {
+    await sleepAsync(seconds);
+    return i;
+}
+let tasks = array();
+for (let i = 0; i < n; i = i + 1) {
+    push(tasks, wait(i));
+}
+let results = await gather(tasks);
+"""
+
+def run(source, **values):
+    evaluator = Evaluator()
+    evaluator.globals.update(values)
+    program = Parser(Lexer(source).tokenize()).parse()
+    start = time.perf_counter()
+    evaluator.eval(program)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, default=100)
+    parser.add_argument('--seconds', type=float, default=1.0)
+    parser.add_argument('--sample', type=int, default=3)
+    args = parser.parse_args()
+    
+    print(f"{'waits':<12}{'s':>10}")
+    sample = min(args.sample, args.n)
+    blocking = run(BLOCKING, n=sample, seconds=args.seconds) * args.n / sample
+    print(f"{'sleep':<12}{blocking:>10.3f}  (est. from {sample})")
+    concurrent = run(CONCURRENT, n=args.n, seconds=args.seconds)
+    print(f"{'gather':<12}{concurrent:>10.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Per-element overhead of calling py++ functions from builtins.
+
+Compares Evaluator.call_function (fresh scope per call) with the reusable
+FunctionInvoker frame, for a small closure and a wide one, and a py++
+map() against the equivalent loop.
+    
+    python benchmarks/bench_callbacks.py [--size N]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.evaluator import Evaluator
+from src.builtins_advanced import PyPPFunction
+
+SETUP = """
+let k = 3;
+fn scale(x) { return x * k; }
+"""
+
+LOOP = """
+let out = array();
+for (let i = 0; i < len(xs); i = i + 1) {
+    push(out, scale(get(xs, i)));
+}
+"""
+
+def run(evaluator, source):
+    evaluator.eval(Parser(Lexer(source).tokenize()).parse())
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=200000)
+    parser.add_argument('--closure', type=int, default=200,
+                        help='names captured by the function, as when it is declared in a large scope')
+    args = parser.parse_args()
+    n = args.size
+    
+    evaluator = Evaluator()
+    run(evaluator, SETUP)
+    # get() here means array indexing, as in the scripts this models
+    evaluator.globals['get'] = lambda arr, i: arr.get(i)
+    evaluator.globals['xs'] = evaluator.builtins['range'](n)
+    scale = evaluator.get_variable('scale')
+    captured = {f'v{i}': i for i in range(args.closure)}
+    wide = PyPPFunction(scale.params, scale.body, {**scale.closure, **captured}, evaluator)
+    
+    def per_call_scope(func):
+        def run_calls():
+            for i in range(n):
+                evaluator.call_function(func, [i])
+        return run_calls
+    
+    def invoker(func):
+        def run_calls():
+            call = evaluator.invoker(func)
+            for i in range(n):
+                call(i)
+        return run_calls
+    
+    cases = [
+        ('call_function', per_call_scope(scale)),
+        ('invoker', invoker(scale)),
+        (f'call_function/{args.closure}', per_call_scope(wide)),
+        (f'invoker/{args.closure}', invoker(wide)),
+        ('py++ for loop', lambda: run(evaluator, LOOP)),
+        # map() over a lazy range only builds a pipeline; sum() runs the callback per element
+        ('py++ map()', lambda: run(evaluator, "let out = sum(map(xs, scale));")),
+    ]
+    print(f"{'case':<20}{'total s':>10}{'ns/element':>12}")
+    for name, fn in cases:
+        with redirect_stdout(io.StringIO()):
+            elapsed = timed(fn)
+        print(f"{name:<20}{elapsed:>10.3f}{elapsed / n * 1e9:>12.0f}")
+
+if __name__ == '__main__':
+    main()
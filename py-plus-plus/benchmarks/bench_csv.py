@@ -0,0 +1,75 @@
+"""Reading a CSV file into columns versus row objects.
+
+Compares readCsv (typed column arrays, whole file and in chunks) with the
+row-by-row approach it replaces: split each line with split() and build
+one object per row. Both are driven from Python, so interpreter overhead
+is left out of the row-by-row numbers.
+    
+    python benchmarks/bench_csv.py [--size N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advanced import PyPPObject
+from src.builtins_advanced import builtin_read_csv, builtin_read_text, builtin_string_split, builtin_json_parse
+
+HEADER = "id,region,amount,name"
+
+def write_csv(path, n):
+    with open(path, 'w') as f:
+        f.write(HEADER + "\n")
+        for i in range(n):
+            f.write(f"{i},{i % 50},{i * 0.25:.2f},name{i % 1000}\n")
+
+def read_rows(path):
+    """Split lines and build one object per row."""
+    lines = builtin_string_split(builtin_read_text(path), "\n")
+    keys = builtin_string_split(lines.get(0), ",").items
+    rows = []
+    for i in range(1, lines.length()):
+        line = lines.get(i)
+        if line:
+            rows.append(PyPPObject(dict(zip(keys, builtin_string_split(line, ",").items))))
+    return sum(float(row.get('amount')) for row in rows)
+
+def read_columns(path):
+    return sum(builtin_read_csv(path).get('amount'))
+
+def read_chunks(path):
+    options = builtin_json_parse('{"chunkSize": 100000}')
+    return sum(sum(chunk.get('amount')) for chunk in builtin_read_csv(path, options))
+
+def measure(fn, path):
+    start = time.perf_counter()
+    total = fn(path)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn(path)
+    _, top = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return total, elapsed, top
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=1000000)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'data.csv')
+        write_csv(path, args.size)
+        print(f"{'reader':<14}{'s':>8}{'MB peak':>10}")
+        totals = []
+        for name, fn in (('rows', read_rows), ('columns', read_columns), ('chunks', read_chunks)):
+            total, elapsed, top = measure(fn, path)
+            totals.append(round(total, 2))
+            print(f"{name:<14}{elapsed:>8.2f}{top / 1e6:>10.1f}")
+        assert len(set(totals)) == 1
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Call overhead of a trivial foreign (Python) function from py++.
+
+Times a py++ loop calling the same one-argument function bound in
+different ways: as a builtin, through `import py` with and without a
+declared signature, and written in py++ itself.
+    
+    python benchmarks/bench_ffi.py [--size N] [--repeat R]
+"""
+
+import argparse
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interpreter import interpret
+
+LOOP = "for (let i = 0; i < {n}; i = i + 1) {{ t = {call}; }}"
+
+CASES = {
+    'builtin': ("", "abs(i)"),
+    'py, declared': ('import py "operator" as op { neg(int) -> int; }', "op.neg(i)"),
+    'py, str args': ('import py "operator" as op { concat(string, string) -> string; }', 'op.concat("a", "b")'),
+    'py, untyped': ('import py "operator" as op;', "op.neg(i)"),
+    'py++ fn': ("fn neg(x) { return -x; }", "neg(i)"),
+}
+
+def run(prelude, call, n, repeat):
+    """Best of repeat runs, in seconds."""
+    source = prelude + " let t = 0; " + LOOP.format(n=n, call=call)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        interpret(source)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    
+    baseline = run("", "i", args.size, args.repeat)
+    print(f"{'binding':<16}{'total s':>10}{'us/call':>10}")
+    for name, (prelude, call) in CASES.items():
+        elapsed = run(prelude, call, args.size, args.repeat)
+        print(f"{name:<16}{elapsed:>10.3f}{(elapsed - baseline) / args.size * 1e6:>10.2f}")
+
+if __name__ == '__main__':
+    main()
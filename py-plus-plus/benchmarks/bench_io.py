@@ -0,0 +1,79 @@
+"""Throughput of the file builtins on a large local file.
+
+Writes a text file of --size-mb megabytes with writeLines, then reads it
+back with readLines (streamed) against reading the whole file and
+splitting it, and hashes it through readBytes, memory-mapped against a
+plain read. Use a size of several GB to measure the mmap path on files
+that don't fit the page cache; the file goes in --dir (default: the
+system temp directory) and is removed afterwards.
+    
+    python benchmarks/bench_io.py [--size-mb N] [--dir PATH]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import zlib
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import fileio
+from src.advanced import PyPPIter
+from src.builtins_advanced import builtin_read_bytes, builtin_read_lines, builtin_write_lines
+
+LINE = "x" * 63
+
+def report(name, mb, elapsed):
+    print(f"{name:<28}{elapsed:>8.2f} s{mb / elapsed:>10.0f} MB/s")
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size-mb', type=int, default=1024)
+    parser.add_argument('--dir', default=None)
+    args = parser.parse_args()
+    n = args.size_mb * (1 << 20) // (len(LINE) + 1)
+    
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmpdir:
+        path = os.path.join(tmpdir, 'data.txt')
+        lines = PyPPIter(range(n), (('map', lambda i: LINE),))
+        _, elapsed = timed(builtin_write_lines, path, lines)
+        mb = os.path.getsize(path) / (1 << 20)
+        report("writeLines", mb, elapsed)
+        
+        def read_split():
+            with open(path, encoding='utf-8') as f:
+                return len(f.read().splitlines())
+        
+        def stream():
+            return sum(1 for _ in builtin_read_lines(path))
+        
+        count, elapsed = timed(read_split)
+        report("read + splitlines (whole)", mb, elapsed)
+        assert count == n
+        count, elapsed = timed(stream)
+        report("readLines (streamed)", mb, elapsed)
+        assert count == n
+        
+        def checksum():
+            return zlib.crc32(builtin_read_bytes(path))
+        
+        threshold = fileio.MMAP_THRESHOLD
+        try:
+            fileio.MMAP_THRESHOLD = float('inf')
+            plain, elapsed = timed(checksum)
+            report("readBytes, read() + crc32", mb, elapsed)
+            fileio.MMAP_THRESHOLD = 0
+            mapped, elapsed = timed(checksum)
+            report("readBytes, mmap + crc32", mb, elapsed)
+            assert plain == mapped
+        finally:
+            fileio.MMAP_THRESHOLD = threshold
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""JSON parse, stringify and NDJSON streaming.
+
+Compares lazily converted parse results with converting every nested
+value up front, stringify through the encoder hook with copying the
+structure first, and reading an NDJSON file record by record with
+loading all of it.
+    
+    python benchmarks/bench_json.py [--size N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advanced import PyPPArray, PyPPObject, PyPPSet, as_str
+from src.builtins_advanced import builtin_json_parse, builtin_json_stringify, builtin_ndjson_read
+
+def record(i):
+    return {'id': i, 'name': f"user{i}", 'tags': ['a', 'b', 'c'],
+            'address': {'city': 'x', 'zip': i % 1000, 'geo': [1.5, 2.5]}}
+
+def eager(value):
+    """Convert every nested value when parsing."""
+    if isinstance(value, dict):
+        return PyPPObject({k: eager(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return PyPPArray([eager(v) for v in value])
+    return value
+
+def copy_then_dumps(value):
+    """stringify as it was: copy the whole structure, then dumps."""
+    def to_serializable(obj):
+        if isinstance(obj, PyPPArray):
+            return [to_serializable(item) for item in obj]
+        if isinstance(obj, PyPPObject):
+            return {k: to_serializable(v) for k, v in obj.properties.items()}
+        if isinstance(obj, PyPPSet):
+            return list(obj.items)
+        return as_str(obj)
+    return json.dumps(to_serializable(value))
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def peak(fn, *args):
+    tracemalloc.start()
+    result = fn(*args)
+    _, top = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, top
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=100000)
+    args = parser.parse_args()
+    text = json.dumps([record(i) for i in range(args.size)])
+    
+    print("parse, then read one field of each record")
+    for name, parse in (('eager', lambda s: eager(json.loads(s))), ('lazy', builtin_json_parse)):
+        def run():
+            return sum(r.get('id') for r in parse(text))
+        _, elapsed = timed(run)
+        print(f"  {name:<10}{elapsed:>8.3f} s")
+    
+    value = eager(json.loads(text))
+    print("stringify")
+    for name, stringify in (('copy', copy_then_dumps), ('hook', builtin_json_stringify)):
+        _, elapsed = timed(stringify, value)
+        _, top = peak(stringify, value)
+        print(f"  {name:<10}{elapsed:>8.3f} s{top / 1e6:>10.1f} MB peak")
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'records.ndjson')
+        with open(path, 'w') as f:
+            for i in range(args.size):
+                f.write(json.dumps(record(i)) + '\n')
+        print("NDJSON: sum one field over every record")
+        
+        def load_all():
+            with open(path) as f:
+                return sum(r.get('id') for r in [eager(json.loads(line)) for line in f])
+        
+        def stream():
+            return sum(r.get('id') for r in builtin_ndjson_read(path))
+        
+        for name, fn in (('load all', load_all), ('stream', stream)):
+            _, elapsed = timed(fn)
+            _, top = peak(fn)
+            print(f"  {name:<10}{elapsed:>8.3f} s{top / 1e6:>10.1f} MB peak")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Recursive Fibonacci with and without @memo.
+
+Times fib(--n) from py++ source as plain exponential recursion and with
+the @memo decorator, and the cost of a cache hit: memoized fib(--n)
+called again --calls times.
+    
+    python benchmarks/bench_memo.py [--n N] [--calls N]
+"""
+
+import argparse
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.evaluator import Evaluator
+
+FIB = """
+{decorator}
+fn fib(n) {{
+    if (n <= 1) {{ return n; }}
+    return fib(n - 1) + fib(n - 2);
+}}
+let result = fib(n);
+"""
+
+HITS = """
+for (let i = 0; i < calls; i = i + 1) {
+    fib(n);
+}
+"""
+
+def run(evaluator, source):
+    program = Parser(Lexer(source).tokenize()).parse()
+    start = time.perf_counter()
+    evaluator.eval(program)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, default=24)
+    parser.add_argument('--calls', type=int, default=100000)
+    args = parser.parse_args()
+    
+    print(f"{'fib':<10}{'s':>10}")
+    results = []
+    for name, decorator in (('plain', ''), ('memo', '@memo')):
+        evaluator = Evaluator()
+        evaluator.globals.update(n=args.n, calls=args.calls)
+        print(f"{name:<10}{run(evaluator, FIB.format(decorator=decorator)):>10.4f}")
+        results.append(evaluator.get_variable('result'))
+    assert results[0] == results[1]
+    per_hit = run(evaluator, HITS) / args.calls
+    print(f"{'loop+hit':<10}{per_hit * 1e6:>10.2f} us/call")
+
+if __name__ == '__main__':
+    main()
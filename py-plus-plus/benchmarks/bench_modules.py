@@ -0,0 +1,49 @@
+"""Call cost of stdlib functions from native and interpreted modules.
+
+Runs the same py++ loop with `import math; import string;` served by the
+native Python modules (src/native) and by the stdlib/*.pypp fallbacks.
+    
+    python benchmarks/bench_modules.py [--size N]
+"""
+
+import argparse
+import os
+import sys
+import time
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.evaluator import Evaluator
+from src.module_loader import ModuleLoader
+
+CASES = {
+    'abs/min/max': "let t = 0; for (let i = 0; i < {n}; i = i + 1) {{ t = t + max(abs(i - 50), min(i, 3)); }}",
+    'power(3, 40)': "let t = 0; for (let i = 0; i < {n}; i = i + 1) {{ t = power(3, 40); }}",
+    'repeat(s, 20)': "let t = 0; for (let i = 0; i < {n}; i = i + 1) {{ t = repeat(\"ab\", 20); }}",
+}
+
+def run(body, native):
+    source = "import math; import string; " + body
+    ast = Parser(Lexer(source).tokenize()).parse()
+    evaluator = Evaluator()
+    evaluator.module_loader = ModuleLoader([os.path.join(ROOT, 'stdlib')], native=native)
+    start = time.perf_counter()
+    evaluator.eval(ast)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=20000)
+    args = parser.parse_args()
+    
+    print(f"{'case':<16}{'pypp s':>10}{'native s':>10}{'speedup':>10}")
+    for name, template in CASES.items():
+        body = template.format(n=args.size)
+        interpreted = run(body, native=False)
+        native = run(body, native=True)
+        print(f"{name:<16}{interpreted:>10.3f}{native:>10.3f}{interpreted / native:>9.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Memory and access time for many objects with the same keys.
+
+Compares shape-based PyPPObject (shared key layout, per-object value
+slots) with the old layout, where every object carried its own dict.
+    
+    python benchmarks/bench_objects.py [--size N]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advanced import PyPPObject
+
+KEYS = ('id', 'name', 'email', 'age', 'active')
+
+class DictObject:
+    """PyPPObject as it was before shapes: one dict per object."""
+    
+    def __init__(self, properties=None):
+        self.properties = properties or {}
+    
+    def get(self, key):
+        return self.properties[key]
+    
+    def set(self, key, value):
+        self.properties[key] = value
+
+def build(cls, n):
+    records = []
+    for i in range(n):
+        obj = cls()
+        for key in KEYS:
+            obj.set(key, i)
+        records.append(obj)
+    return records
+
+def measure(cls, n):
+    tracemalloc.start()
+    start = time.perf_counter()
+    records = build(cls, n)
+    build_time = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for obj in records:
+        for key in KEYS:
+            obj.get(key)
+    get_time = time.perf_counter() - start
+    return size, build_time, get_time
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=1000000)
+    args = parser.parse_args()
+    n = args.size
+    
+    print(f"{'layout':<12}{'MB':>10}{'bytes/obj':>12}{'build s':>10}{'get s':>10}")
+    for name, cls in (('dict', DictObject), ('shape', PyPPObject)):
+        size, build_time, get_time = measure(cls, n)
+        print(f"{name:<12}{size / 1e6:>10.1f}{size / n:>12.0f}{build_time:>10.3f}{get_time:>10.3f}")
+
+if __name__ == '__main__':
+    main()
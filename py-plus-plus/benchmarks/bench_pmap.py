@@ -0,0 +1,54 @@
+"""pmap speedup across worker counts.
+
+Maps a CPU-bound py++ function (Collatz steps) over range(--n) with
+pmap at 1, 2, 4 and 8 workers and prints the time and speedup over one
+worker. Speedup is bounded by the number of CPUs.
+    
+    python benchmarks/bench_pmap.py [--n N] [--workers 1,2,4,8]
+"""
+
+import argparse
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.evaluator import Evaluator
+
+SOURCE = """
+fn collatz(n) {
+    let steps = 0;
+    while (n > 1) {
+        if (n % 2 == 0) { n = n / 2; } else { n = 3 * n + 1; }
+        steps = steps + 1;
+    }
+    return steps;
+}
+"""
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, default=2000)
+    parser.add_argument('--workers', default='1,2,4,8')
+    args = parser.parse_args()
+    
+    evaluator = Evaluator()
+    evaluator.eval(Parser(Lexer(SOURCE).tokenize()).parse())
+    print(f"cpus: {os.cpu_count()}")
+    print(f"{'workers':<10}{'s':>10}{'speedup':>10}")
+    base = expected = None
+    for workers in map(int, args.workers.split(',')):
+        call = Parser(Lexer(
+            f'pmap(collatz, range({args.n}), parse("{{\\"workers\\": {workers}}}"));').tokenize()).parse()
+        start = time.perf_counter()
+        result = list(evaluator.eval(call))
+        elapsed = time.perf_counter() - start
+        if base is None:
+            base, expected = elapsed, result
+        assert result == expected
+        print(f"{workers:<10}{elapsed:>10.3f}{base / elapsed:>9.2f}x")
+
+if __name__ == '__main__':
+    main()
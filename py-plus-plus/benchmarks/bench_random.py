@@ -0,0 +1,60 @@
+"""Random draws one interpreted call at a time versus in bulk.
+
+Fills an array with --size floats and with --size dice rolls from py++
+source, first with random()/randint() and push() in a loop, then with one
+randomArray()/randintArray() call, and shuffles it.
+    
+    python benchmarks/bench_random.py [--size N]
+"""
+
+import argparse
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.evaluator import Evaluator
+
+LOOP = """
+seed(1);
+let xs = array();
+let rolls = array();
+for (let i = 0; i < n; i = i + 1) {
+    push(xs, random());
+    push(rolls, randint(1, 6));
+}
+"""
+
+BULK = """
+seed(1);
+let xs = randomArray(n);
+let rolls = randintArray(n, 1, 6);
+"""
+
+SHUFFLE = """
+shuffle(xs);
+"""
+
+def run(evaluator, source):
+    program = Parser(Lexer(source).tokenize()).parse()
+    start = time.perf_counter()
+    evaluator.eval(program)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=200000)
+    args = parser.parse_args()
+    
+    print(f"{'draws':<10}{'s':>8}")
+    for name, source in (('loop', LOOP), ('bulk', BULK)):
+        evaluator = Evaluator()
+        evaluator.globals['n'] = args.size
+        print(f"{name:<10}{run(evaluator, source):>8.2f}")
+        assert evaluator.get_variable('rolls').length() == args.size
+    print(f"{'shuffle':<10}{run(evaluator, SHUFFLE):>8.2f}")
+
+if __name__ == '__main__':
+    main()
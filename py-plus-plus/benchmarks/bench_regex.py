@@ -0,0 +1,92 @@
+"""Parsing log lines with chained string builtins versus regex builtins.
+
+Each version pulls the level and the device out of every line of a
+synthetic log, from py++ source: with indexOf()/substring() chains, with
+search() and a pattern string (compiled once, then found in the pattern
+cache), and with a regex() handle made before the loop.
+    
+    python benchmarks/bench_regex.py [--size N]
+"""
+
+import argparse
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.evaluator import Evaluator
+from src.advanced import PyPPArray
+from src import regex
+
+STRINGS = """
+let found = 0;
+for (let i = 0; i < len(lines); i = i + 1) {
+    let line = at(lines, i);
+    let start = indexOf(line, " ") + 1;
+    let rest = substring(line, start);
+    let level = substring(rest, 0, indexOf(rest, " "));
+    let dev = indexOf(rest, "/dev/");
+    if (level == "ERROR" && dev >= 0) {
+        let name = substring(rest, dev + 5);
+        found = found + 1;
+    }
+}
+"""
+
+PATTERN = """
+let found = 0;
+for (let i = 0; i < len(lines); i = i + 1) {
+    let m = search(at(lines, i), "^\\\\S+ (ERROR) .*?/dev/(\\\\w+)");
+    if (m != null) {
+        found = found + 1;
+    }
+}
+"""
+
+HANDLE = """
+let r = regex("^\\\\S+ (ERROR) .*?/dev/(\\\\w+)");
+let found = 0;
+for (let i = 0; i < len(lines); i = i + 1) {
+    let m = search(at(lines, i), r);
+    if (m != null) {
+        found = found + 1;
+    }
+}
+"""
+
+LEVELS = ("INFO", "WARN", "ERROR", "DEBUG")
+
+def make_lines(n):
+    return PyPPArray([f"2024-01-{i % 28 + 1:02d} {LEVELS[i % 4]} disk {i} on /dev/sd{i % 7}"
+                      for i in range(n)])
+
+def run(lines, source):
+    evaluator = Evaluator()
+    evaluator.globals['lines'] = lines
+    evaluator.globals['at'] = lambda arr, i: arr.get(i)
+    program = Parser(Lexer(source).tokenize()).parse()
+    start = time.perf_counter()
+    evaluator.eval(program)
+    return time.perf_counter() - start, evaluator.get_variable('found')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=100000)
+    args = parser.parse_args()
+    
+    lines = make_lines(args.size)
+    print(f"{'parser':<10}{'s':>8}")
+    counts = []
+    for name, source in (('strings', STRINGS), ('pattern', PATTERN), ('handle', HANDLE)):
+        regex.PATTERNS.clear()
+        elapsed, found = run(lines, source)
+        counts.append(found)
+        stats = regex.PATTERNS.stats()
+        print(f"{name:<10}{elapsed:>8.2f}   cache: {stats['regexCacheHits']} hits, "
+              f"{stats['regexCacheMisses']} misses")
+    assert len(set(counts)) == 1
+
+if __name__ == '__main__':
+    main()
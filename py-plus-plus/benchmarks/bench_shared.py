@@ -0,0 +1,51 @@
+"""pmap over data that workers copy versus data in shared memory.
+
+Each task sums one block of a --n element float array. With a plain
+array, every worker gets a pickled copy of the array when it starts; with
+share(), workers attach to the segment by name.
+    
+    python benchmarks/bench_shared.py [--n N] [--workers N]
+"""
+
+import argparse
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.evaluator import Evaluator
+
+SOURCE = """
+fn block(i) {{
+    return sum(slice(data, i * size, (i + 1) * size));
+}}
+let data = {data};
+let total = sum(pmap(block, range(tasks), parse("{{\\"workers\\": {workers}}}")));
+"""
+
+def run(evaluator, source):
+    evaluator.eval(Parser(Lexer(source).tokenize()).parse())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, default=5000000)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    
+    print(f"{'data':<10}{'s':>10}")
+    totals = []
+    for name, data in (('copied', 'randomArray(n)'), ('shared', 'share(randomArray(n))')):
+        evaluator = Evaluator()
+        tasks = args.workers * 4
+        evaluator.globals.update(n=args.n, tasks=tasks, size=args.n // tasks)
+        run(evaluator, 'seed(1);')
+        start = time.perf_counter()
+        run(evaluator, SOURCE.format(data=data, workers=args.workers))
+        print(f"{name:<10}{time.perf_counter() - start:>10.3f}")
+        totals.append(evaluator.get_variable('total'))
+    assert abs(totals[0] - totals[1]) < 1e-6 * abs(totals[0])
+
+if __name__ == '__main__':
+    main()
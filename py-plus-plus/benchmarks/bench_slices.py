@@ -0,0 +1,57 @@
+"""Slicing a large buffer in a loop: copying slices vs views.
+
+Models a parser written in py++ that consumes its input by repeatedly
+taking substring(rest, n) / slice(rest, n). With copies each step costs
+O(remaining), so the loop is quadratic; with views it is linear.
+    
+    python benchmarks/bench_slices.py [--size N]
+"""
+
+import argparse
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.advanced import PyPPArray, StringUtils
+
+STEP = 8
+
+def consume_string(text, substring):
+    rest = text
+    while len(rest) > STEP:
+        rest = substring(rest, STEP)
+
+def consume_array(arr, copy):
+    rest = arr
+    while rest.length() > STEP:
+        if copy:
+            rest = PyPPArray(rest.items[STEP:])
+        else:
+            rest = rest.slice(STEP, rest.length())
+
+def copying_substring(s, start):
+    return s[start:]
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=400000)
+    args = parser.parse_args()
+    
+    print(f"{'size':<12}{'str copy s':>12}{'str view s':>12}{'arr copy s':>12}{'arr view s':>12}")
+    for size in (args.size // 8, args.size // 4, args.size // 2, args.size):
+        text = "x" * size
+        arr = PyPPArray(list(range(size)))
+        print(f"{size:<12}"
+              f"{timed(lambda: consume_string(text, copying_substring)):>12.3f}"
+              f"{timed(lambda: consume_string(text, StringUtils.substring)):>12.3f}"
+              f"{timed(lambda: consume_array(arr, True)):>12.3f}"
+              f"{timed(lambda: consume_array(arr, False)):>12.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Building a string by repeated concatenation in a py++ loop.
+
+Compares `s = s + piece` with the evaluator's rope disabled (plain
+immutable-string concatenation, quadratic), with it enabled, and with an
+explicit builder()/append()/toString().
+    
+    python benchmarks/bench_strings.py [--size N]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.evaluator import Evaluator
+
+CONCAT = """
+let s = "";
+for (let i = 0; i < N; i = i + 1) {
+    s = s + "0123456789abcdef";
+}
+print(len(s));
+"""
+
+BUILDER = """
+let sb = builder();
+for (let i = 0; i < N; i = i + 1) {
+    append(sb, "0123456789abcdef");
+}
+print(len(toString(sb)));
+"""
+
+class PlainEvaluator(Evaluator):
+    """Evaluator without the rope, as before it was added."""
+    
+    def append_in_place(self, node):
+        return False
+
+def timed(evaluator_class, source, n):
+    ast = Parser(Lexer(source.replace('N', str(n))).tokenize()).parse()
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        evaluator_class().eval(ast)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=50000)
+    args = parser.parse_args()
+    
+    print(f"{'appends':<12}{'plain s':>10}{'rope s':>10}{'builder s':>12}")
+    for n in (args.size // 8, args.size // 4, args.size // 2, args.size):
+        print(f"{n:<12}{timed(PlainEvaluator, CONCAT, n):>10.3f}"
+              f"{timed(Evaluator, CONCAT, n):>10.3f}{timed(Evaluator, BUILDER, n):>12.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""A filter, group-by and aggregate report over a synthetic table.
+
+Runs the same report three ways from py++ source: an interpreted loop over
+the rows, where() with a py++ row function followed by groupBy()/agg(),
+and the all-column pipeline where(table, column, op, value) -> groupBy ->
+agg -> sortBy that calls no py++ code per row. The loop is run on the
+first --loop-size rows only and its time scaled up to the full table.
+    
+    python benchmarks/bench_table.py [--size N] [--loop-size N]
+"""
+
+import argparse
+import os
+import sys
+import time
+from array import array
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.evaluator import Evaluator
+from src.advanced import PyPPArray, PyPPTable
+
+LOOP = """
+let amounts = get(t, "amount");
+let total = 0.0;
+let count = 0;
+for (let i = 0; i < len(t); i = i + 1) {
+    let amount = at(amounts, i);
+    if (amount > 500.0) {
+        total = total + amount;
+        count = count + 1;
+    }
+}
+"""
+
+ROWS = """
+fn large(row) { return get(row, "amount") > 500.0; }
+let report = agg(groupBy(where(t, large), "region"), "amount", "sum", "amount", "mean", "amount", "count");
+"""
+
+COLUMNS = """
+let report = sortBy(
+    agg(groupBy(where(t, "amount", ">", 500.0), "region"), "amount", "sum", "amount", "mean", "amount", "count"),
+    "amount_sum", true);
+"""
+
+def column(items):
+    result = PyPPArray()
+    result.items = items
+    return result
+
+def make_table(n):
+    return PyPPTable({
+        'id': column(array('q', range(n))),
+        'region': column([f"r{i * 7919 % 50}" for i in range(n)]),
+        'amount': column(array('d', (i * 2654435761 % 1000 + 0.25 for i in range(n)))),
+    })
+
+def run(table, source):
+    evaluator = Evaluator()
+    evaluator.globals['t'] = table
+    # Array indexing; get() on objects is what the row function uses
+    evaluator.globals['at'] = lambda arr, i: arr.get(i)
+    start = time.perf_counter()
+    evaluator.eval(Parser(Lexer(source).tokenize()).parse())
+    return time.perf_counter() - start, evaluator
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=10000000)
+    parser.add_argument('--loop-size', type=int, default=200000)
+    args = parser.parse_args()
+    
+    table = make_table(args.size)
+    sample = make_table(min(args.loop_size, args.size))
+    scale = args.size / sample.rows()
+    loop, _ = run(sample, LOOP)
+    rows, by_rows = run(sample, ROWS)
+    _, by_columns = run(sample, COLUMNS)
+    expected = by_rows.get_variable('report').get('amount_count')
+    assert sorted(by_columns.get_variable('report').get('amount_count')) == sorted(expected)
+    columns, by_columns = run(table, COLUMNS)
+    
+    print(f"{args.size} rows, {by_columns.get_variable('report').rows()} groups")
+    print(f"{'pipeline':<14}{'s':>10}")
+    print(f"{'loop (est.)':<14}{loop * scale:>10.2f}")
+    print(f"{'row fn (est.)':<14}{rows * scale:>10.2f}")
+    print(f"{'columns':<14}{columns:>10.2f}")
+
+if __name__ == '__main__':
+    main()
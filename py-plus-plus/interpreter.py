@@ -4,15 +4,24 @@ from src.lexer import Lexer
 from src.parser import Parser
 from src.evaluator import Evaluator
 from src.module_loader import ModuleLoader
+from src.shared import SEGMENTS
 
-def interpret(source: str):
-    """Complete pipeline: source -> tokens -> AST -> evaluation."""
+def interpret(source: str, lazy_imports: bool = False, prefetch: bool = True):
+    """Complete pipeline: source -> tokens -> AST -> evaluation.
+    
+    With prefetch, the whole import graph is read and parsed concurrently
+    before execution starts (skipped for lazy imports). Shared arrays the
+    script made are released when it ends, even if it raised.
+    """
     lexer = Lexer(source)
     tokens = lexer.tokenize()
     
     parser = Parser(tokens)
     ast = parser.parse()
     
-    evaluator = Evaluator()
+    evaluator = Evaluator(lazy_imports=lazy_imports)
     evaluator.module_loader = ModuleLoader()
-    return evaluator.eval(ast)
+    if prefetch and not lazy_imports:
+        evaluator.module_loader.prefetch(ast)
+    with SEGMENTS.session():
+        return evaluator.eval(ast)
@@ -21,6 +21,8 @@ class PyPPCLI:
         run_parser = subparsers.add_parser('run', help='Run a py++ file')
         run_parser.add_argument('file', help='File to run (.pypp)')
         run_parser.add_argument('--verbose', action='store_true', help='Verbose output')
+        run_parser.add_argument('--lazy-imports', action='store_true',
+                                help='Defer loading imported modules until first use')
         
         # pypp build <project>
         build_parser = subparsers.add_parser('build', help='Build a project')
@@ -53,7 +55,7 @@ class PyPPCLI:
             if args.verbose:
                 print(f"[INFO] Executing {args.file}")
             
-            interpret(source)
+            interpret(source, lazy_imports=args.lazy_imports)
             
             if args.verbose:
                 print(f"[INFO] Execution completed")
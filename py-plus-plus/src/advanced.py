@@ -1,116 +1,342 @@
 """Advanced features for py++ language."""
 
+import math
+import operator
+import time
+import weakref
+from array import array
+from collections import Counter, OrderedDict
+from itertools import accumulate, compress, islice, repeat
 from typing import Any, Dict, List, Callable
 from .errors import RuntimeError as PyPPRuntimeError, TypeError as PyPPTypeError
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; ArrayMath falls back to pure Python
+    np = None
+
+# Element type stored by each compact array typecode
+TYPECODE_TYPES = {'q': int, 'd': float}
+
+def compact_items(items):
+    """Store items in a typed array('q'/'d') when all are ints or all floats.
+    
+    Returns items unchanged when they are mixed, empty, or out of range.
+    A memoryview of compact storage is copied into an array.
+    """
+    if type(items) is memoryview:
+        return array(items.format, items.tobytes())
+    if not items or type(items) is array:
+        return items
+    first = type(items[0])
+    if first is int:
+        typecode = 'q'
+    elif first is float:
+        typecode = 'd'
+    else:
+        return items
+    if any(kind is not first for kind in set(map(type, items))):
+        return items
+    try:
+        return array(typecode, items)
+    except OverflowError:
+        return items
+
+def typecode_of(items):
+    """'q' or 'd' for compact storage, else None.
+    
+    Compact storage is an array('q'/'d'), or a memoryview cast to one of
+    those formats (a SharedArray's storage).
+    """
+    kind = type(items)
+    if kind is array:
+        return items.typecode
+    if kind is memoryview:
+        return items.format
+    return None
+
+def numpy_view(items):
+    """ndarray view of compact storage, or None without NumPy or compact storage."""
+    typecode = typecode_of(items)
+    if np is None or typecode is None:
+        return None
+    return np.frombuffer(items, dtype=np.int64 if typecode == 'q' else np.float64)
+
+def range_storage(values: range):
+    """Compact int storage for a range, or a list if it overflows int64."""
+    try:
+        return array('q', values)
+    except OverflowError:
+        return list(values)
+
+
 class PyPPArray:
-    """Array/List implementation for py++."""
+    """Array/List implementation for py++.
+    
+    Arrays whose elements are all ints or all floats are kept in a compact
+    array('q') or array('d'); the first element of another type switches
+    the storage to a plain list.
+    
+    Front operations are amortized O(1): shift advances a head offset
+    instead of moving every element, and unshift fills a gap reserved in
+    front of the head. Indexed access stays O(1).
+    
+    Long slices are ArrayViews onto this array's storage. Methods that
+    change storage in place detach the live views first.
+    """
+    
+    # Smallest gap reserved at the front by unshift, and the head offset
+    # below which shift never bothers to reclaim space
+    MIN_FRONT_GAP = 16
+    
+    # Live ArrayViews sharing the storage, created on first long slice
+    _views = None
     
     def __init__(self, items: List[Any] = None):
-        self.items = items or []
+        # Every method reads and writes the storage through _items, which
+        # subclasses may make a property that builds it on first access
+        self._items = compact_items(items) if items else []
+        self._head = 0
+    
+    @property
+    def items(self):
+        """Element storage (list or compact array), starting at index 0."""
+        if self._head:
+            if self._views:
+                self._detach_views()
+            del self._items[:self._head]
+            self._head = 0
+        return self._items
+    
+    @items.setter
+    def items(self, value):
+        self._items = value
+        self._head = 0
+    
+    def _fits(self, item: Any) -> bool:
+        """Whether item can go in the current storage without conversion."""
+        items = self._items
+        if type(items) is not array:
+            return True
+        return type(item) is TYPECODE_TYPES[items.typecode]
+    
+    def _detach_views(self) -> None:
+        """Make live slice views copy their elements before storage changes."""
+        for view in list(self._views):
+            view._materialize()
+        self._views = None
+    
+    def _to_list(self) -> None:
+        """Switch from typed to list storage."""
+        if type(self._items) is array:
+            self._items = self._items.tolist()
     
     def push(self, item: Any) -> None:
         """Add item to end of array."""
-        self.items.append(item)
+        items = self._items
+        if len(items) == self._head:
+            self.items = compact_items([item])
+            return
+        if type(items) is array:
+            if type(item) is not TYPECODE_TYPES[items.typecode]:
+                self._to_list()
+            else:
+                try:
+                    items.append(item)
+                    return
+                except OverflowError:
+                    self._to_list()
+        self._items.append(item)
     
     def pop(self) -> Any:
         """Remove and return last item."""
-        if not self.items:
+        if len(self._items) == self._head:
             raise PyPPRuntimeError("Cannot pop from empty array")
-        return self.items.pop()
+        if self._views:
+            self._detach_views()
+        return self._items.pop()
     
     def shift(self) -> Any:
         """Remove and return first item."""
-        if not self.items:
+        items = self._items
+        head = self._head
+        if head == len(items):
             raise PyPPRuntimeError("Cannot shift from empty array")
-        return self.items.pop(0)
+        if self._views:
+            self._detach_views()
+        value = items[head]
+        if type(items) is list:
+            items[head] = None
+        head += 1
+        if head == len(items):
+            del items[:]
+            head = 0
+        elif head > self.MIN_FRONT_GAP and head * 2 > len(items):
+            # Reclaim the dead prefix once it outweighs the live elements
+            del items[:head]
+            head = 0
+        self._head = head
+        return value
     
     def unshift(self, item: Any) -> None:
         """Add item to beginning of array."""
-        self.items.insert(0, item)
+        if len(self._items) == self._head:
+            self.items = compact_items([item])
+            return
+        if not self._fits(item):
+            self._to_list()
+        if self._views:
+            self._detach_views()
+        if not self._head:
+            items = self._items
+            gap = max(self.MIN_FRONT_GAP, len(items))
+            if type(items) is array:
+                items[0:0] = array(items.typecode, [0]) * gap
+            else:
+                items[0:0] = [None] * gap
+            self._head = gap
+        self._head -= 1
+        try:
+            self._items[self._head] = item
+        except OverflowError:
+            self._to_list()
+            self._items[self._head] = item
+    
+    def __iter__(self):
+        if self._head:
+            return islice(self._items, self._head, None)
+        return iter(self._items)
     
     def length(self) -> int:
         """Get array length."""
-        return len(self.items)
+        return len(self._items) - self._head
     
     def get(self, index: int) -> Any:
         """Get item at index."""
         if not isinstance(index, int):
             raise PyPPTypeError(f"Array index must be int, got {type(index).__name__}")
-        if index < 0 or index >= len(self.items):
+        if index < 0 or index >= len(self._items) - self._head:
             raise PyPPRuntimeError(f"Array index out of bounds: {index}")
-        return self.items[index]
+        return self._items[self._head + index]
     
     def set(self, index: int, value: Any) -> None:
         """Set item at index."""
         if not isinstance(index, int):
             raise PyPPTypeError(f"Array index must be int, got {type(index).__name__}")
-        if index < 0 or index >= len(self.items):
+        if index < 0 or index >= len(self._items) - self._head:
             raise PyPPRuntimeError(f"Array index out of bounds: {index}")
-        self.items[index] = value
+        if not self._fits(value):
+            self._to_list()
+        if self._views:
+            self._detach_views()
+        try:
+            self._items[self._head + index] = value
+        except OverflowError:
+            self._to_list()
+            self._items[self._head + index] = value
     
     def reverse(self) -> None:
         """Reverse array in place."""
+        if self._views:
+            self._detach_views()
         self.items.reverse()
     
-    def sort(self) -> None:
-        """Sort array in place."""
+    def sort(self, key: Callable = None) -> None:
+        """Sort array in place, optionally by key(item)."""
+        if self._views:
+            self._detach_views()
         try:
-            self.items.sort()
+            typecode = typecode_of(self.items)
+            if typecode:
+                self.items = array(typecode, sorted(self.items, key=key))
+            else:
+                self.items.sort(key=key)
         except TypeError:
             raise PyPPRuntimeError("Cannot sort array with incomparable types")
     
+    def gather(self, order) -> 'PyPPArray':
+        """New array of the elements at the indices in order.
+        
+        order is a list of ints or, with NumPy, an int ndarray; compact
+        storage is then gathered in one NumPy call.
+        """
+        items = self.items
+        typecode = typecode_of(items)
+        result = PyPPArray()
+        vectorized = np is not None and type(order) is np.ndarray
+        view = numpy_view(items) if vectorized else None
+        if view is not None:
+            result.items = array(typecode)
+            result.items.frombytes(view[order].tobytes())
+            return result
+        values = map(items.__getitem__, order.tolist() if vectorized else order)
+        if typecode:
+            result.items = array(typecode, values)
+        elif type(items) is range:
+            result.items = array('q', values)
+        else:
+            result.items = list(values)
+        return result
+    
+    def permute(self, order) -> None:
+        """Rearrange in place: element i becomes the old element order[i]."""
+        if self._views:
+            self._detach_views()
+        self.items = self.gather(order).items
+    
     def slice(self, start: int, end: int) -> 'PyPPArray':
-        """Get slice of array."""
+        """Get slice of array; long slices share storage instead of copying."""
         if not isinstance(start, int) or not isinstance(end, int):
             raise PyPPTypeError("Slice indices must be integers")
-        return PyPPArray(self.items[start:end])
+        return ArrayView.over(self, self._items, range(self._head, len(self._items))[start:end])
+    
+    # Higher-order methods take any Python callable; builtins pass py++
+    # functions in as FunctionInvoker objects bound to their evaluator.
     
     def map(self, fn: Callable) -> 'PyPPArray':
         """Apply function to each element."""
-        from .builtins import PyPPFunction
-        if isinstance(fn, PyPPFunction):
-            new_items = []
-            for item in self.items:
-                result = fn.call([item], {})
-                new_items.append(result)
-            return PyPPArray(new_items)
-        raise PyPPTypeError(f"map() requires a function, got {type(fn).__name__}")
+        if not callable(fn):
+            raise PyPPTypeError(f"map() requires a function, got {type(fn).__name__}")
+        return PyPPArray(list(map(fn, self)))
     
     def filter(self, fn: Callable) -> 'PyPPArray':
         """Filter array with function."""
-        from .builtins import PyPPFunction
-        if isinstance(fn, PyPPFunction):
-            new_items = []
-            for item in self.items:
-                result = fn.call([item], {})
-                if result:  # Truthy check
-                    new_items.append(item)
-            return PyPPArray(new_items)
-        raise PyPPTypeError(f"filter() requires a function, got {type(fn).__name__}")
+        if not callable(fn):
+            raise PyPPTypeError(f"filter() requires a function, got {type(fn).__name__}")
+        return PyPPArray([item for item in self if fn(item)])
+    
+    def take(self, count: int) -> 'PyPPArray':
+        """First count elements."""
+        if not isinstance(count, int):
+            raise PyPPTypeError(f"take() count must be int, got {type(count).__name__}")
+        return self.slice(0, max(count, 0))
     
     def reduce(self, fn: Callable, initial: Any = None) -> Any:
         """Reduce array with function."""
-        from .builtins import PyPPFunction
-        if isinstance(fn, PyPPFunction):
-            if not self.items and initial is None:
+        if not callable(fn):
+            raise PyPPTypeError(f"reduce() requires a function, got {type(fn).__name__}")
+        items = iter(self)
+        if initial is None:
+            try:
+                accumulator = next(items)
+            except StopIteration:
                 raise PyPPRuntimeError("Reduce of empty array with no initial value")
-            
-            start_idx = 0
-            if initial is None:
-                accumulator = self.items[0]
-                start_idx = 1
-            else:
-                accumulator = initial
-            
-            for i in range(start_idx, len(self.items)):
-                accumulator = fn.call([accumulator, self.items[i]], {})
-            return accumulator
-        raise PyPPTypeError(f"reduce() requires a function, got {type(fn).__name__}")
+        else:
+            accumulator = initial
+        for item in items:
+            accumulator = fn(accumulator, item)
+        return accumulator
+    
+    def forEach(self, fn: Callable) -> None:
+        """Call function on each element."""
+        if not callable(fn):
+            raise PyPPTypeError(f"forEach() requires a function, got {type(fn).__name__}")
+        for item in self:
+            fn(item)
     
     def join(self, separator: str = "") -> str:
         """Join array items with separator."""
-        return separator.join(str(item) for item in self.items)
+        return separator.join(str(item) for item in self)
     
     def includes(self, item: Any) -> bool:
         """Check if array includes item."""
@@ -124,46 +350,420 @@ class PyPPArray:
             return -1
     
     def __str__(self) -> str:
-        return f"[{', '.join(str(item) for item in self.items)}]"
+        return f"[{', '.join(str(item) for item in self)}]"
     
     def __repr__(self) -> str:
         return self.__str__()
 
 
+class PyPPRange(PyPPArray):
+    """Array of the integers in a range, without storing them.
+    
+    Length, get, includes, indexOf, slicing and iteration are answered by
+    the range itself; pop and shift narrow it. Any other mutation first
+    materializes compact int storage, after which it is an ordinary array.
+    map, filter and take return lazy PyPPIter pipelines.
+    """
+    
+    def __init__(self, values: range):
+        self._items = values
+        self._head = 0
+    
+    @property
+    def lazy(self) -> bool:
+        """Whether the elements are still computed from the range."""
+        return type(self._items) is range
+    
+    def _materialize(self) -> None:
+        if type(self._items) is range:
+            self._items = range_storage(self._items)
+    
+    def push(self, item: Any) -> None:
+        self._materialize()
+        super().push(item)
+    
+    def pop(self) -> Any:
+        values = self._items
+        if type(values) is not range:
+            return super().pop()
+        if not values:
+            raise PyPPRuntimeError("Cannot pop from empty array")
+        self._items = values[:-1]
+        return values[-1]
+    
+    def shift(self) -> Any:
+        values = self._items
+        if type(values) is not range:
+            return super().shift()
+        if not values:
+            raise PyPPRuntimeError("Cannot shift from empty array")
+        self._items = values[1:]
+        return values[0]
+    
+    def unshift(self, item: Any) -> None:
+        self._materialize()
+        super().unshift(item)
+    
+    def set(self, index: int, value: Any) -> None:
+        self._materialize()
+        super().set(index, value)
+    
+    def reverse(self) -> None:
+        if type(self._items) is range:
+            self._items = self._items[::-1]
+        else:
+            super().reverse()
+    
+    def sort(self, key: Callable = None) -> None:
+        self._materialize()
+        super().sort(key)
+    
+    def slice(self, start: int, end: int) -> 'PyPPArray':
+        """Get slice of array; a slice of a range is still lazy."""
+        if type(self._items) is not range:
+            return super().slice(start, end)
+        if not isinstance(start, int) or not isinstance(end, int):
+            raise PyPPTypeError("Slice indices must be integers")
+        return PyPPRange(self._items[start:end])
+    
+    def map(self, fn: Callable) -> 'PyPPIter':
+        return PyPPIter(self).map(fn)
+    
+    def filter(self, fn: Callable) -> 'PyPPIter':
+        return PyPPIter(self).filter(fn)
+    
+    def __str__(self) -> str:
+        values = self._items
+        if type(values) is range and len(values) > 20:
+            # Don't print ten million numbers by accident
+            return f"range({values.start}, {values.stop}, {values.step})"
+        return super().__str__()
+
+
+class PyPPIter(PyPPArray):
+    """Lazy array computed by a fused map/filter/take pipeline.
+    
+    Stages are only recorded when the pipeline is built; consuming it runs
+    every element from the source through all stages in a single pass, so
+    no intermediate arrays exist. Iteration, includes, reduce, forEach,
+    join and sum/mean stream, and run the stages again each time. Anything
+    that needs random access or mutation (len, get, sort, push, ...) first
+    materializes the elements once, after which it is an ordinary array.
+    """
+    
+    def __init__(self, source: Any, stages: tuple = ()):
+        # Source is any iterable that can be iterated again, usually an array
+        self.source = source
+        self.stages = stages
+        self._storage = None
+        self._head = 0
+    
+    @property
+    def lazy(self) -> bool:
+        """Whether the elements are still computed from the source."""
+        return self._storage is None
+    
+    @property
+    def _items(self):
+        # First access runs the pipeline and keeps the result
+        if self._storage is None:
+            self._storage = compact_items(list(self._stream()))
+            self.source = self.stages = None
+        return self._storage
+    
+    @_items.setter
+    def _items(self, value):
+        self._storage = value
+        self.source = self.stages = None
+    
+    def _stream(self):
+        values = iter(self.source)
+        for kind, arg in self.stages:
+            if kind == 'map':
+                values = map(arg, values)
+            elif kind == 'filter':
+                values = filter(arg, values)
+            else:
+                values = islice(values, arg)
+        return values
+    
+    def _then(self, kind: str, arg: Any) -> 'PyPPIter':
+        if self._storage is None:
+            return PyPPIter(self.source, self.stages + ((kind, arg),))
+        return PyPPIter(self, ((kind, arg),))
+    
+    def __iter__(self):
+        if self._storage is None:
+            return self._stream()
+        return super().__iter__()
+    
+    def map(self, fn: Callable) -> 'PyPPIter':
+        """Lazily apply function to each element."""
+        if not callable(fn):
+            raise PyPPTypeError(f"map() requires a function, got {type(fn).__name__}")
+        return self._then('map', fn)
+    
+    def filter(self, fn: Callable) -> 'PyPPIter':
+        """Lazily keep elements for which function is truthy."""
+        if not callable(fn):
+            raise PyPPTypeError(f"filter() requires a function, got {type(fn).__name__}")
+        return self._then('filter', fn)
+    
+    def take(self, count: int) -> 'PyPPIter':
+        """Lazily stop after count elements."""
+        if not isinstance(count, int):
+            raise PyPPTypeError(f"take() count must be int, got {type(count).__name__}")
+        return self._then('take', max(count, 0))
+    
+    def includes(self, item: Any) -> bool:
+        """Check if array includes item, stopping at the first match."""
+        return item in iter(self)
+
+
+class ArrayView(PyPPArray):
+    """Slice that reads its elements from another array's storage.
+    
+    Length, get, iteration, includes, indexOf and further slicing cost
+    O(1) or O(length of the view) and never copy. Writing to the view
+    copies its elements first (copy-on-write), as does any in-place change
+    to the array it came from, so a view always behaves like a copy.
+    """
+    
+    # Slices shorter than this are copied; a view costs about as much
+    MIN_LENGTH = 64
+    
+    def __init__(self, owner: PyPPArray, storage, start: int, stop: int):
+        # owner is the array whose in-place writes must detach this view
+        self._owner = owner
+        self._base = storage
+        self._start = start
+        self._stop = stop
+        self._storage = None
+        self._head = 0
+    
+    @staticmethod
+    def over(owner: PyPPArray, storage, bounds: range) -> PyPPArray:
+        """Slice storage[bounds] as a view registered with owner, or a copy if short."""
+        if len(bounds) < ArrayView.MIN_LENGTH:
+            return PyPPArray(storage[bounds.start:bounds.stop])
+        view = ArrayView(owner, storage, bounds.start, bounds.stop)
+        if owner._views is None:
+            owner._views = weakref.WeakSet()
+        owner._views.add(view)
+        return view
+    
+    @property
+    def lazy(self) -> bool:
+        """Whether the elements are still read from the shared storage."""
+        return self._storage is None
+    
+    @property
+    def _items(self):
+        # First access copies the view out of the storage it shares
+        if self._storage is None:
+            self._materialize()
+        return self._storage
+    
+    @_items.setter
+    def _items(self, value):
+        self._storage = value
+        self._base = self._owner = None
+    
+    def _materialize(self) -> None:
+        if self._storage is None:
+            self._items = compact_items(self._base[self._start:self._stop])
+    
+    def __iter__(self):
+        if self._storage is None:
+            return islice(self._base, self._start, self._stop)
+        return super().__iter__()
+    
+    def length(self) -> int:
+        if self._storage is None:
+            return self._stop - self._start
+        return super().length()
+    
+    def get(self, index: int) -> Any:
+        if self._storage is not None:
+            return super().get(index)
+        if not isinstance(index, int):
+            raise PyPPTypeError(f"Array index must be int, got {type(index).__name__}")
+        if index < 0 or index >= self._stop - self._start:
+            raise PyPPRuntimeError(f"Array index out of bounds: {index}")
+        return self._base[self._start + index]
+    
+    def includes(self, item: Any) -> bool:
+        if self._storage is None:
+            return item in iter(self)
+        return super().includes(item)
+    
+    def indexOf(self, item: Any) -> int:
+        if self._storage is not None:
+            return super().indexOf(item)
+        if type(self._base) is list:
+            try:
+                return self._base.index(item, self._start, self._stop) - self._start
+            except ValueError:
+                return -1
+        for index, value in enumerate(iter(self)):
+            if value == item:
+                return index
+        return -1
+    
+    def slice(self, start: int, end: int) -> PyPPArray:
+        if self._storage is not None:
+            return super().slice(start, end)
+        if not isinstance(start, int) or not isinstance(end, int):
+            raise PyPPTypeError("Slice indices must be integers")
+        return ArrayView.over(self._owner, self._base, range(self._start, self._stop)[start:end])
+
+
+class Shape:
+    """Hidden class shared by objects that have the same keys in the same order.
+    
+    A shape maps each key to a slot in the object's value list. Shapes form
+    a transition tree rooted at the empty shape: adding a key to an object
+    moves it to the child shape for that key, so objects built the same way
+    end up sharing one shape. Transitions are weak, so branches no object
+    uses any more are freed.
+    """
+    
+    __slots__ = ('keys', 'index', 'parent', 'transitions', '__weakref__')
+    
+    def __init__(self, keys: tuple = (), parent: 'Shape' = None):
+        self.keys = keys
+        self.index = {key: slot for slot, key in enumerate(keys)}
+        # Strong reference upwards keeps a live shape's whole chain alive
+        self.parent = parent
+        # key -> weak reference to the child shape
+        self.transitions = {}
+    
+    def with_key(self, key: Any) -> 'Shape':
+        """The shape reached by appending key."""
+        transitions = self.transitions
+        ref = transitions.get(key)
+        shape = ref() if ref is not None else None
+        if shape is None:
+            shape = Shape(self.keys + (key,), self)
+            
+            def forget(dead):
+                if transitions.get(key) is dead:
+                    del transitions[key]
+            
+            transitions[key] = weakref.ref(shape, forget)
+        return shape
+    
+    @staticmethod
+    def for_keys(keys) -> 'Shape':
+        """The shared shape for keys, in order."""
+        shape = ROOT_SHAPE
+        for key in keys:
+            shape = shape.with_key(key)
+        return shape
+
+
+ROOT_SHAPE = Shape()
+
+
 class PyPPObject:
-    """Object/Dictionary implementation for py++."""
+    """Object/Dictionary implementation for py++.
+    
+    Values live in a per-object slot list laid out by a shared Shape, so
+    objects with the same keys store each key once between them. Objects
+    with more than MAX_SHAPE_KEYS keys switch to a plain dict instead, to
+    keep the transition tree small.
+    """
+    
+    __slots__ = ('shape', 'slots')
+    
+    MAX_SHAPE_KEYS = 32
     
     def __init__(self, properties: Dict[str, Any] = None):
-        self.properties = properties or {}
+        # shape is None in dictionary mode, where slots is a dict
+        self.shape = ROOT_SHAPE
+        self.slots = []
+        if properties:
+            self.properties = properties
+    
+    @property
+    def properties(self) -> Dict[str, Any]:
+        """A new dict of the object's keys and values, in insertion order."""
+        if self.shape is None:
+            return dict(self.slots)
+        return dict(zip(self.shape.keys, self.slots))
+    
+    @properties.setter
+    def properties(self, properties: Dict[str, Any]) -> None:
+        if len(properties) > self.MAX_SHAPE_KEYS:
+            self.shape = None
+            self.slots = dict(properties)
+        else:
+            self.shape = Shape.for_keys(properties)
+            self.slots = list(properties.values())
     
     def get(self, key: str) -> Any:
         """Get property value."""
-        if key not in self.properties:
+        shape = self.shape
+        if shape is None:
+            if key not in self.slots:
+                raise PyPPRuntimeError(f"Property '{key}' not found on object")
+            return self.slots[key]
+        slot = shape.index.get(key)
+        if slot is None:
             raise PyPPRuntimeError(f"Property '{key}' not found on object")
-        return self.properties[key]
+        return self.slots[slot]
     
     def set(self, key: str, value: Any) -> None:
         """Set property value."""
-        self.properties[key] = value
+        shape = self.shape
+        if shape is None:
+            self.slots[key] = value
+            return
+        slot = shape.index.get(key)
+        if slot is not None:
+            self.slots[slot] = value
+            return
+        # Inline the common case of with_key: the transition already exists
+        ref = shape.transitions.get(key)
+        next_shape = ref() if ref is not None else None
+        if next_shape is None:
+            if len(shape.keys) >= self.MAX_SHAPE_KEYS:
+                properties = self.properties
+                properties[key] = value
+                self.shape = None
+                self.slots = properties
+                return
+            next_shape = shape.with_key(key)
+        self.shape = next_shape
+        self.slots.append(value)
     
     def has(self, key: str) -> bool:
         """Check if property exists."""
-        return key in self.properties
+        if self.shape is None:
+            return key in self.slots
+        return key in self.shape.index
     
     def keys(self) -> List[str]:
         """Get all property names."""
-        return list(self.properties.keys())
+        if self.shape is None:
+            return list(self.slots)
+        return list(self.shape.keys)
     
     def values(self) -> List[Any]:
         """Get all property values."""
-        return list(self.properties.values())
+        if self.shape is None:
+            return list(self.slots.values())
+        return list(self.slots)
     
     def delete(self, key: str) -> bool:
         """Delete property."""
-        if key in self.properties:
-            del self.properties[key]
-            return True
-        return False
+        if not self.has(key):
+            return False
+        properties = self.properties
+        del properties[key]
+        # Rebuilding keeps the remaining keys in order on a shared shape
+        self.properties = properties
+        return True
     
     def merge(self, other: 'PyPPObject') -> 'PyPPObject':
         """Merge two objects."""
@@ -172,6 +772,11 @@ class PyPPObject:
         new_props = {**self.properties, **other.properties}
         return PyPPObject(new_props)
     
+    def __reduce__(self):
+        # Shapes hold weak references and can't be pickled; the receiving
+        # process finds (or builds) its own shape for the keys
+        return type(self), (self.properties,)
+    
     def __str__(self) -> str:
         items = [f"{k}: {v}" for k, v in self.properties.items()]
         return f"{{{', '.join(items)}}}"
@@ -180,6 +785,249 @@ class PyPPObject:
         return self.__str__()
 
 
+class PyPPTable(PyPPObject):
+    """Table of named, equal-length column arrays.
+    
+    A table is an object whose values are its columns, so get(table, name)
+    returns a column. Operations work a column at a time instead of a row
+    at a time: a filter builds one row mask and compresses every column
+    with it, a sort computes one permutation and gathers every column
+    through it. Compact int and float columns stay compact throughout.
+    
+    With NumPy, masks, stable sorts and gathers over compact columns run
+    on views of the same buffers; they select exactly the rows the
+    pure-Python loops would.
+    """
+    
+    __slots__ = ()
+    
+    # Comparison operators accepted by where(table, column, op, value)
+    OPERATORS = {
+        '==': operator.eq, '!=': operator.ne,
+        '<': operator.lt, '<=': operator.le,
+        '>': operator.gt, '>=': operator.ge,
+    }
+    
+    def __init__(self, columns: Dict[str, 'PyPPArray'] = None):
+        columns = columns or {}
+        length = None
+        for name, column in columns.items():
+            if not isinstance(column, PyPPArray):
+                raise PyPPTypeError(f"Table column {name} must be an array, got {type(column).__name__}")
+            if length is None:
+                length = column.length()
+            elif column.length() != length:
+                raise PyPPRuntimeError(f"Table column {name} has {column.length()} rows, expected {length}")
+        super().__init__(columns)
+    
+    @staticmethod
+    def column_of(storage, values) -> 'PyPPArray':
+        """Array of values, stored the same way as storage."""
+        typecode = typecode_of(storage)
+        if typecode:
+            values = array(typecode, values)
+        elif type(storage) is range:
+            values = range_storage(values) if type(values) is range else array('q', values)
+        else:
+            values = list(values)
+        column = PyPPArray()
+        column.items = values
+        return column
+    
+    def rows(self) -> int:
+        """Number of rows."""
+        columns = self.values()
+        return columns[0].length() if columns else 0
+    
+    def storage(self, name: str):
+        """Storage of one column."""
+        if not self.has(name):
+            raise PyPPRuntimeError(f"Table has no column {name}")
+        return self.get(name).items
+    
+    def schema(self) -> Dict[str, str]:
+        """Column name -> int, float, string or any."""
+        kinds = {}
+        for name in self.keys():
+            items = self.storage(name)
+            if type(items) is range:
+                kinds[name] = 'int'
+            elif typecode_of(items):
+                kinds[name] = 'int' if typecode_of(items) == 'q' else 'float'
+            elif all(type(item) is str for item in items):
+                kinds[name] = 'string'
+            else:
+                kinds[name] = 'any'
+        return kinds
+    
+    def select(self, names: List[str]) -> 'PyPPTable':
+        """Table of the named columns, in that order."""
+        return PyPPTable({name: self.column_of(self.storage(name), self.storage(name))
+                          for name in names})
+    
+    def compress(self, mask) -> 'PyPPTable':
+        """Table of the rows whose mask entry is true; mask may be a bool ndarray."""
+        vectorized = np is not None and type(mask) is np.ndarray
+        flags = mask.tolist() if vectorized else list(mask)
+        columns = {}
+        for name in self.keys():
+            items = self.storage(name)
+            view = numpy_view(items) if vectorized else None
+            if view is not None:
+                column = array(typecode_of(items))
+                column.frombytes(view[mask].tobytes())
+                columns[name] = self.column_of(column, column)
+            else:
+                columns[name] = self.column_of(items, compress(items, flags))
+        return PyPPTable(columns)
+    
+    def take(self, order) -> 'PyPPTable':
+        """Table of the rows at the indices in order; order may be an int ndarray."""
+        return PyPPTable({name: self.get(name).gather(order) for name in self.keys()})
+    
+    def where(self, name: str, op: str, value: Any) -> 'PyPPTable':
+        """Rows where column name compares to value with op."""
+        compare = self.OPERATORS.get(op)
+        if compare is None:
+            raise PyPPRuntimeError(f"Unknown comparison operator: {op}")
+        items = self.storage(name)
+        view = numpy_view(items)
+        # NumPy compares int64 with a float by rounding the int; only take exact cases
+        if view is not None and (type(value) is float if typecode_of(items) == 'd'
+                                 else type(value) is int and -2**63 <= value < 2**63):
+            return self.compress(compare(view, value))
+        try:
+            return self.compress(map(compare, items, repeat(value)))
+        except TypeError:
+            raise PyPPTypeError(f"Cannot compare column {name} with {type(value).__name__}")
+    
+    def where_values(self, name: str, predicate: Callable) -> 'PyPPTable':
+        """Rows for which predicate, called with column name's value, is true."""
+        return self.compress(map(predicate, self.storage(name)))
+    
+    def where_rows(self, predicate: Callable) -> 'PyPPTable':
+        """Rows for which predicate, called with each row as an object, is true."""
+        shape = Shape.for_keys(self.keys())
+        new = PyPPObject.__new__
+        
+        def row_object(values):
+            row = new(PyPPObject)
+            row.shape = shape
+            row.slots = list(values)
+            return row
+        
+        storages = [self.storage(name) for name in self.keys()]
+        return self.compress(map(predicate, map(row_object, zip(*storages))))
+    
+    def sort_by(self, name: str, descending: bool = False) -> 'PyPPTable':
+        """Rows ordered by one column; rows with equal values keep their order."""
+        items = self.storage(name)
+        view = numpy_view(items)
+        if view is not None:
+            if not descending:
+                return self.take(np.argsort(view, kind='stable'))
+            # Stable descending: sort the reversed column, then reverse back
+            order = np.argsort(view[::-1], kind='stable')[::-1]
+            return self.take(len(items) - 1 - order)
+        try:
+            order = sorted(range(len(items)), key=items.__getitem__, reverse=descending)
+        except TypeError:
+            raise PyPPTypeError(f"Column {name} has values that cannot be compared")
+        return self.take(order)
+    
+    def group_by(self, name: str) -> 'PyPPGroups':
+        """Rows grouped by the values of one column."""
+        return PyPPGroups(self, name)
+    
+    def __str__(self) -> str:
+        names = self.keys()
+        rows = self.rows()
+        lines = [" | ".join(names)]
+        storages = [self.storage(name) for name in names]
+        for row in islice(zip(*storages), 10):
+            lines.append(" | ".join(map(str, row)))
+        if rows > 10:
+            lines.append(f"... ({rows} rows)")
+        return "\n".join(lines)
+
+
+class PyPPGroups:
+    """Rows of a table split into groups by the values of a key column.
+    
+    Each row gets its group's number once, when the groups are made; every
+    aggregate then reuses those numbers. Groups are in order of first
+    appearance of their key.
+    """
+    
+    AGGREGATES = ('sum', 'mean', 'count', 'min', 'max')
+    
+    def __init__(self, table: PyPPTable, key: str):
+        index = {}
+        setdefault = index.setdefault
+        self.codes = [setdefault(value, len(index)) for value in table.storage(key)]
+        self.keys = list(index)
+        self.table = table
+        self.key = key
+    
+    def counts(self) -> List[int]:
+        """Number of rows in each group."""
+        counted = Counter(self.codes)
+        return [counted[code] for code in range(len(self.keys))]
+    
+    def buckets(self, items) -> List[list]:
+        """Values of one column split into a list per group."""
+        buckets = [[] for _ in self.keys]
+        appends = [bucket.append for bucket in buckets]
+        for code, value in zip(self.codes, items):
+            appends[code](value)
+        return buckets
+    
+    def agg(self, specs: List[tuple]) -> PyPPTable:
+        """Table with one row per group: the key, then one column per (column, op).
+        
+        Columns are named column_op, e.g. amount_sum.
+        """
+        key_items = self.table.storage(self.key)
+        columns = {self.key: PyPPTable.column_of(key_items, self.keys)}
+        buckets = {}
+        for name, op in specs:
+            if op not in self.AGGREGATES:
+                raise PyPPRuntimeError(f"Unknown aggregate: {op}")
+            items = self.table.storage(name)
+            if op == 'count':
+                values = array('q', self.counts())
+            else:
+                if name not in buckets:
+                    buckets[name] = self.buckets(items)
+                values = self.aggregate(buckets[name], items, op, name)
+            column = PyPPArray()
+            column.items = values
+            columns[f"{name}_{op}"] = column
+        return PyPPTable(columns)
+    
+    @staticmethod
+    def aggregate(buckets: List[list], items, op: str, name: str):
+        """Storage for one aggregate over each group's values."""
+        if op in ('min', 'max'):
+            pick = min if op == 'min' else max
+            return PyPPTable.column_of(items, map(pick, buckets)).items
+        ints = ArrayMath.is_ints(items)
+        if not ints and not typecode_of(items):
+            for item in items:
+                if not isinstance(item, (int, float)):
+                    raise PyPPTypeError(f"{op} requires a numeric column, {name} has {type(item).__name__}")
+        total = sum if ints else math.fsum
+        if op == 'sum':
+            return compact_items(list(map(total, buckets)))
+        return array('d', [total(bucket) / len(bucket) for bucket in buckets])
+    
+    def __str__(self) -> str:
+        return f"<{len(self.keys)} groups by {self.key}>"
+    
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
 class PyPPSet:
     """Set implementation for py++."""
     
@@ -253,6 +1101,102 @@ class Decorator:
         return self.func(*args, **kwargs)
 
 
+# Argument types that are their own cache key
+SIMPLE_KEY_TYPES = frozenset((int, float, str, bool, type(None)))
+
+# Cache lookup default that no result can be
+MISSING = object()
+
+def memo_key(value: Any) -> Any:
+    """Hashable key for a value; arrays, objects and sets are keyed by their contents."""
+    if isinstance(value, PyPPArray):
+        return (PyPPArray, tuple(map(memo_key, value)))
+    if isinstance(value, PyPPObject):
+        return (PyPPObject, tuple((key, memo_key(item)) for key, item in value.properties.items()))
+    if isinstance(value, PyPPSet):
+        return (PyPPSet, frozenset(map(memo_key, value.items)))
+    if isinstance(value, StrView):
+        return str(value)
+    if isinstance(value, tuple):
+        return tuple(map(memo_key, value))
+    try:
+        hash(value)
+    except TypeError:
+        raise PyPPTypeError(f"Cannot memoize an argument of type {type(value).__name__}")
+    return value
+
+
+class Memoized(Decorator):
+    """Function whose results are cached by argument values.
+    
+    The cache keeps the maxsize most recently used results (all of them
+    when maxsize is None) and, with a ttl in seconds, forgets results
+    older than that. Arguments are keyed by value, so two arrays with the
+    same elements share an entry.
+    """
+    
+    def __init__(self, func: Callable, maxsize: int = 128, ttl: float = None):
+        if maxsize is not None and (type(maxsize) is not int or maxsize < 0):
+            raise PyPPRuntimeError(f"memo() maxsize must be a non-negative int or null, got {maxsize}")
+        if ttl is not None and (not isinstance(ttl, (int, float)) or ttl <= 0):
+            raise PyPPRuntimeError(f"memo() ttl must be a positive number of seconds, got {ttl}")
+        super().__init__(func)
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> result, or (result, expiry time) with a ttl; oldest first
+        self.cache = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+    
+    def __call__(self, *args):
+        if all(type(arg) in SIMPLE_KEY_TYPES for arg in args):
+            key = args
+        else:
+            key = memo_key(args)
+        cache = self.cache
+        entry = cache.get(key, MISSING)
+        if entry is not MISSING:
+            if self.ttl is None:
+                self.hits += 1
+                cache.move_to_end(key)
+                return entry
+            result, expires = entry
+            if time.monotonic() < expires:
+                self.hits += 1
+                cache.move_to_end(key)
+                return result
+            del cache[key]
+        self.misses += 1
+        result = self.func(*args)
+        if self.maxsize == 0:
+            return result
+        cache[key] = result if self.ttl is None else (result, time.monotonic() + self.ttl)
+        cache.move_to_end(key)
+        if self.maxsize is not None and len(cache) > self.maxsize:
+            cache.popitem(last=False)
+            self.evictions += 1
+        return result
+    
+    def info(self) -> Dict[str, Any]:
+        """Hit, miss and eviction counts, and the cache's size and limits."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.cache),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+        }
+    
+    def clear(self) -> None:
+        """Drop every cached result and reset the counts."""
+        self.cache.clear()
+        self.hits = self.misses = self.evictions = 0
+    
+    def __repr__(self) -> str:
+        return f"<memoized {self.func!r}>"
+
+
+
 class AdvancedMath:
     """Advanced mathematical functions."""
     
@@ -325,6 +1269,353 @@ class AdvancedMath:
         return abs(a * b) // math.gcd(a, b)
 
 
+class ArrayMath:
+    """Bulk numeric operations over arrays.
+    
+    NumPy is used when it is importable, but only for operations where it
+    gives bit-identical results to the pure-Python loops (elementwise
+    add/mul/sqrt and cumulative sums over floats). Float sums use math.fsum
+    on both paths, so they are exactly rounded.
+    """
+    
+    @staticmethod
+    def numbers(arr: Any, name: str):
+        """Return the storage of a numeric array, or raise."""
+        if not isinstance(arr, PyPPArray):
+            raise PyPPTypeError(f"{name}() requires an array, got {type(arr).__name__}")
+        items = arr.items
+        if not typecode_of(items) and type(items) is not range:
+            for item in items:
+                if not isinstance(item, (int, float)):
+                    raise PyPPTypeError(f"{name}() requires a numeric array, got {type(item).__name__}")
+        return items
+    
+    @staticmethod
+    def is_floats(items) -> bool:
+        """Whether items is compact float storage."""
+        return typecode_of(items) == 'd'
+    
+    @staticmethod
+    def is_ints(items) -> bool:
+        """Whether every item is an int (compact or not)."""
+        typecode = typecode_of(items)
+        if typecode:
+            return typecode == 'q'
+        if type(items) is range:
+            return True
+        return all(type(item) is int for item in items)
+    
+    @staticmethod
+    def from_numpy(result) -> 'PyPPArray':
+        """Wrap a float64 ndarray as a compact array."""
+        out = array('d')
+        out.frombytes(result.astype(np.float64).tobytes())
+        return PyPPArray(out)
+    
+    @staticmethod
+    def stream_sum(values, name: str):
+        """Sum an iterable in one pass; returns (total, count).
+        
+        Ints are summed exactly until the first float, and everything from
+        there on is exactly rounded, so no element is held in memory.
+        """
+        total = 0
+        count = 0
+        values = iter(values)
+        for value in values:
+            count += 1
+            if type(value) is int:
+                total += value
+                continue
+            if not isinstance(value, (int, float)):
+                raise PyPPTypeError(f"{name}() requires a numeric array, got {type(value).__name__}")
+            counted = [count]
+            
+            def rest():
+                yield total
+                yield value
+                for item in values:
+                    if not isinstance(item, (int, float)):
+                        raise PyPPTypeError(f"{name}() requires a numeric array, got {type(item).__name__}")
+                    counted[0] += 1
+                    yield item
+            
+            return math.fsum(rest()), counted[0]
+        return total, count
+    
+    @staticmethod
+    def sum(arr: 'PyPPArray') -> Any:
+        """Sum of elements; exact for ints, exactly rounded for floats."""
+        if isinstance(arr, PyPPIter) and arr.lazy:
+            return ArrayMath.stream_sum(arr, 'sum')[0]
+        items = ArrayMath.numbers(arr, 'sum')
+        if type(items) is range:
+            return (items[0] + items[-1]) * len(items) // 2 if items else 0
+        if ArrayMath.is_ints(items):
+            return sum(items)
+        return math.fsum(items)
+    
+    @staticmethod
+    def mean(arr: 'PyPPArray') -> float:
+        """Arithmetic mean of elements."""
+        if isinstance(arr, PyPPIter) and arr.lazy:
+            total, count = ArrayMath.stream_sum(arr, 'mean')
+            if not count:
+                raise PyPPRuntimeError("mean() of empty array")
+            return total / count
+        items = ArrayMath.numbers(arr, 'mean')
+        if not items:
+            raise PyPPRuntimeError("mean() of empty array")
+        return ArrayMath.sum(arr) / len(items)
+    
+    @staticmethod
+    def dot(a: 'PyPPArray', b: 'PyPPArray') -> Any:
+        """Dot product of two equal-length arrays."""
+        x = ArrayMath.numbers(a, 'dot')
+        y = ArrayMath.numbers(b, 'dot')
+        if len(x) != len(y):
+            raise PyPPRuntimeError(f"dot() length mismatch: {len(x)} vs {len(y)}")
+        if ArrayMath.is_ints(x) and ArrayMath.is_ints(y):
+            return sum(map(operator.mul, x, y))
+        if np is not None and ArrayMath.is_floats(x) and ArrayMath.is_floats(y):
+            products = np.multiply(np.frombuffer(x, dtype=np.float64),
+                                   np.frombuffer(y, dtype=np.float64))
+            return math.fsum(products.tolist())
+        return math.fsum(map(operator.mul, x, y))
+    
+    @staticmethod
+    def elementwise(a: 'PyPPArray', b: Any, op, name: str) -> 'PyPPArray':
+        """Apply op to a and an equal-length array or a scalar."""
+        x = ArrayMath.numbers(a, name)
+        if isinstance(b, PyPPArray):
+            y = ArrayMath.numbers(b, name)
+            if len(x) != len(y):
+                raise PyPPRuntimeError(f"{name}() length mismatch: {len(x)} vs {len(y)}")
+            if np is not None and ArrayMath.is_floats(x) and ArrayMath.is_floats(y):
+                return ArrayMath.from_numpy(op(np.frombuffer(x, dtype=np.float64),
+                                               np.frombuffer(y, dtype=np.float64)))
+            return PyPPArray(list(map(op, x, y)))
+        if type(b) not in (int, float):
+            raise PyPPTypeError(f"{name}() requires an array or a number, got {type(b).__name__}")
+        # Small ints convert to float64 exactly, so NumPy agrees with Python
+        exact = type(b) is float or abs(b) < 2 ** 53
+        if np is not None and ArrayMath.is_floats(x) and exact:
+            return ArrayMath.from_numpy(op(np.frombuffer(x, dtype=np.float64), b))
+        return PyPPArray(list(map(op, x, repeat(b))))
+    
+    @staticmethod
+    def add(a: 'PyPPArray', b: Any) -> 'PyPPArray':
+        """Elementwise a + b."""
+        return ArrayMath.elementwise(a, b, operator.add, 'add')
+    
+    @staticmethod
+    def mul(a: 'PyPPArray', b: Any) -> 'PyPPArray':
+        """Elementwise a * b."""
+        return ArrayMath.elementwise(a, b, operator.mul, 'mul')
+    
+    @staticmethod
+    def cumsum(arr: 'PyPPArray') -> 'PyPPArray':
+        """Running totals, summed left to right."""
+        items = ArrayMath.numbers(arr, 'cumsum')
+        if np is not None and ArrayMath.is_floats(items):
+            return ArrayMath.from_numpy(np.cumsum(np.frombuffer(items, dtype=np.float64)))
+        return PyPPArray(list(accumulate(items)))
+    
+    @staticmethod
+    def argmax(arr: 'PyPPArray') -> int:
+        """Index of the first largest element."""
+        items = ArrayMath.numbers(arr, 'argmax')
+        if not items:
+            raise PyPPRuntimeError("argmax() of empty array")
+        return operator.indexOf(items, max(items))
+    
+    @staticmethod
+    def sqrt(arr: 'PyPPArray') -> 'PyPPArray':
+        """Elementwise square root."""
+        items = ArrayMath.numbers(arr, 'sqrt')
+        if items and min(items) < 0:
+            raise PyPPRuntimeError("Cannot compute sqrt of negative number")
+        view = numpy_view(items)
+        if view is not None:
+            return ArrayMath.from_numpy(np.sqrt(view))
+        return PyPPArray(array('d', map(math.sqrt, items)))
+    
+    @staticmethod
+    def exp(arr: 'PyPPArray') -> 'PyPPArray':
+        """Elementwise e ** x."""
+        items = ArrayMath.numbers(arr, 'exp')
+        try:
+            return PyPPArray(array('d', map(math.exp, items)))
+        except OverflowError:
+            raise PyPPRuntimeError("exp() overflow")
+    
+    @staticmethod
+    def log(arr: 'PyPPArray', base: float = 10) -> 'PyPPArray':
+        """Elementwise logarithm, with the same default base as log()."""
+        items = ArrayMath.numbers(arr, 'log')
+        if items and min(items) <= 0:
+            raise PyPPRuntimeError("Cannot compute log of non-positive number")
+        return PyPPArray(array('d', map(math.log, items, repeat(base))))
+
+
+class StrView:
+    """Substring that reads its characters from a longer string.
+    
+    Returned by substring() for long results so that parsers slicing a big
+    buffer in a loop stay linear. len, indexing, find/index, startswith,
+    endswith, `in`, comparisons and hashing work without copying; str()
+    copies the characters out. Strings are immutable, so there is nothing
+    to copy on write.
+    """
+    
+    __slots__ = ('base', 'start', 'stop', '_hash')
+    
+    # Substrings shorter than this are copied; a view costs about as much
+    MIN_LENGTH = 64
+    
+    def __init__(self, base: str, start: int, stop: int):
+        self.base = base
+        self.start = start
+        self.stop = stop
+        self._hash = None
+    
+    @staticmethod
+    def over(base: str, bounds: range) -> Any:
+        """base[bounds] as a StrView, or a plain str if short."""
+        if len(bounds) < StrView.MIN_LENGTH:
+            return base[bounds.start:bounds.stop]
+        return StrView(base, bounds.start, bounds.stop)
+    
+    def __str__(self) -> str:
+        return self.base[self.start:self.stop]
+    
+    def __repr__(self) -> str:
+        return repr(str(self))
+    
+    def __len__(self) -> int:
+        return self.stop - self.start
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return str(self)[index]
+        if index < 0:
+            index += self.stop - self.start
+        if not 0 <= index < self.stop - self.start:
+            raise IndexError("string index out of range")
+        return self.base[self.start + index]
+    
+    def __iter__(self):
+        return islice(self.base, self.start, self.stop)
+    
+    def find(self, sub: str) -> int:
+        position = self.base.find(as_str(sub), self.start, self.stop)
+        return position - self.start if position >= 0 else -1
+    
+    def index(self, sub: str) -> int:
+        position = self.find(sub)
+        if position < 0:
+            raise ValueError("substring not found")
+        return position
+    
+    def startswith(self, prefix: str) -> bool:
+        return self.base.startswith(as_str(prefix), self.start, self.stop)
+    
+    def endswith(self, suffix: str) -> bool:
+        return self.base.endswith(as_str(suffix), self.start, self.stop)
+    
+    def __contains__(self, sub: str) -> bool:
+        return self.find(sub) >= 0
+    
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, StrView):
+            other = str(other)
+        if not isinstance(other, str):
+            return NotImplemented
+        return len(other) == self.stop - self.start and self.startswith(other)
+    
+    def __hash__(self) -> int:
+        # Equal to the hash of the same characters as a str, so views and
+        # strings find each other as object keys and set members
+        if self._hash is None:
+            self._hash = hash(str(self))
+        return self._hash
+    
+    def __lt__(self, other: Any) -> bool:
+        other = as_str(other)
+        return str(self) < other if isinstance(other, str) else NotImplemented
+    
+    def __le__(self, other: Any) -> bool:
+        other = as_str(other)
+        return str(self) <= other if isinstance(other, str) else NotImplemented
+    
+    def __gt__(self, other: Any) -> bool:
+        other = as_str(other)
+        return str(self) > other if isinstance(other, str) else NotImplemented
+    
+    def __ge__(self, other: Any) -> bool:
+        other = as_str(other)
+        return str(self) >= other if isinstance(other, str) else NotImplemented
+    
+    def __add__(self, other: Any) -> str:
+        other = as_str(other)
+        return str(self) + other if isinstance(other, str) else NotImplemented
+    
+    def __radd__(self, other: Any) -> str:
+        return other + str(self) if isinstance(other, str) else NotImplemented
+    
+    def __mul__(self, count: int) -> str:
+        return str(self) * count
+    
+    def __int__(self) -> int:
+        return int(str(self))
+    
+    def __float__(self) -> float:
+        return float(str(self))
+
+
+def as_str(value: Any) -> Any:
+    """Copy a StrView out to a str; any other value is returned as is."""
+    if type(value) is StrView:
+        return str(value)
+    return value
+
+
+class StringBuilder:
+    """Mutable string buffer for building text piece by piece.
+    
+    append() is amortized O(1); toString() joins the pieces once and keeps
+    the result, so calling it again without appending costs nothing.
+    """
+    
+    __slots__ = ('parts', 'size')
+    
+    def __init__(self, initial: str = ""):
+        self.parts = [initial] if initial else []
+        self.size = len(initial)
+    
+    def append(self, value: Any) -> None:
+        """Append value, converted with str() like print() does."""
+        text = value if type(value) is str else str(value)
+        self.parts.append(text)
+        self.size += len(text)
+    
+    def toString(self) -> str:
+        """The text appended so far."""
+        parts = self.parts
+        if len(parts) > 1:
+            parts[:] = [''.join(parts)]
+        return parts[0] if parts else ""
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def __str__(self) -> str:
+        return self.toString()
+    
+    def __repr__(self) -> str:
+        return f"<builder of {self.size} chars>"
+
+
 class StringUtils:
     """Advanced string utilities."""
     
@@ -361,10 +1652,11 @@ class StringUtils:
     
     @staticmethod
     def substring(s: str, start: int, end: int = None) -> str:
-        """Get substring."""
-        if end is None:
-            return s[start:]
-        return s[start:end]
+        """Get substring; long results are StrViews sharing s's characters."""
+        if isinstance(s, StrView):
+            bounds = range(s.start, s.stop)[start:end]
+            return StrView.over(s.base, bounds)
+        return StrView.over(s, range(len(s))[start:end])
     
     @staticmethod
     def indexOf(s: str, search: str) -> int:
@@ -406,7 +1698,7 @@ class DataValidation:
     @staticmethod
     def is_string(value: Any) -> bool:
         """Check if value is a string."""
-        return isinstance(value, str)
+        return isinstance(value, (str, StrView))
     
     @staticmethod
     def is_boolean(value: Any) -> bool:
@@ -431,15 +1723,15 @@ class DataValidation:
     @staticmethod
     def is_function(value: Any) -> bool:
         """Check if value is a function."""
-        from .builtins import PyPPFunction
-        return isinstance(value, PyPPFunction)
+        from .builtins_advanced import PyPPFunction
+        return isinstance(value, (PyPPFunction, Decorator))
     
     @staticmethod
     def validate_type(value: Any, expected_type: str) -> bool:
         """Validate value matches type."""
         type_map = {
             'number': (int, float),
-            'string': str,
+            'string': (str, StrView),
             'boolean': bool,
             'array': PyPPArray,
             'object': PyPPObject,
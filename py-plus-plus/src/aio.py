@@ -0,0 +1,71 @@
+"""Awaitable builtins for py++ async functions.
+
+Calling an `async fn` returns a coroutine; `await` runs it on the asyncio
+event loop that the evaluator starts for a script using top-level await.
+While one coroutine waits (on a sleep, a file read or a subprocess), the
+others run, so independent waits overlap instead of adding up.
+
+File reads run in the loop's default thread pool, since asyncio has no
+non-blocking file I/O. gather() wraps its coroutines in tasks, so they
+all start at once.
+"""
+
+import asyncio
+import inspect
+from typing import Any, Awaitable
+from . import fileio
+from .advanced import PyPPArray, PyPPObject, as_str
+from .errors import RuntimeError as PyPPRuntimeError, TypeError as PyPPTypeError
+
+
+def sleep(seconds: Any) -> Awaitable[None]:
+    """Awaitable that finishes after seconds."""
+    if type(seconds) not in (int, float):
+        raise PyPPTypeError(f"sleepAsync() requires a number, got {type(seconds).__name__}")
+    return asyncio.sleep(max(seconds, 0))
+
+async def read_text(path: Any) -> str:
+    """A whole file as a string, read off the event loop."""
+    return await asyncio.to_thread(fileio.read_text, as_str(path))
+
+async def read_bytes(path: Any) -> Any:
+    """A file's bytes, read (or mapped) off the event loop."""
+    return await asyncio.to_thread(fileio.read_bytes, as_str(path))
+
+async def run_process(command: Any, stdin: Any = None) -> PyPPObject:
+    """Run a program without a shell; object of its exit code, stdout and stderr.
+    
+    command is an array of the program and its arguments.
+    """
+    if not isinstance(command, PyPPArray) or command.length() == 0:
+        raise PyPPTypeError("execAsync() requires a non-empty array of program and arguments")
+    argv = [str(as_str(arg)) for arg in command]
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *argv, stdin=asyncio.subprocess.PIPE if stdin is not None else None,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+    except OSError as e:
+        raise PyPPRuntimeError(f"execAsync() cannot run {argv[0]}: {e.strerror or e}")
+    data = str(as_str(stdin)).encode() if stdin is not None else None
+    stdout, stderr = await process.communicate(data)
+    return PyPPObject({
+        'code': process.returncode,
+        'stdout': stdout.decode(errors='replace'),
+        'stderr': stderr.decode(errors='replace'),
+    })
+
+def gather(*awaitables: Any) -> Awaitable[PyPPArray]:
+    """Awaitable of every result, in order, with all of them run concurrently.
+    
+    Takes awaitables as arguments or one array of them. The first error
+    raised by any of them is raised by the await.
+    """
+    if len(awaitables) == 1 and isinstance(awaitables[0], PyPPArray):
+        awaitables = tuple(awaitables[0])
+    for value in awaitables:
+        if not inspect.isawaitable(value):
+            raise PyPPTypeError(f"gather() requires awaitables, got {type(value).__name__}")
+    return collect(awaitables)
+
+async def collect(awaitables: tuple) -> PyPPArray:
+    return PyPPArray(list(await asyncio.gather(*awaitables)))
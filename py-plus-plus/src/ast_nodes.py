@@ -4,6 +4,18 @@ class ASTNode:
     """Base class for all AST nodes."""
     pass
 
+def walk(node):
+    """Yield node and every AST node below it, in no particular order."""
+    pending = [node]
+    while pending:
+        current = pending.pop()
+        yield current
+        for value in vars(current).values():
+            if isinstance(value, ASTNode):
+                pending.append(value)
+            elif isinstance(value, list):
+                pending.extend(item for item in value if isinstance(item, ASTNode))
+
 # Statements
 class Program(ASTNode):
     def __init__(self, statements):
@@ -16,12 +28,17 @@ class LetStatement(ASTNode):
         self.type_annotation = type_annotation
 
 class FunctionDecl(ASTNode):
-    def __init__(self, name, params, body, return_type=None, param_types=None):
+    def __init__(self, name, params, body, return_type=None, param_types=None, decorators=None,
+                 is_async=False):
         self.name = name
         self.params = params
         self.body = body
         self.return_type = return_type
         self.param_types = param_types or {}
+        # CallExpressions applied innermost-last; the function is passed first
+        self.decorators = decorators or []
+        # Calls to an async fn return a coroutine instead of running the body
+        self.is_async = is_async
 
 class ReturnStatement(ASTNode):
     def __init__(self, value):
@@ -60,8 +77,15 @@ class ContinueStatement(ASTNode):
     pass
 
 class ImportStatement(ASTNode):
-    def __init__(self, module_name):
+    def __init__(self, module_name, lazy=False):
         self.module_name = module_name
+        self.lazy = lazy
+
+class ForeignImport(ASTNode):
+    def __init__(self, path, alias, signatures=None):
+        self.path = path
+        self.alias = alias
+        self.signatures = signatures or {}
 
 # Expressions
 class BinaryOp(ASTNode):
@@ -97,3 +121,7 @@ class MemberAccess(ASTNode):
     def __init__(self, obj, member):
         self.obj = obj
         self.member = member
+
+class AwaitExpression(ASTNode):
+    def __init__(self, value):
+        self.value = value
@@ -1,22 +1,37 @@
 """Advanced built-in functions for py++."""
 
 import time
-import random as py_random
 import json as py_json
 from datetime import datetime, timedelta
-from .advanced import PyPPArray, PyPPObject, PyPPSet, AdvancedMath, StringUtils, DataValidation
+from .advanced import PyPPArray, PyPPRange, PyPPIter, ArrayView, StrView, StringBuilder, as_str, PyPPObject, PyPPSet, PyPPTable, PyPPGroups, Decorator, Memoized, AdvancedMath, ArrayMath, StringUtils, DataValidation
 from .errors import RuntimeError as PyPPRuntimeError, TypeError as PyPPTypeError
+from . import aio, columnar, fileio, jsonio, rand, regex, shared, timing
 
 class PyPPFunction:
     """Function implementation for py++."""
     
-    def __init__(self, params, body, closure):
+    def __init__(self, params, body, closure, evaluator=None, is_async=False):
         self.params = params
         self.body = body
         self.closure = closure
+        # Evaluator that declared the function; builtins call back through it
+        self.evaluator = evaluator
+        self.is_async = is_async
     
     def __repr__(self):
-        return f"<function with {len(self.params)} params>"
+        kind = "async function" if self.is_async else "function"
+        return f"<{kind} with {len(self.params)} params>"
+
+
+def as_callback(fn, name):
+    """Return a Python callable that invokes fn, a py++ function or builtin."""
+    if isinstance(fn, PyPPFunction):
+        if fn.evaluator is None:
+            raise PyPPRuntimeError(f"{name}() cannot call a function outside an evaluator")
+        return fn.evaluator.invoker(fn)
+    if callable(fn):
+        return fn
+    raise PyPPTypeError(f"{name}() requires a function, got {type(fn).__name__}")
 
 
 # ============= Array Functions =============
@@ -61,15 +76,17 @@ def builtin_array_reverse(arr):
     arr.reverse()
     return None
 
-def builtin_array_sort(arr):
-    """Sort array."""
+def builtin_array_sort(arr, key=None):
+    """Sort array, optionally by a key function."""
     if not isinstance(arr, PyPPArray):
         raise PyPPTypeError("sort() requires an array")
-    arr.sort()
+    arr.sort(as_callback(key, 'sort') if key is not None else None)
     return None
 
 def builtin_array_slice(arr, start, end=None):
-    """Slice array."""
+    """Slice array; slices of bytes from readBytes() are views too."""
+    if isinstance(arr, memoryview):
+        return arr[start:end]
     if not isinstance(arr, PyPPArray):
         raise PyPPTypeError("slice() requires an array")
     if end is None:
@@ -83,15 +100,19 @@ def builtin_array_join(arr, separator=""):
     return arr.join(separator)
 
 def builtin_array_includes(arr, item):
-    """Check if array includes item."""
+    """Check if array includes item, or string includes substring."""
+    if isinstance(arr, (str, StrView)):
+        return builtin_string_includes(arr, item)
     if not isinstance(arr, PyPPArray):
-        raise PyPPTypeError("includes() requires an array")
+        raise PyPPTypeError("includes() requires an array or a string")
     return arr.includes(item)
 
 def builtin_array_indexof(arr, item):
-    """Get index of item in array."""
+    """Get index of item in array, or of substring in string."""
+    if isinstance(arr, (str, StrView)):
+        return builtin_string_indexof(arr, item)
     if not isinstance(arr, PyPPArray):
-        raise PyPPTypeError("indexOf() requires an array")
+        raise PyPPTypeError("indexOf() requires an array or a string")
     return arr.indexOf(item)
 
 def builtin_array_length(arr):
@@ -101,6 +122,64 @@ def builtin_array_length(arr):
     return arr.length()
 
 
+def builtin_array_map(arr, fn):
+    """Map function over array."""
+    if not isinstance(arr, PyPPArray):
+        raise PyPPTypeError("map() requires an array")
+    return arr.map(as_callback(fn, 'map'))
+
+def builtin_array_filter(arr, fn):
+    """Filter array by function."""
+    if not isinstance(arr, PyPPArray):
+        raise PyPPTypeError("filter() requires an array")
+    return arr.filter(as_callback(fn, 'filter'))
+
+def builtin_pmap(fn, arr, options=None):
+    """Map fn over arr in worker processes; results keep arr's order.
+    
+    options: workers (default: one per CPU; 1 runs in this process) and
+    chunkSize (items sent to a worker at a time).
+    """
+    # Imported here: parallel builds on the evaluator, which imports this module
+    from . import parallel
+    if options is None:
+        options = {}
+    elif isinstance(options, PyPPObject):
+        options = options.properties
+    else:
+        raise PyPPTypeError(f"pmap() options must be an object, got {type(options).__name__}")
+    return parallel.pmap(fn, arr, options.get('workers'), options.get('chunkSize'))
+
+def builtin_array_take(arr, count):
+    """First count items of an array; lazy for ranges and pipelines."""
+    if not isinstance(arr, PyPPArray):
+        raise PyPPTypeError("take() requires an array")
+    return arr.take(count)
+
+def builtin_array_materialize(arr):
+    """Copy a lazy array or a view out into a plain array or string."""
+    if isinstance(arr, (str, StrView)):
+        return str(arr)
+    if not isinstance(arr, PyPPArray):
+        raise PyPPTypeError("materialize() requires an array or a string")
+    if isinstance(arr, (PyPPRange, PyPPIter, ArrayView)):
+        return PyPPArray(list(arr))
+    return arr
+
+def builtin_array_reduce(arr, fn, initial=None):
+    """Reduce array with function."""
+    if not isinstance(arr, PyPPArray):
+        raise PyPPTypeError("reduce() requires an array")
+    return arr.reduce(as_callback(fn, 'reduce'), initial)
+
+def builtin_array_foreach(arr, fn):
+    """Call function on each array item."""
+    if not isinstance(arr, PyPPArray):
+        raise PyPPTypeError("forEach() requires an array")
+    arr.forEach(as_callback(fn, 'forEach'))
+    return None
+
+
 # ============= Object Functions =============
 def builtin_object(**props):
     """Create an object."""
@@ -129,16 +208,20 @@ def builtin_object_has(obj, key):
     return obj.has(key)
 
 def builtin_object_get(obj, key):
-    """Get object property."""
+    """Get object property, or array item (or byte) by index."""
+    if isinstance(obj, PyPPArray):
+        return obj.get(key)
+    if isinstance(obj, memoryview):
+        return obj[key]
     if not isinstance(obj, PyPPObject):
-        raise PyPPTypeError("get() requires an object")
+        raise PyPPTypeError("get() requires an object or an array")
     return obj.get(key)
 
 def builtin_object_set(obj, key, value):
     """Set object property."""
     if not isinstance(obj, PyPPObject):
         raise PyPPTypeError("set() requires an object")
-    obj.set(key, value)
+    obj.set(as_str(key), value)
     return None
 
 def builtin_object_delete(obj, key):
@@ -157,7 +240,7 @@ def builtin_object_merge(obj1, obj2):
 # ============= Set Functions =============
 def builtin_set(*items):
     """Create a set."""
-    return PyPPSet(list(items))
+    return PyPPSet([as_str(item) for item in items])
 
 def builtin_is_set(value):
     """Check if value is set."""
@@ -167,9 +250,17 @@ def builtin_set_add(s, item):
     """Add to set."""
     if not isinstance(s, PyPPSet):
         raise PyPPTypeError("add() requires a set")
-    s.add(item)
+    s.add(as_str(item))
     return None
 
+def builtin_add(target, value):
+    """Add to a set, or add arrays elementwise."""
+    if isinstance(target, PyPPArray):
+        return ArrayMath.add(target, value)
+    if not isinstance(target, PyPPSet):
+        raise PyPPTypeError("add() requires a set or an array")
+    return builtin_set_add(target, value)
+
 def builtin_set_remove(s, item):
     """Remove from set."""
     if not isinstance(s, PyPPSet):
@@ -210,6 +301,8 @@ def builtin_set_difference(s1, s2):
 # ============= Math Functions =============
 def builtin_sqrt(n):
     """Square root."""
+    if isinstance(n, PyPPArray):
+        return ArrayMath.sqrt(n)
     return AdvancedMath.sqrt(n)
 
 def builtin_sin(n):
@@ -226,10 +319,14 @@ def builtin_tan(n):
 
 def builtin_log(n, base=10):
     """Logarithm."""
+    if isinstance(n, PyPPArray):
+        return ArrayMath.log(n, base)
     return AdvancedMath.log(n, base)
 
 def builtin_exp(n):
     """Exponential."""
+    if isinstance(n, PyPPArray):
+        return ArrayMath.exp(n)
     return AdvancedMath.exp(n)
 
 def builtin_floor(n):
@@ -269,6 +366,32 @@ def builtin_max(*args):
     return max(args)
 
 
+# ============= Array Math Functions =============
+def builtin_sum(arr):
+    """Sum of array elements."""
+    return ArrayMath.sum(arr)
+
+def builtin_mean(arr):
+    """Mean of array elements."""
+    return ArrayMath.mean(arr)
+
+def builtin_dot(a, b):
+    """Dot product of two arrays."""
+    return ArrayMath.dot(a, b)
+
+def builtin_mul(a, b):
+    """Multiply an array elementwise by an array or a number."""
+    return ArrayMath.mul(a, b)
+
+def builtin_cumsum(arr):
+    """Running totals of an array."""
+    return ArrayMath.cumsum(arr)
+
+def builtin_argmax(arr):
+    """Index of the largest array element."""
+    return ArrayMath.argmax(arr)
+
+
 # ============= String Functions =============
 def builtin_uppercase(s):
     """Uppercase."""
@@ -288,38 +411,93 @@ def builtin_trim(s):
 
 def builtin_string_split(s, sep=" "):
     """Split string."""
-    return StringUtils.split(str(s), sep)
+    return StringUtils.split(str(s), as_str(sep))
 
 def builtin_string_replace(s, find, repl):
     """Replace in string."""
-    return StringUtils.replace(str(s), find, repl)
+    return StringUtils.replace(str(s), as_str(find), as_str(repl))
+
+# The builtins below accept StrViews as they are, without copying them out
+
+def string_arg(s):
+    """A string argument as a str or StrView."""
+    return s if type(s) is StrView else str(s)
 
 def builtin_string_substring(s, start, end=None):
     """Get substring."""
-    if end is None:
-        end = len(s)
-    return StringUtils.substring(str(s), start, end)
+    return StringUtils.substring(string_arg(s), start, end)
 
 def builtin_string_indexof(s, search):
     """Index of substring."""
-    return StringUtils.indexOf(str(s), search)
+    return StringUtils.indexOf(string_arg(s), as_str(search))
 
 def builtin_string_startswith(s, search):
     """Starts with."""
-    return StringUtils.startsWith(str(s), search)
+    return StringUtils.startsWith(string_arg(s), as_str(search))
 
 def builtin_string_endswith(s, search):
     """Ends with."""
-    return StringUtils.endsWith(str(s), search)
+    return StringUtils.endsWith(string_arg(s), as_str(search))
 
 def builtin_string_includes(s, search):
     """Includes substring."""
-    return StringUtils.includes(str(s), search)
+    return StringUtils.includes(string_arg(s), as_str(search))
 
 def builtin_string_repeat(s, count):
     """Repeat string."""
     return StringUtils.repeat(str(s), count)
 
+def builtin_builder(initial=""):
+    """Create a string builder."""
+    return StringBuilder(str(initial))
+
+def builtin_builder_append(sb, value):
+    """Append to a string builder."""
+    if not isinstance(sb, StringBuilder):
+        raise PyPPTypeError("append() requires a builder")
+    sb.append(value)
+    return None
+
+def builtin_builder_tostring(sb):
+    """Text of a string builder."""
+    if not isinstance(sb, StringBuilder):
+        raise PyPPTypeError("toString() requires a builder")
+    return sb.toString()
+
+
+# ============= Regex Functions =============
+# Patterns may be strings (compiled through the shared cache) or regex() handles
+
+def builtin_regex(pattern, flags=""):
+    """Compiled pattern handle; flags is a string of i, m, s, x."""
+    return regex.Regex(regex.text_of(pattern, 'regex'), as_str(flags))
+
+def builtin_match(s, pattern):
+    """Array of the match at the start of s and its groups, or null."""
+    return regex.match(s, pattern)
+
+def builtin_search(s, pattern):
+    """Array of the first match in s and its groups, or null."""
+    return regex.search(s, pattern)
+
+def builtin_find_all(s, pattern):
+    """Array of every match in s."""
+    return regex.find_all(s, pattern)
+
+def builtin_regex_replace(s, pattern, replacement, count=0):
+    """Replace matches with a template string, or with fn(groups)."""
+    if isinstance(replacement, PyPPFunction):
+        replacement = as_callback(replacement, 'regexReplace')
+    return regex.replace(s, pattern, replacement, count)
+
+def builtin_regex_split(s, pattern, limit=0):
+    """Split s at each match."""
+    return regex.split(s, pattern, limit)
+
+def builtin_regex_cache_size(size):
+    """Set how many compiled patterns are cached; returns the previous size."""
+    return regex.PATTERNS.resize(size)
+
 
 # ============= Validation Functions =============
 def builtin_is_number(value):
@@ -355,29 +533,54 @@ def builtin_len(obj):
         return obj.length()
     if isinstance(obj, PyPPSet):
         return obj.size()
+    if isinstance(obj, PyPPTable):
+        return obj.rows()
     return len(obj)
 
 def builtin_range(*args):
-    """Create range."""
-    return PyPPArray(list(range(*args)))
+    """Create a lazy range; its items are only stored if it is mutated."""
+    return PyPPRange(range(*args))
 
 def builtin_time():
     """Current time."""
     return time.time()
 
+def builtin_perf_now():
+    """Seconds from a monotonic high-resolution clock; only differences are meaningful."""
+    return time.perf_counter()
+
+def builtin_monotonic_ns():
+    """Integer nanoseconds from a monotonic clock; only differences are meaningful."""
+    return time.monotonic_ns()
+
+def builtin_bench(fn, options=None):
+    """Time calls to fn() with warmup and calibrated batches.
+    
+    options: warmup (calls, 10), minTime (seconds per batch, 0.1), repeat
+    (batches, 5) and iterations (calls per batch, instead of calibrating).
+    Returns an object of per-call seconds (min, median, p95, mean) and
+    opsPerSec.
+    """
+    if options is None:
+        options = {}
+    elif isinstance(options, PyPPObject):
+        options = options.properties
+    else:
+        raise PyPPTypeError(f"bench() options must be an object, got {type(options).__name__}")
+    result = timing.bench(
+        as_callback(fn, 'bench'),
+        warmup=options.get('warmup', timing.WARMUP),
+        min_time=options.get('minTime', timing.MIN_TIME),
+        repetitions=options.get('repeat', timing.REPEAT),
+        iterations=options.get('iterations'),
+    )
+    return PyPPObject(result)
+
 def builtin_sleep(seconds):
     """Sleep."""
     time.sleep(seconds)
     return None
 
-def builtin_random():
-    """Random number."""
-    return py_random.random()
-
-def builtin_randint(a, b):
-    """Random integer."""
-    return py_random.randint(a, b)
-
 def builtin_int(value):
     """Convert to int."""
     return int(value)
@@ -398,42 +601,248 @@ def builtin_type(obj):
     """Get type name."""
     if isinstance(obj, PyPPArray):
         return "array"
+    if isinstance(obj, PyPPTable):
+        return "table"
+    if isinstance(obj, PyPPGroups):
+        return "groups"
     if isinstance(obj, PyPPObject):
         return "object"
     if isinstance(obj, PyPPSet):
         return "set"
-    if isinstance(obj, PyPPFunction):
+    if isinstance(obj, (PyPPFunction, Decorator)):
         return "function"
+    if isinstance(obj, StrView):
+        return "str"
+    if isinstance(obj, StringBuilder):
+        return "builder"
+    if isinstance(obj, regex.Regex):
+        return "regex"
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return "bytes"
     return type(obj).__name__
 
+def builtin_runtime_stats():
+    """Object of runtime counters, e.g. regex cache hits and misses."""
+    return PyPPObject(regex.PATTERNS.stats())
+
 def builtin_typeof(obj):
     """Typeof operator."""
     return builtin_type(obj)
 
 def builtin_json_stringify(obj):
     """Convert to JSON string."""
-    def to_serializable(obj):
-        if isinstance(obj, PyPPArray):
-            return [to_serializable(item) for item in obj.items]
-        if isinstance(obj, PyPPObject):
-            return {k: to_serializable(v) for k, v in obj.properties.items()}
-        if isinstance(obj, PyPPSet):
-            return list(obj.items)
-        return obj
-    
-    return py_json.dumps(to_serializable(obj))
+    return jsonio.dumps(obj)
 
 def builtin_json_parse(json_str):
-    """Parse JSON string."""
-    def from_json(obj):
-        if isinstance(obj, dict):
-            return PyPPObject(obj)
-        if isinstance(obj, list):
-            return PyPPArray(obj)
-        return obj
+    """Parse JSON string; nested objects and arrays are converted on first access."""
+    return jsonio.wrap(py_json.loads(as_str(json_str)))
+
+def builtin_json_write(path, obj):
+    """Write obj to a file as JSON, without building the text in memory."""
+    with open(as_str(path), 'w', encoding='utf-8') as f:
+        jsonio.dump(obj, f)
+    return None
+
+def builtin_ndjson_read(path):
+    """Lazy array of the records in an NDJSON file, read one line at a time."""
+    return PyPPIter(jsonio.NdjsonFile(fileio.check_file(path)))
+
+def builtin_ndjson_write(path, records):
+    """Write records (any array, lazy ones included) to a file as NDJSON."""
+    if not isinstance(records, PyPPArray):
+        raise PyPPTypeError(f"writeNdjson() requires an array, got {type(records).__name__}")
+    return jsonio.write_ndjson(as_str(path), records)
+
+
+# ============= File Functions =============
+def builtin_read_text(path):
+    """Read a whole file as a string."""
+    return fileio.read_text(path)
+
+def builtin_write_text(path, text):
+    """Write a string to a file, replacing its contents."""
+    return fileio.write_text(path, as_str(text))
+
+def builtin_append_text(path, text):
+    """Append a string to a file."""
+    return fileio.write_text(path, as_str(text), append=True)
+
+def builtin_read_lines(path):
+    """Lazy array of a file's lines, read one buffer at a time."""
+    return PyPPIter(fileio.LineFile(fileio.check_file(path)))
+
+def builtin_write_lines(path, lines):
+    """Write each element of an array (lazy ones included) on its own line."""
+    if not isinstance(lines, PyPPArray):
+        raise PyPPTypeError(f"writeLines() requires an array, got {type(lines).__name__}")
+    return fileio.write_lines(path, lines)
+
+def builtin_read_bytes(path):
+    """Read-only bytes of a file; large files are memory-mapped, not copied."""
+    return fileio.read_bytes(path)
+
+def builtin_decode(data):
+    """Decode bytes as UTF-8 text."""
+    if not isinstance(data, (bytes, bytearray, memoryview)):
+        raise PyPPTypeError(f"decode() requires bytes, got {type(data).__name__}")
+    return str(data, 'utf-8')
+
+
+# ============= CSV Functions =============
+def csv_table(names, kinds, columns):
+    """Table mapping each column name to an array of that column's values."""
+    arrays = {}
+    for name, column in zip(names, columns):
+        array = PyPPArray()
+        array.items = column
+        arrays[name] = array
+    return PyPPTable(arrays)
+
+def builtin_read_csv(path, options=None):
+    """Read a CSV file into typed columns.
+    
+    options: delimiter (","), header (true), types (column name -> "int",
+    "float" or "string"; others are inferred) and chunkSize. With
+    chunkSize the result is a lazy array of tables of that many rows,
+    read as they are consumed.
+    """
+    if options is None:
+        options = {}
+    elif isinstance(options, PyPPObject):
+        options = options.properties
+    else:
+        raise PyPPTypeError(f"readCsv() options must be an object, got {type(options).__name__}")
+    types = options.get('types')
+    chunk_size = options.get('chunkSize')
+    reader = columnar.CsvFile(
+        fileio.check_file(path),
+        delimiter=as_str(options.get('delimiter', ',')),
+        header=options.get('header', True),
+        types=types.properties if isinstance(types, PyPPObject) else None,
+        batch_rows=chunk_size or columnar.BATCH_ROWS,
+    )
+    if chunk_size is not None:
+        return PyPPIter(reader, (('map', lambda batch: csv_table(*batch)),))
+    return csv_table(*reader.read())
+
+
+# ============= Memoization Functions =============
+def builtin_memo(fn, maxsize=128, ttl=None):
+    """fn with its results cached by argument; also usable as @memo or @memo(maxsize, ttl).
     
-    parsed = py_json.loads(json_str)
-    return from_json(parsed)
+    maxsize bounds the cache (least recently used results go first; null
+    for no bound); ttl, in seconds, expires results.
+    """
+    return Memoized(as_callback(fn, 'memo'), maxsize, ttl)
+
+def builtin_cache_info(fn):
+    """Object of a memoized function's hits, misses, evictions and size."""
+    if not isinstance(fn, Memoized):
+        raise PyPPTypeError(f"cacheInfo() requires a memoized function, got {type(fn).__name__}")
+    return PyPPObject(fn.info())
+
+
+# ============= Table Functions =============
+def as_table(value, name):
+    if not isinstance(value, PyPPTable):
+        raise PyPPTypeError(f"{name}() requires a table, got {type(value).__name__}")
+    return value
+
+def builtin_table(columns):
+    """Table from an object mapping column names to equal-length arrays.
+    
+    The arrays are copied into compact storage where their values allow.
+    """
+    if isinstance(columns, PyPPTable):
+        return columns
+    if not isinstance(columns, PyPPObject):
+        raise PyPPTypeError(f"table() requires an object of columns, got {type(columns).__name__}")
+    return PyPPTable({name: PyPPArray(list(column)) if isinstance(column, PyPPArray) else column
+                      for name, column in columns.properties.items()})
+
+def builtin_where(table, *args):
+    """Rows of a table that pass a test.
+    
+    where(table, fn) calls fn with each row as an object; where(table,
+    column, fn) calls fn with just that column's value; where(table,
+    column, op, value) compares the column with op ("==", "<", ...) and
+    calls no py++ code at all.
+    """
+    table = as_table(table, 'where')
+    if len(args) == 1:
+        return table.where_rows(as_callback(args[0], 'where'))
+    if len(args) == 2:
+        return table.where_values(as_str(args[0]), as_callback(args[1], 'where'))
+    if len(args) == 3:
+        return table.where(as_str(args[0]), as_str(args[1]), args[2])
+    raise PyPPTypeError(f"where() expects 2 to 4 args, got {len(args) + 1}")
+
+def builtin_select(table, *names):
+    """Table of only the named columns."""
+    return as_table(table, 'select').select([as_str(name) for name in names])
+
+def builtin_group_by(table, key):
+    """Rows of a table grouped by the values of column key."""
+    return as_table(table, 'groupBy').group_by(as_str(key))
+
+def builtin_agg(groups, *specs):
+    """One row per group: agg(groups, column, op, column, op, ...).
+    
+    op is "sum", "mean", "count", "min" or "max"; each result column is
+    named column_op.
+    """
+    if not isinstance(groups, PyPPGroups):
+        raise PyPPTypeError(f"agg() requires groups from groupBy(), got {type(groups).__name__}")
+    if not specs or len(specs) % 2:
+        raise PyPPTypeError("agg() expects column, op pairs")
+    names = [as_str(spec) for spec in specs]
+    return groups.agg(list(zip(names[::2], names[1::2])))
+
+def builtin_sort_by(table, column, descending=False):
+    """Rows of a table ordered by one column; ties keep their order."""
+    return as_table(table, 'sortBy').sort_by(as_str(column), descending)
+
+def builtin_schema(table):
+    """Object mapping each column name to its type."""
+    return PyPPObject(as_table(table, 'schema').schema())
+
+
+# ============= Shared Memory Functions =============
+def builtin_share(arr):
+    """Copy of a numeric array in shared memory, which pmap workers use without copying."""
+    return shared.share(arr)
+
+def builtin_shared_array(length, kind="float"):
+    """Zero-filled shared array of length ints or floats."""
+    return shared.create(length, as_str(kind))
+
+def builtin_release(arr):
+    """Free a shared array's memory now instead of when the script ends."""
+    if not isinstance(arr, shared.SharedArray):
+        raise PyPPTypeError(f"release() requires a shared array, got {type(arr).__name__}")
+    arr.release()
+
+
+# ============= Async Functions =============
+def builtin_sleep_async(seconds):
+    """Awaitable sleep: other tasks run while it waits."""
+    return aio.sleep(seconds)
+
+def builtin_read_text_async(path):
+    """Awaitable of a whole file as a string."""
+    return aio.read_text(path)
+
+def builtin_read_bytes_async(path):
+    """Awaitable of a file's bytes."""
+    return aio.read_bytes(path)
+
+def builtin_exec_async(command, stdin=None):
+    """Awaitable of running [program, args...]: an object of code, stdout and stderr."""
+    return aio.run_process(command, stdin)
+
+def builtin_gather(*awaitables):
+    """Awaitable of the results of several awaitables (or one array of them), run concurrently."""
+    return aio.gather(*awaitables)
 
 
 # ============= Register all builtins =============
@@ -452,6 +861,13 @@ BUILTINS = {
     'includes': builtin_array_includes,
     'indexOf': builtin_array_indexof,
     'length': builtin_array_length,
+    'map': builtin_array_map,
+    'filter': builtin_array_filter,
+    'pmap': builtin_pmap,
+    'reduce': builtin_array_reduce,
+    'forEach': builtin_array_foreach,
+    'take': builtin_array_take,
+    'materialize': builtin_array_materialize,
     
     # Object functions
     'object': builtin_object,
@@ -467,7 +883,7 @@ BUILTINS = {
     # Set functions
     'set': builtin_set,
     'isSet': builtin_is_set,
-    'add': builtin_set_add,
+    'add': builtin_add,
     'remove': builtin_set_remove,
     'size': builtin_set_size,
     'union': builtin_set_union,
@@ -490,6 +906,14 @@ BUILTINS = {
     'min': builtin_min,
     'max': builtin_max,
     
+    # Array math functions
+    'sum': builtin_sum,
+    'mean': builtin_mean,
+    'dot': builtin_dot,
+    'mul': builtin_mul,
+    'cumsum': builtin_cumsum,
+    'argmax': builtin_argmax,
+    
     # String functions
     'uppercase': builtin_uppercase,
     'lowercase': builtin_lowercase,
@@ -501,6 +925,18 @@ BUILTINS = {
     'startsWith': builtin_string_startswith,
     'endsWith': builtin_string_endswith,
     'repeat': builtin_string_repeat,
+    'builder': builtin_builder,
+    'append': builtin_builder_append,
+    'toString': builtin_builder_tostring,
+    
+    # Regex functions
+    'regex': builtin_regex,
+    'match': builtin_match,
+    'search': builtin_search,
+    'findAll': builtin_find_all,
+    'regexReplace': builtin_regex_replace,
+    'regexSplit': builtin_regex_split,
+    'regexCacheSize': builtin_regex_cache_size,
     
     # Validation functions
     'isNumber': builtin_is_number,
@@ -514,15 +950,61 @@ BUILTINS = {
     'len': builtin_len,
     'range': builtin_range,
     'time': builtin_time,
+    'perfNow': builtin_perf_now,
+    'monotonicNs': builtin_monotonic_ns,
+    'bench': builtin_bench,
     'sleep': builtin_sleep,
-    'random': builtin_random,
-    'randint': builtin_randint,
     'int': builtin_int,
     'float': builtin_float,
     'str': builtin_str,
     'bool': builtin_bool,
     'type': builtin_type,
     'typeof': builtin_typeof,
+    'runtimeStats': builtin_runtime_stats,
     'stringify': builtin_json_stringify,
     'parse': builtin_json_parse,
+    'writeJson': builtin_json_write,
+    'readNdjson': builtin_ndjson_read,
+    'writeNdjson': builtin_ndjson_write,
+    
+    # File functions
+    'readText': builtin_read_text,
+    'writeText': builtin_write_text,
+    'appendText': builtin_append_text,
+    'readLines': builtin_read_lines,
+    'writeLines': builtin_write_lines,
+    'readBytes': builtin_read_bytes,
+    'decode': builtin_decode,
+    
+    # CSV functions
+    'readCsv': builtin_read_csv,
+    
+    # Memoization functions
+    'memo': builtin_memo,
+    'cacheInfo': builtin_cache_info,
+    
+    # Table functions
+    'table': builtin_table,
+    'where': builtin_where,
+    'select': builtin_select,
+    'groupBy': builtin_group_by,
+    'agg': builtin_agg,
+    'sortBy': builtin_sort_by,
+    'schema': builtin_schema,
+    
+    # Shared memory functions
+    'share': builtin_share,
+    'sharedArray': builtin_shared_array,
+    'release': builtin_release,
+    
+    # Async functions
+    'sleepAsync': builtin_sleep_async,
+    'readTextAsync': builtin_read_text_async,
+    'readBytesAsync': builtin_read_bytes_async,
+    'execAsync': builtin_exec_async,
+    'gather': builtin_gather,
+    
+    # Random functions: seed, random, randint, randomArray, randintArray,
+    # shuffle, sample, choice. Each evaluator binds them to its own generator
+    **rand.DEFAULT.builtins(),
 }
@@ -0,0 +1,160 @@
+"""CSV reading into typed columns.
+
+Rows are parsed by the csv module a batch at a time and each batch is
+turned into columns in one pass. Every column is then converted as a
+whole: a column whose values all parse as ints is stored in a compact
+array('q'), floats in array('d'), anything else as a list of strings.
+Blank lines are skipped.
+"""
+
+import csv
+from array import array
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from .errors import RuntimeError as PyPPRuntimeError, TypeError as PyPPTypeError
+
+# Rows parsed and converted per batch when reading a whole file
+BATCH_ROWS = 65536
+
+
+def convert_column(values: tuple, kind: str = 'int') -> Tuple[str, Any]:
+    """(kind, storage) for a column of strings, widening kind until every value parses."""
+    if kind == 'int':
+        try:
+            return 'int', array('q', map(int, values))
+        except (ValueError, OverflowError):
+            kind = 'float'
+    if kind == 'float':
+        try:
+            return 'float', array('d', map(float, values))
+        except ValueError:
+            pass
+    return 'string', list(values)
+
+def convert_declared(name: str, values: tuple, kind: str) -> Any:
+    """Storage for a column with a declared kind; every value must parse."""
+    try:
+        if kind == 'int':
+            return array('q', map(int, values))
+        if kind == 'float':
+            return array('d', map(float, values))
+    except (ValueError, OverflowError) as e:
+        raise PyPPTypeError(f"Column {name}: {e}")
+    if kind == 'string':
+        return list(values)
+    raise PyPPTypeError(f"Column {name}: unknown type {kind}")
+
+def records(f, delimiter: str) -> Iterator[List[str]]:
+    """Rows of an open CSV file, skipping blank lines."""
+    return filter(None, csv.reader(f, delimiter=delimiter))
+
+def line_of(path: str, delimiter: str, index: int) -> int:
+    """Line number where the index-th non-blank row (from 0) starts."""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        start = 1
+        for row in reader:
+            if row:
+                if index == 0:
+                    return start
+                index -= 1
+            start = reader.line_num + 1
+    return start
+
+
+class CsvFile:
+    """A CSV file read as batches of typed columns.
+    
+    Iterating yields (names, kinds, storages) for each batch of
+    batch_rows rows, rereading the file every time. types maps column
+    names to a declared kind; other columns are inferred, and an inferred
+    kind carries over to later batches, widening when a batch needs it.
+    """
+    
+    def __init__(self, path: str, delimiter: str = ',', header: bool = True,
+                 types: Optional[Dict[str, str]] = None, batch_rows: int = BATCH_ROWS):
+        if batch_rows < 1:
+            raise PyPPRuntimeError("CSV chunk size must be at least 1")
+        self.path = path
+        self.delimiter = delimiter
+        self.header = header
+        self.types = types or {}
+        self.batch_rows = batch_rows
+    
+    def __iter__(self) -> Iterator[Tuple[List[str], List[str], List[Any]]]:
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            rows = records(f, self.delimiter)
+            names = next(rows, None) if self.header else None
+            kinds = None
+            # Rows (header included) before this batch
+            read = 1 if self.header else 0
+            while True:
+                batch = list(islice(rows, self.batch_rows))
+                if not batch:
+                    return
+                if names is None:
+                    names = [f"c{i}" for i in range(len(batch[0]))]
+                if kinds is None:
+                    kinds = [self.types.get(name, 'int') for name in names]
+                width = len(names)
+                if set(map(len, batch)) != {width}:
+                    offset, row = next((i, r) for i, r in enumerate(batch) if len(r) != width)
+                    line = line_of(self.path, self.delimiter, read + offset)
+                    raise PyPPRuntimeError(
+                        f"CSV line {line} has {len(row)} fields, expected {width}")
+                read += len(batch)
+                storages = []
+                for i, values in enumerate(zip(*batch)):
+                    name = names[i]
+                    if name in self.types:
+                        storages.append(convert_declared(name, values, kinds[i]))
+                    else:
+                        kinds[i], storage = convert_column(values, kinds[i])
+                        storages.append(storage)
+                yield names, list(kinds), storages
+    
+    def read(self) -> Tuple[List[str], List[str], List[Any]]:
+        """The whole file as (names, kinds, storages), batch by batch."""
+        names, kinds, columns = [], [], []
+        # Columns that became strings after an earlier batch parsed them as numbers
+        reread = set()
+        for names, batch_kinds, storages in self:
+            if not columns:
+                kinds, columns = batch_kinds, storages
+                continue
+            for i, storage in enumerate(storages):
+                if i in reread:
+                    continue
+                if batch_kinds[i] != kinds[i]:
+                    kinds[i] = batch_kinds[i]
+                    if kinds[i] == 'string':
+                        # The parsed numbers have lost their text ("007" is 7), so the
+                        # column is read again as written, once the rest is done
+                        reread.add(i)
+                        columns[i] = None
+                        continue
+                    # An earlier batch was ints; bring it up to floats
+                    columns[i] = array('d', columns[i])
+                columns[i].extend(storage)
+        if reread:
+            self.read_text(columns, reread)
+        if not columns and self.header:
+            # No rows: still report the header's columns, empty
+            with open(self.path, 'r', encoding='utf-8', newline='') as f:
+                names = next(records(f, self.delimiter), [])
+            kinds = [self.types.get(name, 'string') for name in names]
+            columns = [[] for _ in names]
+        return names, kinds, columns
+    
+    def read_text(self, columns: List[Any], indices: set) -> None:
+        """Fill columns[i] for each i in indices with the column's field text."""
+        for i in indices:
+            columns[i] = []
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            rows = records(f, self.delimiter)
+            if self.header:
+                next(rows, None)
+            targets = [(columns[i].append, i) for i in sorted(indices)]
+            for row in rows:
+                for append, i in targets:
+                    append(row[i])
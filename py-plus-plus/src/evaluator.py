@@ -1,20 +1,166 @@
 """Evaluator/runtime for py++."""
 
-from typing import Any, Dict, List
+import asyncio
+import builtins as py_builtins
+import inspect
+import operator
+import weakref
+from types import MappingProxyType
+from typing import Any, Coroutine, Dict, List, Optional, Tuple
 from .ast_nodes import *
 from .errors import ReturnValue, BreakException, ContinueException, NameError, TypeError as PyPPTypeError, RuntimeError
 from .builtins_advanced import PyPPFunction, BUILTINS
+from .advanced import StrView, StringBuilder
+from .ffi import ForeignModule, import_python
+from .rand import RandomSource
+
+class LazyExport:
+    """Placeholder bound by a lazy import; the module loads on first lookup."""
+    
+    __slots__ = ('loader', 'module_name', 'name')
+    
+    def __init__(self, loader, module_name: str, name: str):
+        self.loader = loader
+        self.module_name = module_name
+        self.name = name
+    
+    def __repr__(self):
+        return f"<lazy {self.module_name}.{self.name}>"
+
+
+class Rope(StringBuilder):
+    """String being built by `x = x + ...` inside a loop.
+    
+    Only ever stored in a scope by Evaluator.append_in_place, and turned
+    back into a str as soon as the variable is read or the loop ends, so
+    py++ code never sees one.
+    """
+    
+    __slots__ = ()
+
+
+def assigned_names(body: ASTNode) -> Optional[set]:
+    """Names a function body may bind in its own frame, or None if unknowable."""
+    names = set()
+    for node in walk(body):
+        if isinstance(node, (LetStatement, FunctionDecl)):
+            names.add(node.name)
+        elif isinstance(node, AssignmentExpression):
+            names.add(node.target)
+        elif isinstance(node, ForeignImport):
+            names.add(node.alias)
+        elif isinstance(node, ImportStatement):
+            return None
+    return names
+
+
+# Whether each node evaluated so far contains an await, filled by contains_await
+AWAITS: 'weakref.WeakKeyDictionary[ASTNode, bool]' = weakref.WeakKeyDictionary()
+
+def contains_await(node: ASTNode) -> bool:
+    """Whether evaluating node may reach an await; nested function bodies don't count."""
+    found = AWAITS.get(node)
+    if found is None:
+        found = type(node) is AwaitExpression
+        if type(node) is not FunctionDecl:
+            for value in vars(node).values():
+                for child in (value if isinstance(value, list) else (value,)):
+                    # No short-circuit: every child gets its own entry
+                    if isinstance(child, ASTNode) and contains_await(child):
+                        found = True
+        AWAITS[node] = found
+    return found
+
+# Binary operators other than && and ||, for evaluate_async
+BINARY_OPERATORS = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv,
+    '%': operator.mod, '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
+
+
+class FunctionInvoker:
+    """Calls one py++ function many times from Python code.
+    
+    Builtins such as map() get one of these from Evaluator.invoker().
+    The call frame is built from the closure once and reused: each call
+    only rebinds the parameters and resets the names the body assigns,
+    instead of copying the whole closure like call_function does.
+    """
+    
+    def __init__(self, evaluator: 'Evaluator', func: PyPPFunction):
+        self.evaluator = evaluator
+        self.func = func
+        self.params = func.params
+        self.body = func.body
+        self.arity = len(func.params)
+        self.frame = func.closure.copy()
+        assigned = assigned_names(func.body)
+        # Calls to an async function only make a coroutine; call_function does that
+        self.reusable = assigned is not None and not func.is_async
+        self.reset_names = tuple((assigned or set()) - set(func.params))
+        self.active = False
+    
+    def __call__(self, *args) -> Any:
+        if len(args) != self.arity or self.active or not self.reusable:
+            # Wrong arity, re-entered from inside its own body, or the frame
+            # can't be reset: take the general path (which also raises)
+            return self.evaluator.call_function(self.func, list(args))
+        
+        frame = self.frame
+        if self.arity == 1:
+            frame[self.params[0]] = args[0]
+        else:
+            for param, arg in zip(self.params, args):
+                frame[param] = arg
+        evaluator = self.evaluator
+        stack = evaluator.locals_stack
+        stack.append(frame)
+        ropes = len(evaluator.ropes)
+        self.active = True
+        try:
+            evaluator.eval(self.body)
+            return None
+        except ReturnValue as ret:
+            return ret.value
+        finally:
+            stack.pop()
+            del evaluator.ropes[ropes:]
+            self.active = False
+            if self.reset_names:
+                closure = self.func.closure
+                for name in self.reset_names:
+                    if name in closure:
+                        frame[name] = closure[name]
+                    else:
+                        frame.pop(name, None)
+
 
 class Evaluator:
     """Evaluates the AST."""
     
-    def __init__(self):
-        self.globals = BUILTINS.copy()
+    # Read-only builtins layer shared by every evaluator, below its globals
+    builtins = MappingProxyType(BUILTINS)
+    
+    def __init__(self, lazy_imports: bool = False, rng: Optional[RandomSource] = None):
+        self.globals: Dict[str, Any] = {}
+        # Random generator, and the builtins bound to it, above the shared layer
+        self.rng = rng if rng is not None else RandomSource()
+        self.bound_builtins = self.rng.builtins()
         self.locals_stack = [{}]
         self.module_loader = None
+        self.module_name = None
+        self.lazy_imports = lazy_imports
+        # Lazily imported modules not loaded yet -> scope their placeholders are in
+        self.pending_lazy: Dict[str, Dict[str, Any]] = {}
+        # Loops being executed, and the (scope, name) of every Rope they made
+        self.loop_depth = 0
+        self.ropes: List[Tuple[Dict[str, Any], str]] = []
     
     def eval(self, node: ASTNode) -> Any:
         if isinstance(node, Program):
+            if contains_await(node):
+                return self.run_async(self.eval_async(node))
             result = None
             for stmt in node.statements:
                 result = self.eval(stmt)
@@ -22,12 +168,22 @@ class Evaluator:
         
         elif isinstance(node, ImportStatement):
             if self.module_loader:
-                module_exports = self.module_loader.load_module(node.module_name, self)
+                if node.lazy or self.lazy_imports:
+                    module_exports = self.module_loader.lazy_exports(node.module_name)
+                    if node.module_name not in self.module_loader.loaded_modules:
+                        scope = self.globals if len(self.locals_stack) == 1 else self.get_current_scope()
+                        self.pending_lazy[node.module_name] = scope
+                else:
+                    module_exports = self.module_loader.load_module(node.module_name, self)
                 for name, value in module_exports.items():
                     if not name.startswith('_'):
                         self.set_variable(name, value)
             return None
         
+        elif isinstance(node, ForeignImport):
+            self.set_variable(node.alias, import_python(node.path, node.signatures))
+            return None
+        
         elif isinstance(node, LetStatement):
             value = self.eval(node.value)
             if node.type_annotation:
@@ -36,7 +192,21 @@ class Evaluator:
             return None
         
         elif isinstance(node, FunctionDecl):
-            func = PyPPFunction(node.params, node.body, self.get_current_scope().copy())
+            if self.ropes:
+                # The closure is a copy of the scope; it must not share a Rope
+                self.flatten_ropes()
+            func = PyPPFunction(node.params, node.body, self.get_current_scope().copy(), self,
+                                node.is_async)
+            for decorator in reversed(node.decorators):
+                # @name(args) on fn f binds f to name(f, args...)
+                wrap = self.eval(decorator.func)
+                args = [func] + [self.eval(arg) for arg in decorator.args]
+                if isinstance(wrap, PyPPFunction):
+                    func = self.call_function(wrap, args)
+                elif callable(wrap):
+                    func = wrap(*args)
+                else:
+                    raise PyPPTypeError(f"Decorator {wrap} is not callable")
             self.set_variable(node.name, func)
             return None
         
@@ -56,6 +226,7 @@ class Evaluator:
             if node.init:
                 self.eval(node.init)
             
+            self.loop_depth += 1
             try:
                 while True:
                     if node.condition:
@@ -72,10 +243,13 @@ class Evaluator:
                         self.eval(node.update)
             except BreakException:
                 pass
+            finally:
+                self.end_loop()
             
             return None
         
         elif isinstance(node, WhileStatement):
+            self.loop_depth += 1
             try:
                 while self.is_truthy(self.eval(node.condition)):
                     try:
@@ -84,6 +258,8 @@ class Evaluator:
                         pass
             except BreakException:
                 pass
+            finally:
+                self.end_loop()
             return None
         
         elif isinstance(node, BlockStatement):
@@ -93,7 +269,10 @@ class Evaluator:
             return result
         
         elif isinstance(node, ExpressionStatement):
-            return self.eval(node.expression)
+            expr = node.expression
+            if self.loop_depth and type(expr) is AssignmentExpression and self.append_in_place(expr):
+                return None
+            return self.eval(expr)
         
         elif isinstance(node, BinaryOp):
             left = self.eval(node.left)
@@ -145,11 +324,7 @@ class Evaluator:
                 raise PyPPTypeError(f"{func} is not callable")
         
         elif isinstance(node, MemberAccess):
-            obj = self.eval(node.obj)
-            if isinstance(obj, dict):
-                return obj.get(node.member)
-            else:
-                raise PyPPTypeError(f"Cannot access member {node.member} on {type(obj).__name__}")
+            return self.get_member(self.eval(node.obj), node.member)
         
         elif isinstance(node, Identifier):
             return self.get_variable(node.name)
@@ -168,9 +343,154 @@ class Evaluator:
         elif isinstance(node, ContinueStatement):
             raise ContinueException()
         
+        elif isinstance(node, AwaitExpression):
+            raise RuntimeError("await outside an async function")
+        
         else:
             raise RuntimeError(f"Unknown node type: {type(node)}")
     
+    async def eval_async(self, node: ASTNode) -> Any:
+        """Evaluate node like eval, suspending at each await inside it.
+        
+        Nodes without an await are handed to eval. Other coroutines run
+        while this one waits and change locals_stack and loop_depth, so
+        each await puts back this coroutine's own.
+        """
+        if not contains_await(node):
+            return self.eval(node)
+        
+        if isinstance(node, (Program, BlockStatement)):
+            result = None
+            for stmt in node.statements:
+                result = await self.eval_async(stmt)
+            return result
+        
+        elif isinstance(node, AwaitExpression):
+            value = await self.eval_async(node.value)
+            if not inspect.isawaitable(value):
+                return value
+            if self.ropes:
+                # No Rope may outlive a suspension: another coroutine could read its scope
+                self.flatten_ropes()
+            stack, depth = self.locals_stack, self.loop_depth
+            try:
+                return await value
+            finally:
+                self.locals_stack, self.loop_depth = stack, depth
+        
+        elif isinstance(node, LetStatement):
+            value = await self.eval_async(node.value)
+            if node.type_annotation:
+                value = self.check_type(value, node.type_annotation)
+            self.set_variable(node.name, value)
+            return None
+        
+        elif isinstance(node, ReturnStatement):
+            raise ReturnValue(await self.eval_async(node.value))
+        
+        elif isinstance(node, IfStatement):
+            if self.is_truthy(await self.eval_async(node.condition)):
+                return await self.eval_async(node.then_block)
+            elif node.else_block:
+                return await self.eval_async(node.else_block)
+            return None
+        
+        elif isinstance(node, ForStatement):
+            if node.init:
+                await self.eval_async(node.init)
+            self.loop_depth += 1
+            try:
+                while not node.condition or self.is_truthy(await self.eval_async(node.condition)):
+                    try:
+                        await self.eval_async(node.body)
+                    except ContinueException:
+                        pass
+                    if node.update:
+                        await self.eval_async(node.update)
+            except BreakException:
+                pass
+            finally:
+                self.end_loop()
+            return None
+        
+        elif isinstance(node, WhileStatement):
+            self.loop_depth += 1
+            try:
+                while self.is_truthy(await self.eval_async(node.condition)):
+                    try:
+                        await self.eval_async(node.body)
+                    except ContinueException:
+                        pass
+            except BreakException:
+                pass
+            finally:
+                self.end_loop()
+            return None
+        
+        elif isinstance(node, ExpressionStatement):
+            return await self.eval_async(node.expression)
+        
+        elif isinstance(node, BinaryOp):
+            left = await self.eval_async(node.left)
+            right = await self.eval_async(node.right)
+            if node.op == '&&':
+                return self.is_truthy(left) and self.is_truthy(right)
+            elif node.op == '||':
+                return self.is_truthy(left) or self.is_truthy(right)
+            return BINARY_OPERATORS[node.op](left, right)
+        
+        elif isinstance(node, UnaryOp):
+            operand = await self.eval_async(node.operand)
+            if node.op == '-':
+                return -operand
+            elif node.op == '!':
+                return not self.is_truthy(operand)
+        
+        elif isinstance(node, CallExpression):
+            func = await self.eval_async(node.func)
+            args = [await self.eval_async(arg) for arg in node.args]
+            if callable(func) and not isinstance(func, PyPPFunction):
+                return func(*args)
+            elif isinstance(func, PyPPFunction):
+                return self.call_function(func, args)
+            else:
+                raise PyPPTypeError(f"{func} is not callable")
+        
+        elif isinstance(node, MemberAccess):
+            return self.get_member(await self.eval_async(node.obj), node.member)
+        
+        elif isinstance(node, AssignmentExpression):
+            value = await self.eval_async(node.value)
+            self.set_variable(node.target, value)
+            return value
+        
+        else:
+            raise RuntimeError(f"Unknown node type: {type(node)}")
+    
+    def run_async(self, coroutine: Coroutine) -> Any:
+        """Run a coroutine to completion on a new event loop (for top-level await)."""
+        try:
+            asyncio.get_running_loop()
+        except py_builtins.RuntimeError:
+            pass
+        else:
+            coroutine.close()
+            raise RuntimeError("Top-level await cannot run inside a running event loop")
+        stack, depth = self.locals_stack, self.loop_depth
+        try:
+            return asyncio.run(coroutine)
+        finally:
+            # Tasks cancelled at shutdown restore their own state last
+            self.locals_stack, self.loop_depth = stack, depth
+    
+    def get_member(self, obj: Any, member: str) -> Any:
+        if isinstance(obj, dict):
+            return obj.get(member)
+        elif isinstance(obj, ForeignModule):
+            return obj.member(member)
+        else:
+            raise PyPPTypeError(f"Cannot access member {member} on {type(obj).__name__}")
+    
     def call_function(self, func: PyPPFunction, args: List[Any]) -> Any:
         if len(args) != len(func.params):
             raise PyPPTypeError(f"Function expects {len(func.params)} args, got {len(args)}")
@@ -179,7 +499,13 @@ class Evaluator:
         for param, arg in zip(func.params, args):
             new_scope[param] = arg
         
+        if func.is_async:
+            # The caller's frames stay visible, as in a plain call, but in a
+            # stack of the coroutine's own
+            return self.run_body(func.body, self.locals_stack + [new_scope])
+        
         self.locals_stack.append(new_scope)
+        ropes = len(self.ropes)
         try:
             self.eval(func.body)
             result = None
@@ -187,14 +513,33 @@ class Evaluator:
             result = ret.value
         finally:
             self.locals_stack.pop()
+            # Ropes made during the call live in its now discarded frame
+            del self.ropes[ropes:]
         
         return result
     
+    async def run_body(self, body: ASTNode, stack: List[Dict[str, Any]]) -> Any:
+        """Coroutine of an async function call: runs body in stack once awaited."""
+        self.locals_stack = stack
+        self.loop_depth = 0
+        try:
+            await self.eval_async(body)
+            return None
+        except ReturnValue as ret:
+            return ret.value
+        finally:
+            if self.ropes:
+                self.flatten_ropes()
+    
+    def invoker(self, func: PyPPFunction) -> FunctionInvoker:
+        """Return a fast Python callable for calling func repeatedly."""
+        return FunctionInvoker(self, func)
+    
     def check_type(self, value: Any, expected_type: str) -> Any:
         """Optional runtime type checking."""
         if expected_type == 'int' and not isinstance(value, int):
             raise PyPPTypeError(f"Expected int, got {type(value).__name__}")
-        elif expected_type == 'string' and not isinstance(value, str):
+        elif expected_type == 'string' and not isinstance(value, (str, StrView)):
             raise PyPPTypeError(f"Expected string, got {type(value).__name__}")
         elif expected_type == 'float' and not isinstance(value, (int, float)):
             raise PyPPTypeError(f"Expected float, got {type(value).__name__}")
@@ -215,11 +560,121 @@ class Evaluator:
     def get_variable(self, name: str) -> Any:
         for scope in reversed(self.locals_stack):
             if name in scope:
-                return scope[name]
+                value = scope[name]
+                if type(value) is LazyExport:
+                    value = self.resolve_lazy(scope, value)
+                elif type(value) is Rope:
+                    value = scope[name] = value.toString()
+                return value
         if name in self.globals:
-            return self.globals[name]
+            value = self.globals[name]
+            if type(value) is LazyExport:
+                value = self.resolve_lazy(self.globals, value)
+            elif type(value) is Rope:
+                value = self.globals[name] = value.toString()
+            return value
+        if name in self.bound_builtins:
+            return self.bound_builtins[name]
+        if name in self.builtins:
+            return self.builtins[name]
+        if self.pending_lazy and self.load_pending_lazy():
+            # name may be one of their exports that scanning did not find
+            return self.get_variable(name)
         raise NameError(f"Undefined variable: {name}")
     
+    def resolve_lazy(self, scope: Dict[str, Any], proxy: LazyExport) -> Any:
+        """Load a lazily imported module and rebind its names in scope."""
+        exports = proxy.loader.load_module(proxy.module_name, self)
+        self.pending_lazy.pop(proxy.module_name, None)
+        self.bind_exports(scope, proxy.module_name, exports)
+        if proxy.name not in exports:
+            raise NameError(f"Module {proxy.module_name} has no export: {proxy.name}")
+        return exports[proxy.name]
+    
+    def bind_exports(self, scope: Dict[str, Any], module_name: str, exports: Dict[str, Any]) -> None:
+        """Bind a loaded module's exports in scope, over its own placeholders only."""
+        for name, value in exports.items():
+            if name.startswith('_'):
+                continue
+            current = scope.get(name, None)
+            if name not in scope or (type(current) is LazyExport
+                                     and current.module_name == module_name):
+                scope[name] = value
+    
+    def load_pending_lazy(self) -> bool:
+        """Load the lazily imported modules visible from here; whether any were.
+        
+        Placeholders only cover the names scan_exports finds, so a lookup
+        that misses loads these modules before giving up: a lazy import
+        ends up binding what an eager one would, whatever is looked up
+        first. Modules imported in frames that have returned are dropped.
+        """
+        visible = {id(scope) for scope in self.locals_stack}
+        visible.add(id(self.globals))
+        loaded = False
+        for module_name, scope in list(self.pending_lazy.items()):
+            del self.pending_lazy[module_name]
+            if id(scope) in visible:
+                exports = self.module_loader.load_module(module_name, self)
+                self.bind_exports(scope, module_name, exports)
+                loaded = True
+        return loaded
+    
+    def append_in_place(self, node: AssignmentExpression) -> bool:
+        """Run `x = x + <string>` by appending to a Rope held in x's scope.
+        
+        Repeated concatenation in a loop is then linear instead of
+        quadratic. Returns False, having evaluated nothing, unless node has
+        that form and x currently holds a string in the scope it is
+        assigned in.
+        """
+        value = node.value
+        name = node.target
+        if (type(value) is not BinaryOp or value.op != '+'
+                or type(value.left) is not Identifier or value.left.name != name):
+            return False
+        stack = self.locals_stack
+        if len(stack) == 1:
+            if name in stack[0]:
+                return False
+            scope = self.globals
+        else:
+            scope = stack[-1]
+        current = scope.get(name)
+        if type(current) is not str and type(current) is not Rope:
+            return False
+        
+        right = self.eval(value.right)
+        if type(right) is StrView:
+            right = str(right)
+        if type(right) is not str:
+            # Not a string concatenation after all; let + raise or convert
+            left = current.toString() if type(current) is Rope else current
+            self.set_variable(name, left + right)
+            return True
+        if type(current) is Rope and scope.get(name) is current:
+            current.append(right)
+        else:
+            rope = Rope(str(current))
+            rope.append(right)
+            scope[name] = rope
+            self.ropes.append((scope, name))
+        return True
+    
+    def end_loop(self) -> None:
+        """Leave a loop; the outermost one turns its Ropes back into strs."""
+        self.loop_depth -= 1
+        if not self.loop_depth and self.ropes:
+            self.flatten_ropes()
+    
+    def flatten_ropes(self) -> None:
+        """Replace every pending Rope with the str it holds."""
+        for scope, name in self.ropes:
+            value = scope.get(name)
+            if type(value) is Rope:
+                scope[name] = value.toString()
+        self.ropes.clear()
+    
     def set_variable(self, name: str, value: Any):
         if len(self.locals_stack) == 1:
             self.globals[name] = value
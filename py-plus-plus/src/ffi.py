@@ -0,0 +1,221 @@
+"""Calling Python code from py++.
+
+`import py "zlib" as z;` binds z to a ForeignModule, and `z.crc32(s)` calls
+the Python function. Values are converted at the boundary: arrays become
+lists, objects dicts, sets sets, and results are converted back. Without a
+signature every argument and result is inspected on each call. Declaring
+one picks the converter for each position once, when the binding is made:
+    
+    import py "zlib" as z { crc32(bytes) -> int; }
+"""
+
+import importlib
+import types
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+from .advanced import PyPPArray, PyPPObject, PyPPSet, StrView, as_str
+from .builtins_advanced import PyPPFunction, as_callback
+from .errors import PyPPError, RuntimeError as PyPPRuntimeError, TypeError as PyPPTypeError
+
+# Declared signature: (parameter types, return type)
+Signature = Tuple[Optional[Sequence[str]], Optional[str]]
+
+
+def to_python(value: Any) -> Any:
+    """Deep-convert a py++ value to plain Python data."""
+    if isinstance(value, PyPPArray):
+        return [to_python(item) for item in value]
+    if isinstance(value, PyPPObject):
+        return {k: to_python(v) for k, v in value.properties.items()}
+    if isinstance(value, PyPPSet):
+        return set(value.items)
+    if isinstance(value, PyPPFunction):
+        return as_callback(value, 'Python')
+    return as_str(value)
+
+def from_python(value: Any) -> Any:
+    """Deep-convert plain Python data to py++ values; other objects pass through."""
+    if isinstance(value, (list, tuple)):
+        return PyPPArray([from_python(item) for item in value])
+    if isinstance(value, dict):
+        return PyPPObject({str(k): from_python(v) for k, v in value.items()})
+    if isinstance(value, (set, frozenset)):
+        return PyPPSet(list(value))
+    return value
+
+def identity(value: Any) -> Any:
+    return value
+
+def to_bytes(value: Any) -> Any:
+    """Encode strings as UTF-8; bytes from other foreign calls pass through."""
+    if isinstance(value, (str, StrView)):
+        return str(value).encode()
+    return value
+
+def from_bytes(value: Any) -> Any:
+    """Decode bytes as UTF-8; str passes through."""
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode()
+    return value
+
+# Declared type -> converter for arguments (py++ to Python)
+ARG_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    'int': identity,
+    'float': identity,
+    'bool': identity,
+    'string': as_str,
+    'bytes': to_bytes,
+    'array': list,
+    'object': lambda value: value.properties,
+    'function': lambda value: as_callback(value, 'Python'),
+    'any': to_python,
+}
+
+# Declared type -> converter for results (Python to py++)
+RESULT_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    'int': identity,
+    'float': identity,
+    'bool': identity,
+    'string': from_bytes,
+    'bytes': identity,
+    'array': lambda value: PyPPArray(list(value)),
+    'object': lambda value: PyPPObject(dict(value)),
+    'null': lambda value: None,
+    'any': from_python,
+}
+
+def converter(table: Dict[str, Callable[[Any], Any]], type_name: str) -> Callable[[Any], Any]:
+    try:
+        return table[type_name]
+    except KeyError:
+        raise PyPPTypeError(f"Unknown foreign type: {type_name}")
+
+
+def foreign_error(name: str, error: Exception) -> PyPPError:
+    """py++ error for a Python exception raised while calling name."""
+    kind = PyPPTypeError if isinstance(error, (TypeError, AttributeError)) else PyPPRuntimeError
+    return kind(f"Python function {name} failed: {type(error).__name__}: {error}")
+
+def bind(func: Callable, params: Optional[Sequence[str]] = None,
+         returns: Optional[str] = None, name: Optional[str] = None) -> Callable:
+    """Wrap a Python callable so py++ code can call it like a builtin.
+    
+    params and returns are declared type names (see ARG_CONVERTERS and
+    RESULT_CONVERTERS); their converters are looked up here, once. With a
+    signature the number of arguments is checked on every call. Python
+    exceptions raised by a conversion or by func are raised as py++ errors
+    naming the function (name, or func's own).
+    """
+    if name is None:
+        name = getattr(func, '__name__', repr(func))
+    if params is None:
+        result = converter(RESULT_CONVERTERS, returns or 'any')
+        
+        def call(*args):
+            try:
+                return result(func(*[to_python(arg) for arg in args]))
+            except PyPPError:
+                raise
+            except Exception as e:
+                raise foreign_error(name, e) from e
+        return call
+    
+    converters = tuple(converter(ARG_CONVERTERS, type_name) for type_name in params)
+    result = converter(RESULT_CONVERTERS, returns or 'any')
+    arity = len(converters)
+    
+    def arity_error(args: tuple) -> PyPPTypeError:
+        return PyPPTypeError(f"{name}() expects {arity} args, got {len(args)}")
+    
+    if all(c is identity for c in converters):
+        def call(*args):
+            if len(args) != arity:
+                raise arity_error(args)
+            try:
+                return result(func(*args))
+            except PyPPError:
+                raise
+            except Exception as e:
+                raise foreign_error(name, e) from e
+    elif arity == 1:
+        convert, = converters
+        
+        def call(*args):
+            if len(args) != 1:
+                raise arity_error(args)
+            try:
+                return result(func(convert(args[0])))
+            except PyPPError:
+                raise
+            except Exception as e:
+                raise foreign_error(name, e) from e
+    elif arity == 2:
+        first, second = converters
+        
+        def call(*args):
+            if len(args) != 2:
+                raise arity_error(args)
+            try:
+                return result(func(first(args[0]), second(args[1])))
+            except PyPPError:
+                raise
+            except Exception as e:
+                raise foreign_error(name, e) from e
+    else:
+        def call(*args):
+            if len(args) != arity:
+                raise arity_error(args)
+            try:
+                return result(func(*[c(arg) for c, arg in zip(converters, args)]))
+            except PyPPError:
+                raise
+            except Exception as e:
+                raise foreign_error(name, e) from e
+    return call
+
+
+class ForeignModule:
+    """A Python module bound by `import py`; members are read with `alias.name`.
+    
+    Functions with a declared signature are bound when the module is
+    imported; other members are bound on first access and cached.
+    """
+    
+    def __init__(self, module: types.ModuleType, signatures: Dict[str, Signature] = None):
+        self.module = module
+        self.members: Dict[str, Any] = {}
+        for name, (params, returns) in (signatures or {}).items():
+            self.members[name] = bind(self.attribute(name), params, returns,
+                                      f"{module.__name__}.{name}")
+    
+    def attribute(self, name: str) -> Any:
+        try:
+            return getattr(self.module, name)
+        except AttributeError:
+            raise PyPPRuntimeError(f"Python module {self.module.__name__} has no attribute {name}")
+    
+    def member(self, name: str) -> Any:
+        """Bound function, submodule, or converted value for alias.name."""
+        bound = self.members.get(name)
+        if bound is not None:
+            return bound
+        value = self.attribute(name)
+        if isinstance(value, types.ModuleType):
+            bound = ForeignModule(value)
+        elif callable(value):
+            bound = bind(value, name=f"{self.module.__name__}.{name}")
+        else:
+            return from_python(value)
+        self.members[name] = bound
+        return bound
+    
+    def __repr__(self):
+        return f"<python module {self.module.__name__}>"
+
+
+def import_python(path: str, signatures: Dict[str, Signature] = None) -> ForeignModule:
+    """Import a Python module for `import py "path" as alias;`."""
+    try:
+        module = importlib.import_module(path)
+    except ImportError as e:
+        raise PyPPRuntimeError(f"Cannot import Python module {path}: {e}")
+    return ForeignModule(module, signatures)
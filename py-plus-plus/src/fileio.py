@@ -0,0 +1,126 @@
+"""File I/O for py++: buffered reads and writes, lazy lines, mapped bytes.
+
+Files are named by path; every call opens and closes its own file. Reads
+and writes go through large buffers, lines are produced one at a time,
+and big files are memory-mapped instead of read: bytes are viewed in
+place, and text is decoded straight from the mapping.
+"""
+
+import mmap
+import os
+from functools import partial
+from typing import Iterable, Iterator
+from .advanced import as_str
+from .errors import RuntimeError as PyPPRuntimeError
+
+# Buffer size for reading and writing files
+BUFFER_SIZE = 1 << 20
+
+# Files at least this large are memory-mapped instead of read
+MMAP_THRESHOLD = 64 << 20
+
+
+def check_file(path: str) -> str:
+    """path as a str, raising a py++ error if it is not a readable file."""
+    path = as_str(path)
+    if not os.path.isfile(path):
+        raise PyPPRuntimeError(f"File not found: {path}")
+    return path
+
+
+class LineFile:
+    """Lines of a text file without their line endings, read lazily.
+    
+    Every iteration reads the file again from the start, so it can be the
+    source of a PyPPIter pipeline; only one buffer of the file is held in
+    memory at a time.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+    
+    def __iter__(self):
+        with open(self.path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    yield from split_lines(mapped_chunks(mapped))
+                return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            yield from split_lines(iter(partial(f.read, BUFFER_SIZE), ''))
+
+
+def split_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Lines of text arriving in chunks; a partial last line carries over."""
+    tail = ''
+    for chunk in chunks:
+        lines = (tail + chunk).split('\n')
+        tail = lines.pop()
+        yield from lines
+    if tail:
+        yield tail
+
+def mapped_chunks(mapped: mmap.mmap) -> Iterator[str]:
+    """A mapped file's text, decoded about BUFFER_SIZE bytes at a time.
+    
+    Chunks end just after a newline, so no character (or \\r\\n pair) is
+    split between two of them.
+    """
+    start, size = 0, len(mapped)
+    while start < size:
+        end = mapped.rfind(b'\n', start, start + BUFFER_SIZE) + 1
+        if end <= start:
+            # No newline in this window: run on to the next one
+            end = mapped.find(b'\n', start + BUFFER_SIZE) + 1 or size
+        yield universal_newlines(str(mapped[start:end], 'utf-8'))
+        start = end
+
+def universal_newlines(text: str) -> str:
+    """text with \\r\\n and \\r line endings turned into \\n, as text-mode reads do."""
+    if '\r' in text:
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def read_text(path: str) -> str:
+    """Whole file as a string.
+    
+    Files of MMAP_THRESHOLD bytes or more are decoded from a mapping, so
+    no bytes copy of the file is held alongside the string.
+    """
+    path = check_file(path)
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return universal_newlines(str(mapped, 'utf-8'))
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def write_text(path: str, text: str, append: bool = False) -> int:
+    """Write (or append) text to a file; returns the number of characters."""
+    with open(as_str(path), 'a' if append else 'w', encoding='utf-8', buffering=BUFFER_SIZE) as f:
+        return f.write(str(text))
+
+def write_lines(path: str, lines: Iterable) -> int:
+    """Write each item on its own line; returns the number of lines."""
+    count = 0
+    with open(as_str(path), 'w', encoding='utf-8', buffering=BUFFER_SIZE) as f:
+        write = f.write
+        for line in lines:
+            write(str(line))
+            write('\n')
+            count += 1
+    return count
+
+def read_bytes(path: str) -> memoryview:
+    """Read-only view of a file's bytes.
+    
+    Files of MMAP_THRESHOLD bytes or more are memory-mapped: the view reads
+    straight from the page cache, and slicing it never copies. The mapping
+    stays open for as long as a view of it is alive.
+    """
+    path = check_file(path)
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            return memoryview(f.read())
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
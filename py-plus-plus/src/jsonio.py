@@ -0,0 +1,188 @@
+"""JSON for py++: lazily converted values and streaming reads and writes.
+
+Parsed JSON stays as the dicts and lists json.loads builds. JsonObject and
+JsonArray wrap them one level at a time, on first access, so a record
+whose nested fields are never read is never converted. Writing goes
+through a JSON encoder hook that hands over each container's own storage
+as the encoder reaches it, instead of copying the whole structure first.
+"""
+
+import json
+from typing import Any, Iterable, TextIO
+from .advanced import PyPPArray, PyPPObject, PyPPSet, Shape, StrView
+from .errors import TypeError as PyPPTypeError
+
+# Buffer size for NDJSON files; records are read and written line by line
+BUFFER_SIZE = 1 << 20
+
+
+def wrap(value: Any) -> Any:
+    """py++ value for something json.loads returned, converted lazily."""
+    t = type(value)
+    if t is dict:
+        return JsonObject(value)
+    if t is list:
+        return JsonArray(value)
+    return value
+
+def wrap_values(raw: dict) -> None:
+    """Wrap the dicts and lists directly inside raw, in place."""
+    for key, value in raw.items():
+        t = type(value)
+        if t is dict:
+            raw[key] = JsonObject(value)
+        elif t is list:
+            raw[key] = JsonArray(value)
+
+def wrap_items(raw: list) -> None:
+    """Wrap the dicts and lists directly inside raw, in place."""
+    for index, value in enumerate(raw):
+        t = type(value)
+        if t is dict:
+            raw[index] = JsonObject(value)
+        elif t is list:
+            raw[index] = JsonArray(value)
+
+
+class JsonObject(PyPPObject):
+    """PyPPObject over a dict from json.loads.
+    
+    The dict is adopted as the object's storage. The first time the
+    object is touched its nested dicts and lists are wrapped (their own
+    contents wait until they are touched in turn), and it moves onto the
+    shared shape for its keys, so records of the same shape keep one copy
+    of their field names. Objects with more keys than MAX_SHAPE_KEYS stay
+    in dictionary mode.
+    """
+    
+    __slots__ = ('_shape', '_data', '_pending')
+    
+    def __init__(self, raw: dict):
+        self._shape = None
+        self._data = raw
+        self._pending = True
+    
+    @property
+    def shape(self):
+        # Read before slots by every inherited method, so it is the one
+        # that has to switch the object over on first access
+        if self._pending:
+            self.materialize()
+        return self._shape
+    
+    @shape.setter
+    def shape(self, value):
+        self._shape = value
+    
+    @property
+    def slots(self):
+        if self._pending:
+            self.materialize()
+        return self._data
+    
+    @slots.setter
+    def slots(self, value):
+        self._data = value
+        self._pending = False
+    
+    def materialize(self) -> None:
+        """Wrap the nested values and move onto the shape of the keys."""
+        self._pending = False
+        data = self._data
+        wrap_values(data)
+        if len(data) <= self.MAX_SHAPE_KEYS:
+            self._shape = Shape.for_keys(data)
+            self._data = list(data.values())
+    
+    def raw(self) -> Any:
+        """The untouched dict, if nothing has been wrapped yet; else None."""
+        return self._data if self._pending else None
+
+
+class JsonArray(PyPPArray):
+    """PyPPArray over a list from json.loads.
+    
+    The list is adopted as list storage (never compacted). Its nested
+    dicts and lists are wrapped the first time the array is touched.
+    """
+    
+    def __init__(self, raw: list):
+        self._storage = raw
+        self._pending = True
+        self._head = 0
+    
+    @property
+    def _items(self):
+        # First access wraps the items that are dicts or lists
+        if self._pending:
+            self._pending = False
+            wrap_items(self._storage)
+        return self._storage
+    
+    @_items.setter
+    def _items(self, value):
+        self._storage = value
+        self._pending = False
+    
+    def raw(self) -> Any:
+        """The untouched list, if nothing has been wrapped yet; else None."""
+        return self._storage if self._pending else None
+
+
+def to_json(value: Any) -> Any:
+    """Encoder hook: the container's storage as something json can encode.
+    
+    Only one level is converted per call; the encoder calls back for
+    nested values as it reaches them.
+    """
+    if isinstance(value, (JsonObject, JsonArray)):
+        raw = value.raw()
+        if raw is not None:
+            return raw
+    if isinstance(value, PyPPArray):
+        items = value.items
+        return items if type(items) is list else list(items)
+    if isinstance(value, PyPPObject):
+        return value.slots if value.shape is None else dict(zip(value.shape.keys, value.slots))
+    if isinstance(value, PyPPSet):
+        return list(value.items)
+    if isinstance(value, StrView):
+        return str(value)
+    raise PyPPTypeError(f"{type(value).__name__} is not JSON serializable")
+
+def dumps(value: Any) -> str:
+    """Serialize a py++ value to a JSON string."""
+    return json.dumps(value, default=to_json)
+
+def dump(value: Any, stream: TextIO) -> None:
+    """Write a py++ value as JSON to stream, chunk by chunk."""
+    stream.writelines(json.JSONEncoder(default=to_json).iterencode(value))
+
+
+class NdjsonFile:
+    """Records of an NDJSON file, one per line, read lazily.
+    
+    Every iteration reads the file again from the start, so it can be the
+    source of a PyPPIter pipeline. Blank lines are skipped.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+    
+    def __iter__(self):
+        decode = json.JSONDecoder().decode
+        with open(self.path, 'r', encoding='utf-8', buffering=BUFFER_SIZE) as f:
+            for line in f:
+                if line.strip():
+                    yield wrap(decode(line))
+
+def write_ndjson(path: str, records: Iterable) -> int:
+    """Write records to path as NDJSON, one line each; returns the count."""
+    encode = json.JSONEncoder(default=to_json).encode
+    count = 0
+    with open(path, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as f:
+        for record in records:
+            f.write(encode(record))
+            f.write('\n')
+            count += 1
+    return count
@@ -25,6 +25,8 @@ class TokenType(Enum):
     TRUE = auto()
     FALSE = auto()
     IMPORT = auto()
+    ASYNC = auto()
+    AWAIT = auto()
     
     # Types
     INT_TYPE = auto()
@@ -59,6 +61,7 @@ class TokenType(Enum):
     COMMA = auto()
     COLON = auto()
     ARROW = auto()
+    AT = auto()
     
     # Special
     EOF = auto()
@@ -90,6 +93,8 @@ class Lexer:
         'false': TokenType.FALSE,
         'null': TokenType.NONE,
         'import': TokenType.IMPORT,
+        'async': TokenType.ASYNC,
+        'await': TokenType.AWAIT,
         'int': TokenType.INT_TYPE,
         'string': TokenType.STRING_TYPE,
         'float': TokenType.FLOAT_TYPE,
@@ -280,6 +285,9 @@ class Lexer:
             elif current == '.':
                 self.tokens.append(Token(TokenType.DOT, '.', self.line, self.col))
                 self.advance()
+            elif current == '@':
+                self.tokens.append(Token(TokenType.AT, '@', self.line, self.col))
+                self.advance()
             else:
                 self.error(f"Unexpected character: {current!r}")
         
@@ -1,18 +1,76 @@
 """Module and import system for py++."""
 
+import importlib
 import os
-from typing import Dict, Any
-from .lexer import Lexer
-from .parser import Parser
-from .evaluator import Evaluator
-from .errors import RuntimeError
+import threading
+import types
+import weakref
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, List, Optional, Set, Tuple
+from .lexer import Lexer, Token, TokenType
+from .parser import Parser, MODULE_NAME_TOKENS
+from .ast_nodes import Program, ImportStatement, walk
+from .builtins_advanced import PyPPFunction
+from .evaluator import Evaluator, LazyExport
+from .ffi import Signature, bind
+from .errors import PyPPError, RuntimeError
+
+def parse_file(path: str) -> Tuple[float, Program]:
+    """Read and parse a module file; safe to run on a worker thread or process."""
+    mtime = os.path.getmtime(path)
+    with open(path, 'r') as f:
+        source = f.read()
+    return mtime, Parser(Lexer(source).tokenize()).parse()
+
+def find_imports(ast: Program) -> List[str]:
+    """Names of modules eagerly imported anywhere in ast."""
+    names = [node.module_name for node in walk(ast)
+             if isinstance(node, ImportStatement) and not node.lazy]
+    return list(dict.fromkeys(names))
+
+def own_functions(evaluator) -> List[PyPPFunction]:
+    """Functions defined by evaluator reachable from its globals and their closures."""
+    found = {}
+    pending = [evaluator.globals]
+    while pending:
+        for value in pending.pop().values():
+            if (isinstance(value, PyPPFunction) and value.evaluator is evaluator
+                    and id(value) not in found):
+                found[id(value)] = value
+                pending.append(value.closure)
+    return list(found.values())
+
+# Modules served by Python code instead of a .pypp file: py++ name ->
+# module (or import path) whose EXPORTS dict is bound on import
+NATIVE_MODULES = {
+    'math': '.native.math',
+    'string': '.native.string',
+    'sys': '.native.sys',
+}
 
 class ModuleLoader:
     """Loads and caches py++ modules."""
     
-    def __init__(self, search_paths=None):
+    def __init__(self, search_paths=None, native=True):
         self.search_paths = search_paths or ['.', './stdlib']
+        # Native modules take precedence over .pypp files of the same name
+        self.native_modules: Dict[str, Any] = dict(NATIVE_MODULES) if native else {}
         self.loaded_modules: Dict[str, Dict[str, Any]] = {}
+        # Tokens produced by scan_exports, reused when the module is loaded
+        self.module_tokens: Dict[str, List[Token]] = {}
+        # Parsed modules and the source they came from, for reloading
+        self.module_asts: Dict[str, Program] = {}
+        self.module_paths: Dict[str, str] = {}
+        self.module_mtimes: Dict[str, float] = {}
+        # (lazy_imports, rng) each module first ran with, reused when it is reloaded
+        self.module_settings: Dict[str, Tuple[bool, Any]] = {}
+        # Import graph: module -> modules it imports, and the reverse
+        self.imports: Dict[str, Set[str]] = {}
+        self.dependents: Dict[str, Set[str]] = {}
+        # Evaluators whose globals hold a module's exports
+        self.importers: Dict[str, 'weakref.WeakSet[Evaluator]'] = {}
+        self._staged: Dict[str, Dict[str, Any]] = None
+        self._lock = threading.RLock()
     
     def find_module(self, name: str) -> str:
         """Find module file in search paths."""
@@ -23,26 +81,331 @@ class ModuleLoader:
                 return full_path
         raise RuntimeError(f"Module not found: {name}")
     
-    def load_module(self, name: str, evaluator) -> Dict[str, Any]:
-        """Load and execute a module, return its namespace."""
-        if name in self.loaded_modules:
-            return self.loaded_modules[name]
+    def register_native(self, name: str, module: Any) -> None:
+        """Serve `import name;` from a Python module with an EXPORTS dict.
+        
+        module may also be an import path, imported on first use.
+        """
+        self.native_modules[name] = module
+    
+    def register_python(self, name: str, functions: Dict[str, Any],
+                        signatures: Dict[str, Signature] = None) -> None:
+        """Serve `import name;` from Python callables.
         
+        signatures maps function names to (param types, return type);
+        see src.ffi.bind for how values are converted.
+        """
+        signatures = signatures or {}
+        exports = {}
+        for fn_name, func in functions.items():
+            params, returns = signatures.get(fn_name, (None, None))
+            exports[fn_name] = bind(func, params, returns, f"{name}.{fn_name}")
+        self.register_native(name, types.SimpleNamespace(EXPORTS=exports))
+    
+    def native_exports(self, name: str) -> Optional[Dict[str, Any]]:
+        """Exports of native module name, or None to load it from .pypp."""
+        module = self.native_modules.get(name)
+        if module is None:
+            return None
+        if isinstance(module, str):
+            try:
+                module = importlib.import_module(module, __package__)
+            except ImportError:
+                # Fall back to the interpreted module from now on
+                del self.native_modules[name]
+                return None
+            self.native_modules[name] = module
+        return dict(module.EXPORTS)
+    
+    def tokenize_module(self, name: str) -> List[Token]:
+        """Read and tokenize a module's source."""
         filepath = self.find_module(name)
+        self.module_paths[name] = filepath
+        self.module_mtimes[name] = os.path.getmtime(filepath)
         with open(filepath, 'r') as f:
             source = f.read()
+        return Lexer(source).tokenize()
+    
+    def parse_module(self, name: str) -> Program:
+        """Parse a module, reusing tokens left by scan_exports."""
+        tokens = self.module_tokens.pop(name, None)
+        if tokens is None:
+            tokens = self.tokenize_module(name)
+        ast = Parser(tokens).parse()
+        self.module_asts[name] = ast
+        return ast
+    
+    def prefetch(self, ast: Program, executor=None) -> List[str]:
+        """Read and parse every module reachable from ast's imports concurrently.
+        
+        Parsed modules go into module_asts, so load_module later only has to
+        execute them; execution order is unchanged. Lazy imports are skipped,
+        and modules that are missing or fail to parse are left for
+        load_module to report when (and if) they are actually imported.
+        Pass a ProcessPoolExecutor to parse on several cores.
+        """
+        own_executor = executor is None
+        if own_executor:
+            executor = ThreadPoolExecutor(max_workers=min(8, (os.cpu_count() or 1) + 4))
+        pending = {}
+        seen = set()
+        fetched = []
+        
+        def submit(names):
+            for name in names:
+                if (name in seen or name in self.loaded_modules or name in self.native_modules
+                        or name in self.module_asts or name in self.module_tokens):
+                    continue
+                seen.add(name)
+                try:
+                    path = self.find_module(name)
+                except PyPPError:
+                    continue
+                pending[executor.submit(parse_file, path)] = (name, path)
+        
+        try:
+            submit(find_imports(ast))
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, path = pending.pop(future)
+                    try:
+                        mtime, module_ast = future.result()
+                    except (PyPPError, OSError):
+                        continue
+                    with self._lock:
+                        if name in self.module_asts:
+                            continue
+                        self.module_paths[name] = path
+                        self.module_mtimes[name] = mtime
+                        self.module_asts[name] = module_ast
+                    fetched.append(name)
+                    submit(find_imports(module_ast))
+        finally:
+            if own_executor:
+                executor.shutdown(wait=True)
+        return fetched
+    
+    def load_module(self, name: str, evaluator=None) -> Dict[str, Any]:
+        """Load and execute a module, return its namespace."""
+        with self._lock:
+            if evaluator is not None:
+                self.record_import(name, evaluator)
+            if self._staged is not None and name in self._staged:
+                return self._staged[name]
+            if name in self.loaded_modules:
+                return self.loaded_modules[name]
+            
+            exports = self.native_exports(name)
+            if exports is None:
+                ast = self.module_asts.get(name)
+                if ast is None:
+                    ast = self.parse_module(name)
+                lazy = evaluator.lazy_imports if evaluator is not None else False
+                rng = evaluator.rng if evaluator is not None else None
+                self.module_settings[name] = (lazy, rng)
+                exports = self.execute_module(name, ast, lazy, rng)
+            self.loaded_modules[name] = exports
+            return exports
+    
+    def execute_module(self, name: str, ast: Program, lazy_imports: bool = False,
+                       rng=None) -> Dict[str, Any]:
+        """Run a parsed module in a fresh evaluator and collect its exports.
         
-        lexer = Lexer(source)
-        tokens = lexer.tokenize()
-        parser = Parser(tokens)
-        ast = parser.parse()
+        The module's functions draw from rng, the generator of the
+        evaluator that first imported it, so seeding a script also seeds
+        the modules it loads.
+        """
+        for imported in self.imports.pop(name, ()):
+            self.dependents.get(imported, set()).discard(name)
         
         # Create module evaluator
-        module_eval = Evaluator()
+        module_eval = Evaluator(lazy_imports=lazy_imports, rng=rng)
         module_eval.module_loader = self
+        module_eval.module_name = name
         module_eval.eval(ast)
         
-        # Cache module exports
-        exports = {k: v for k, v in module_eval.globals.items() if not k.startswith('_')}
-        self.loaded_modules[name] = exports
-        return exports
+        # Builtins live in a shared layer, so globals hold only what the module defined
+        return {k: v for k, v in module_eval.globals.items() if not k.startswith('_')}
+    
+    def record_import(self, name: str, evaluator) -> None:
+        """Remember that evaluator imported module name."""
+        importer = evaluator.module_name
+        if importer is not None and importer != name:
+            self.imports.setdefault(importer, set()).add(name)
+            self.dependents.setdefault(name, set()).add(importer)
+        self.importers.setdefault(name, weakref.WeakSet()).add(evaluator)
+    
+    def reload(self, name: str) -> List[str]:
+        """Re-execute a module and every module that transitively imports it.
+        
+        Returns the reloaded module names in execution order.
+        """
+        return self.reload_modules([name])
+    
+    def changed_modules(self) -> List[str]:
+        """Loaded modules whose source file changed since it was read."""
+        changed = []
+        for name in self.loaded_modules:
+            path = self.module_paths.get(name)
+            if path is None:
+                continue
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            if mtime != self.module_mtimes.get(name):
+                changed.append(name)
+        return changed
+    
+    def reload_changed(self) -> List[str]:
+        """Reload every module whose source file changed on disk."""
+        changed = self.changed_modules()
+        if not changed:
+            return []
+        return self.reload_modules(changed)
+    
+    def reload_modules(self, names: List[str]) -> List[str]:
+        """Reload modules and their dependents, swapping exports atomically.
+        
+        Only the named modules are re-read and re-parsed; dependents are
+        re-executed from their cached ASTs, with the lazy-imports setting
+        and random generator they first ran with. Importers see either all
+        old or all new exports: if any module fails, nothing is swapped.
+        """
+        with self._lock:
+            order = self.reload_order(names)
+            snapshot = (dict(self.module_asts), dict(self.module_mtimes),
+                        {k: set(v) for k, v in self.imports.items()},
+                        {k: set(v) for k, v in self.dependents.items()})
+            staged = {}
+            self._staged = staged
+            try:
+                for name in names:
+                    if name in self.native_modules:
+                        continue
+                    self.module_tokens.pop(name, None)
+                    self.parse_module(name)
+                for name in order:
+                    exports = self.native_exports(name)
+                    if exports is None:
+                        lazy, rng = self.module_settings.get(name, (False, None))
+                        exports = self.execute_module(name, self.module_asts[name], lazy, rng)
+                    staged[name] = exports
+            except Exception:
+                (self.module_asts, self.module_mtimes,
+                 self.imports, self.dependents) = snapshot
+                raise
+            finally:
+                self._staged = None
+            
+            old_exports = {name: self.loaded_modules.get(name, {}) for name in order}
+            self.loaded_modules.update(staged)
+            for name in order:
+                self.rebind_importers(name, old_exports[name], staged[name])
+            return order
+    
+    def reload_order(self, names: List[str]) -> List[str]:
+        """Modules affected by changes to names, dependencies first."""
+        affected = set()
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name in affected:
+                continue
+            affected.add(name)
+            pending.extend(self.dependents.get(name, ()))
+        
+        order = []
+        visited = set()
+        
+        def visit(name):
+            if name in visited:
+                return
+            visited.add(name)
+            for imported in sorted(self.imports.get(name, ())):
+                if imported in affected:
+                    visit(imported)
+            order.append(name)
+        
+        for name in sorted(affected):
+            visit(name)
+        return order
+    
+    def rebind_importers(self, name: str, old: Dict[str, Any], new: Dict[str, Any]) -> None:
+        """Point importers' names still bound to old exports at the new ones.
+        
+        Both an importer's globals and the closures of its functions are
+        rebound, for the functions reachable from its globals (directly or
+        through other closures). Functions held only in arrays, objects or
+        memo() wrappers keep the old exports.
+        """
+        def stale(key, current):
+            return ((key in old and current is old[key])
+                    or (type(current) is LazyExport and current.module_name == name))
+        
+        for evaluator in list(self.importers.get(name, ())):
+            scope = evaluator.globals
+            for key, value in new.items():
+                if key not in scope or stale(key, scope[key]):
+                    scope[key] = value
+            for func in own_functions(evaluator):
+                closure = func.closure
+                for key, value in new.items():
+                    if key in closure and stale(key, closure[key]):
+                        closure[key] = value
+    
+    def scan_exports(self, name: str, _seen=None) -> List[str]:
+        """List a module's top-level names without parsing or executing it.
+        
+        Only the token stream is inspected: `fn` and `let` declarations at
+        brace depth 0, aliases of `import py` imports, plus the exports of
+        modules it imports.
+        """
+        seen = _seen if _seen is not None else set()
+        if name in seen:
+            return []
+        seen.add(name)
+        
+        if name in self.loaded_modules:
+            return list(self.loaded_modules[name])
+        exports = self.native_exports(name)
+        if exports is not None:
+            return [n for n in exports if not n.startswith('_')]
+        
+        tokens = self.module_tokens.get(name)
+        if tokens is None:
+            tokens = self.tokenize_module(name)
+            self.module_tokens[name] = tokens
+        
+        names = []
+        depth = 0
+        for i, token in enumerate(tokens[:-1]):
+            if token.type == TokenType.LBRACE:
+                depth += 1
+            elif token.type == TokenType.RBRACE:
+                depth -= 1
+            elif depth == 0 and token.type in (TokenType.FN, TokenType.LET, TokenType.IMPORT):
+                following = tokens[i + 1]
+                if token.type == TokenType.IMPORT:
+                    if (following.type == TokenType.IDENTIFIER and following.value == 'py'
+                            and tokens[i + 2].type == TokenType.STRING):
+                        # import py "path" as alias: the alias is one of this module's names
+                        alias = tokens[i + 4] if i + 4 < len(tokens) else None
+                        if alias is not None and alias.type == TokenType.IDENTIFIER:
+                            names.append(alias.value)
+                        continue
+                    if following.type not in MODULE_NAME_TOKENS:
+                        continue
+                    if following.value == 'lazy' and tokens[i + 2].type in MODULE_NAME_TOKENS:
+                        following = tokens[i + 2]
+                    names.extend(self.scan_exports(following.value, seen))
+                elif following.type == TokenType.IDENTIFIER:
+                    names.append(following.value)
+        return [n for n in dict.fromkeys(names) if not n.startswith('_')]
+    
+    def lazy_exports(self, name: str) -> Dict[str, Any]:
+        """Return placeholders for a module's exports, deferring execution."""
+        if name in self.loaded_modules:
+            return self.loaded_modules[name]
+        return {n: LazyExport(self, name, n) for n in self.scan_exports(name)}
@@ -0,0 +1,7 @@
+"""Native py++ modules implemented in Python.
+
+Each module here defines EXPORTS, a dict of the names `import <module>;`
+binds. The values are called like builtins, so they run with no
+interpretation overhead. ModuleLoader serves these in place of the
+matching stdlib/*.pypp files, which remain as fallbacks.
+"""
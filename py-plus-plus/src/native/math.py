@@ -0,0 +1,24 @@
+"""Native version of stdlib/math.pypp."""
+
+from ..builtins_advanced import builtin_abs, builtin_min, builtin_max
+
+def square(x):
+    """x squared."""
+    return x * x
+
+def cube(x):
+    """x cubed."""
+    return x * x * x
+
+def power(x, y):
+    """x raised to the power y."""
+    return x ** y
+
+EXPORTS = {
+    'abs': builtin_abs,
+    'min': builtin_min,
+    'max': builtin_max,
+    'square': square,
+    'cube': cube,
+    'power': power,
+}
@@ -0,0 +1,20 @@
+"""Native version of stdlib/string.pypp."""
+
+from ..builtins_advanced import builtin_len
+from ..errors import TypeError as PyPPTypeError
+
+def concat(a, b):
+    """a + b."""
+    return a + b
+
+def repeat(s, n):
+    """s repeated n times; empty when n <= 0."""
+    if type(n) is not int:
+        raise PyPPTypeError(f"repeat() count must be an int, got {type(n).__name__}")
+    return s * n
+
+EXPORTS = {
+    'length': builtin_len,
+    'concat': concat,
+    'repeat': repeat,
+}
@@ -0,0 +1,21 @@
+"""Native version of stdlib/sys.pypp."""
+
+def exit(code):
+    """Placeholder kept for parity with sys.pypp; does nothing."""
+    return None
+
+def print_version():
+    """Print the language version."""
+    print("py++ version 0.1.0")
+    return None
+
+def info():
+    """Print a one-line description of py++."""
+    print("py++ - Python-like language with C++ speed")
+    return None
+
+EXPORTS = {
+    'exit': exit,
+    'print_version': print_version,
+    'info': info,
+}
@@ -0,0 +1,164 @@
+"""Parallel map for py++: one function applied to an array across processes.
+
+pmap() pickles the function once and hands it to each worker process as
+the worker starts. A py++ function travels as its parameters, its body
+and the values of the names the body uses, taken from its closure and its
+evaluator's globals; functions among those values travel the same way.
+Each worker rebuilds the functions in an Evaluator of its own, then maps
+chunks of the array. Results come back in order.
+
+Arguments and results cross the process boundary as plain Python data
+(see ffi.to_python), so arrays, objects and sets are copied; compact
+numeric chunks are sent as they are. Shared arrays are the exception:
+mapping over one, or using one from the function, sends only its name,
+and each worker attaches to the same memory once.
+"""
+
+import math
+import os
+import pickle
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from .advanced import PyPPArray
+from .ast_nodes import Identifier, walk
+from .builtins_advanced import PyPPFunction, as_callback
+from .errors import TypeError as PyPPTypeError, RuntimeError as PyPPRuntimeError
+from .evaluator import Evaluator, LazyExport, Rope
+from .ffi import from_python, to_python
+from .shared import SharedArray
+
+# Chunks per worker when no chunk size is given: enough to even out uneven
+# chunks without paying the per-chunk overhead too often
+CHUNKS_PER_WORKER = 4
+
+
+class ShippedFunction:
+    """Picklable form of a PyPPFunction."""
+    
+    __slots__ = ('params', 'body', 'scope')
+    
+    def __init__(self, params: List[str], body: Any):
+        self.params = params
+        self.body = body
+        # Name -> value (plain data or a ShippedFunction) for each name the body uses
+        self.scope: Dict[str, Any] = {}
+
+
+def ship(func: PyPPFunction, shipped: Optional[Dict[int, ShippedFunction]] = None) -> ShippedFunction:
+    """The ShippedFunction for func; shipped maps id(PyPPFunction) to what is already built."""
+    if shipped is None:
+        shipped = {}
+    result = shipped.get(id(func))
+    if result is not None:
+        return result
+    result = shipped[id(func)] = ShippedFunction(func.params, func.body)
+    names = {node.name for node in walk(func.body) if isinstance(node, Identifier)}
+    scope = func.evaluator.globals if func.evaluator is not None else {}
+    for name in names.difference(func.params):
+        if name in func.closure:
+            value = func.closure[name]
+        elif name in scope:
+            value = scope[name]
+            if type(value) is LazyExport:
+                value = func.evaluator.resolve_lazy(scope, value)
+        else:
+            # A builtin, or a name the body binds itself
+            continue
+        if type(value) is Rope:
+            value = value.toString()
+        if isinstance(value, PyPPFunction):
+            value = ship(value, shipped)
+        elif not isinstance(value, SharedArray):
+            value = to_python(value)
+        result.scope[name] = value
+    return result
+
+def rebuild(shipped: ShippedFunction, evaluator: Evaluator,
+            built: Optional[Dict[int, PyPPFunction]] = None) -> PyPPFunction:
+    """PyPPFunction for a ShippedFunction, bound to evaluator."""
+    if built is None:
+        built = {}
+    func = built.get(id(shipped))
+    if func is not None:
+        return func
+    closure = {}
+    func = built[id(shipped)] = PyPPFunction(shipped.params, shipped.body, closure, evaluator)
+    for name, value in shipped.scope.items():
+        closure[name] = (rebuild(value, evaluator, built) if type(value) is ShippedFunction
+                         else from_python(value))
+    return func
+
+
+# The function a worker process maps, and the shared array it maps over
+# (if any), set up by start_worker
+worker_call: Optional[Callable] = None
+worker_source: Optional[SharedArray] = None
+
+def start_worker(payload: bytes) -> None:
+    """Pool initializer: unpickle the function once per worker process."""
+    global worker_call, worker_source
+    target, worker_source = pickle.loads(payload)
+    if type(target) is ShippedFunction:
+        evaluator = Evaluator()
+        worker_call = evaluator.invoker(rebuild(target, evaluator))
+    else:
+        worker_call = target
+
+def run_chunk(chunk) -> list:
+    """Map the worker's function over one chunk, returning plain data.
+    
+    A range chunk gives positions in the shared source array.
+    """
+    call = worker_call
+    if type(chunk) is range:
+        chunk = worker_source.items[chunk.start:chunk.stop]
+    return [to_python(call(from_python(item))) for item in chunk]
+
+
+def pmap(fn: Any, arr: PyPPArray, workers: Optional[int] = None,
+         chunk_size: Optional[int] = None) -> PyPPArray:
+    """Array of fn(item) for each item of arr, computed by worker processes.
+    
+    With one worker, or nothing to map, fn runs in this process instead.
+    """
+    if not isinstance(arr, PyPPArray):
+        raise PyPPTypeError(f"pmap() requires an array, got {type(arr).__name__}")
+    if isinstance(fn, PyPPFunction) and fn.is_async:
+        raise PyPPTypeError("pmap() cannot run async functions")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if type(workers) is not int or workers < 1:
+        raise PyPPRuntimeError(f"pmap() workers must be a positive int, got {workers}")
+    if chunk_size is not None and (type(chunk_size) is not int or chunk_size < 1):
+        raise PyPPRuntimeError(f"pmap() chunkSize must be a positive int, got {chunk_size}")
+    items = arr.items
+    n = len(items)
+    if workers == 1 or n == 0:
+        return PyPPArray(list(map(as_callback(fn, 'pmap'), items)))
+    
+    if isinstance(fn, PyPPFunction):
+        target = ship(fn)
+    elif callable(fn):
+        target = fn
+    else:
+        raise PyPPTypeError(f"pmap() requires a function, got {type(fn).__name__}")
+    source = arr if isinstance(arr, SharedArray) else None
+    try:
+        payload = pickle.dumps((target, source))
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        raise PyPPTypeError(f"pmap() cannot send the function to worker processes: {e}")
+    
+    size = chunk_size or max(1, math.ceil(n / (workers * CHUNKS_PER_WORKER)))
+    if source is not None:
+        chunks = (range(start, min(start + size, n)) for start in range(0, n, size))
+    elif type(items) is array:
+        chunks = (items[start:start + size] for start in range(0, n, size))
+    else:
+        chunks = ([to_python(item) for item in items[start:start + size]]
+                  for start in range(0, n, size))
+    results = []
+    with ProcessPoolExecutor(workers, initializer=start_worker, initargs=(payload,)) as pool:
+        for part in pool.map(run_chunk, chunks):
+            results.extend(part)
+    return PyPPArray([from_python(result) for result in results])
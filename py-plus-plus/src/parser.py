@@ -5,12 +5,18 @@ from .lexer import Token, TokenType
 from .ast_nodes import *
 from .errors import ParserError
 
+# Type keywords double as module names, as in `import string;`
+MODULE_NAME_TOKENS = (TokenType.IDENTIFIER, TokenType.INT_TYPE, TokenType.STRING_TYPE,
+                      TokenType.FLOAT_TYPE, TokenType.BOOL_TYPE)
+
 class Parser:
     """Parses tokens into an AST."""
     
     def __init__(self, tokens: List[Token]):
         self.tokens = tokens
         self.pos = 0
+        # Whether await may appear here: at the top level and in async fns
+        self.in_async = True
     
     def error(self, msg: str):
         token = self.current_token()
@@ -54,8 +60,10 @@ class Parser:
     def parse_statement(self) -> Optional[ASTNode]:
         if self.match(TokenType.LET):
             return self.parse_let_statement()
-        elif self.match(TokenType.FN):
+        elif self.match(TokenType.FN, TokenType.ASYNC):
             return self.parse_function_decl()
+        elif self.match(TokenType.AT):
+            return self.parse_decorated_function()
         elif self.match(TokenType.RETURN):
             return self.parse_return_statement()
         elif self.match(TokenType.IF):
@@ -79,11 +87,62 @@ class Parser:
         else:
             return self.parse_expression_statement()
     
-    def parse_import_statement(self) -> ImportStatement:
+    def parse_import_statement(self) -> ASTNode:
         self.expect(TokenType.IMPORT)
-        module_name = self.expect(TokenType.IDENTIFIER).value
+        # `py` is contextual too: only `import py "path"` imports Python code
+        if (self.match(TokenType.IDENTIFIER)
+                and self.current_token().value == 'py'
+                and self.peek_token(1).type == TokenType.STRING):
+            return self.parse_foreign_import()
+        lazy = False
+        # `lazy` is contextual: `import lazy;` still imports a module named lazy
+        if (self.match(TokenType.IDENTIFIER)
+                and self.current_token().value == 'lazy'
+                and self.peek_token(1).type in MODULE_NAME_TOKENS):
+            self.advance()
+            lazy = True
+        token = self.consume(*MODULE_NAME_TOKENS)
+        if token is None:
+            self.error(f"Expected module name, got {self.current_token().type.name}")
+        module_name = token.value
         self.consume(TokenType.SEMICOLON)
-        return ImportStatement(module_name)
+        return ImportStatement(module_name, lazy)
+    
+    def parse_foreign_import(self) -> ForeignImport:
+        """import py "path" as alias [{ name(type, ...) -> type; ... }]"""
+        self.advance()
+        path = self.expect(TokenType.STRING).value
+        keyword = self.expect(TokenType.IDENTIFIER)
+        if keyword.value != 'as':
+            self.error("Expected 'as' after Python module path")
+        alias = self.expect(TokenType.IDENTIFIER).value
+        signatures = {}
+        if self.consume(TokenType.LBRACE):
+            while not self.consume(TokenType.RBRACE):
+                name = self.expect(TokenType.IDENTIFIER).value
+                self.expect(TokenType.LPAREN)
+                params = []
+                if not self.match(TokenType.RPAREN):
+                    params.append(self.parse_foreign_type())
+                    while self.consume(TokenType.COMMA):
+                        params.append(self.parse_foreign_type())
+                self.expect(TokenType.RPAREN)
+                returns = None
+                if self.consume(TokenType.ARROW):
+                    returns = self.parse_foreign_type()
+                self.consume(TokenType.SEMICOLON)
+                signatures[name] = (params, returns)
+        self.consume(TokenType.SEMICOLON)
+        return ForeignImport(path, alias, signatures)
+    
+    def parse_foreign_type(self) -> str:
+        """Type in a foreign signature: a type keyword, null, or a name like bytes."""
+        if self.consume(TokenType.NONE):
+            return 'null'
+        token = self.consume(TokenType.IDENTIFIER)
+        if token is not None:
+            return token.value
+        return self.parse_type()
     
     def parse_let_statement(self) -> LetStatement:
         self.expect(TokenType.LET)
@@ -110,6 +169,7 @@ class Parser:
         self.error("Expected type annotation")
     
     def parse_function_decl(self) -> FunctionDecl:
+        is_async = self.consume(TokenType.ASYNC) is not None
         self.expect(TokenType.FN)
         name = self.expect(TokenType.IDENTIFIER).value
         self.expect(TokenType.LPAREN)
@@ -133,8 +193,29 @@ class Parser:
         return_type = None
         if self.consume(TokenType.ARROW):
             return_type = self.parse_type()
+        outer, self.in_async = self.in_async, is_async
         body = self.parse_block_statement()
-        return FunctionDecl(name, params, body, return_type, param_types)
+        self.in_async = outer
+        return FunctionDecl(name, params, body, return_type, param_types, is_async=is_async)
+    
+    def parse_decorated_function(self) -> FunctionDecl:
+        """@name or @name(args) lines before fn: `@memo(100) fn f(n) {...}` binds f to memo(f, 100)."""
+        decorators = []
+        while self.consume(TokenType.AT):
+            name = self.expect(TokenType.IDENTIFIER).value
+            args = []
+            if self.consume(TokenType.LPAREN):
+                if not self.match(TokenType.RPAREN):
+                    args.append(self.parse_expression())
+                    while self.consume(TokenType.COMMA):
+                        args.append(self.parse_expression())
+                self.expect(TokenType.RPAREN)
+            decorators.append(CallExpression(Identifier(name), args))
+        if not self.match(TokenType.FN, TokenType.ASYNC):
+            self.error("Expected fn after decorator")
+        decl = self.parse_function_decl()
+        decl.decorators = decorators
+        return decl
     
     def parse_return_statement(self) -> ReturnStatement:
         self.expect(TokenType.RETURN)
@@ -269,6 +350,11 @@ class Parser:
             op = self.tokens[self.pos - 1].value
             operand = self.parse_unary()
             return UnaryOp(op, operand)
+        if self.match(TokenType.AWAIT):
+            if not self.in_async:
+                self.error("await outside an async function")
+            self.advance()
+            return AwaitExpression(self.parse_unary())
         return self.parse_postfix()
     
     def parse_postfix(self) -> ASTNode:
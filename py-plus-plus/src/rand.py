@@ -0,0 +1,146 @@
+"""Random numbers for py++: a seedable generator per evaluator, and bulk draws.
+
+Every Evaluator owns a RandomSource and binds the random builtins to it,
+so seed(n) makes one script's draws reproducible without touching any
+other evaluator. Scalar draws (random, randint, choice) use Python's
+Mersenne Twister. Bulk draws fill a compact array in one call, with
+NumPy's generator when it is importable. A seed gives the same draws on
+every machine with NumPy, and on every machine without it, but the two
+sequences differ.
+"""
+
+import random
+from array import array
+from typing import Any, Callable, Dict, Optional
+from .advanced import PyPPArray, compact_items
+from .errors import RuntimeError as PyPPRuntimeError, TypeError as PyPPTypeError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+
+def count_arg(n: Any, name: str) -> int:
+    if type(n) is not int:
+        raise PyPPTypeError(f"{name}() count must be int, got {type(n).__name__}")
+    if n < 0:
+        raise PyPPRuntimeError(f"{name}() count must not be negative, got {n}")
+    return n
+
+def array_arg(arr: Any, name: str) -> PyPPArray:
+    if not isinstance(arr, PyPPArray):
+        raise PyPPTypeError(f"{name}() requires an array, got {type(arr).__name__}")
+    return arr
+
+
+class RandomSource:
+    """A seedable generator and the random builtins bound to it."""
+    
+    def __init__(self, seed: Optional[int] = None):
+        self.seed(seed)
+    
+    def seed(self, seed: Optional[int] = None) -> None:
+        """Restart both generators from seed, or from fresh entropy when None."""
+        if seed is not None and (type(seed) is not int or seed < 0):
+            raise PyPPRuntimeError(f"seed() requires a non-negative int, got {seed}")
+        self.python = random.Random(seed)
+        self.seed_value = seed
+        self.generator = None
+    
+    @property
+    def numpy(self):
+        """NumPy generator, made on first bulk draw; None without NumPy."""
+        if self.generator is None and np is not None:
+            self.generator = np.random.default_rng(self.seed_value)
+        return self.generator
+    
+    def random(self) -> float:
+        """Float in [0, 1)."""
+        return self.python.random()
+    
+    def randint(self, a: int, b: int) -> int:
+        """Int in [a, b]."""
+        return self.python.randint(a, b)
+    
+    def random_array(self, n: int) -> PyPPArray:
+        """Compact array of n floats in [0, 1)."""
+        n = count_arg(n, 'randomArray')
+        result = PyPPArray()
+        if self.numpy is not None:
+            result.items = array('d')
+            result.items.frombytes(self.numpy.random(n).tobytes())
+        else:
+            draw = self.python.random
+            result.items = array('d', [draw() for _ in range(n)])
+        return result
+    
+    def randint_array(self, n: int, a: int, b: int) -> PyPPArray:
+        """Array of n ints in [a, b], compact when the bounds fit in 64 bits."""
+        n = count_arg(n, 'randintArray')
+        if type(a) is not int or type(b) is not int:
+            raise PyPPTypeError("randintArray() bounds must be ints")
+        if a > b:
+            raise PyPPRuntimeError(f"randintArray() needs a <= b, got {a} > {b}")
+        result = PyPPArray()
+        if self.numpy is not None and INT64_MIN <= a and b <= INT64_MAX:
+            result.items = array('q')
+            result.items.frombytes(
+                self.numpy.integers(a, b, size=n, dtype=np.int64, endpoint=True).tobytes())
+        else:
+            draw = self.python.randint
+            result.items = compact_items([draw(a, b) for _ in range(n)])
+        return result
+    
+    def permutation(self, n: int):
+        """Indices 0..n-1 in random order (an ndarray with NumPy)."""
+        if self.numpy is not None:
+            return self.numpy.permutation(n)
+        order = list(range(n))
+        self.python.shuffle(order)
+        return order
+    
+    def shuffle(self, arr: PyPPArray) -> PyPPArray:
+        """Shuffle arr in place and return it."""
+        arr = array_arg(arr, 'shuffle')
+        arr.permute(self.permutation(arr.length()))
+        return arr
+    
+    def sample(self, arr: PyPPArray, k: int) -> PyPPArray:
+        """New array of k distinct positions of arr, in random order."""
+        arr = array_arg(arr, 'sample')
+        k = count_arg(k, 'sample')
+        n = arr.length()
+        if k > n:
+            raise PyPPRuntimeError(f"sample() of {k} from an array of {n}")
+        if self.numpy is not None:
+            return arr.gather(self.numpy.choice(n, size=k, replace=False))
+        return arr.gather(self.python.sample(range(n), k))
+    
+    def choice(self, arr: PyPPArray) -> Any:
+        """One element of arr."""
+        arr = array_arg(arr, 'choice')
+        n = arr.length()
+        if n == 0:
+            raise PyPPRuntimeError("choice() from an empty array")
+        return arr.get(self.python.randrange(n))
+    
+    def builtins(self) -> Dict[str, Callable]:
+        """The random builtins, bound to this source."""
+        return {
+            'seed': self.seed,
+            'random': self.random,
+            'randint': self.randint,
+            'randomArray': self.random_array,
+            'randintArray': self.randint_array,
+            'shuffle': self.shuffle,
+            'sample': self.sample,
+            'choice': self.choice,
+        }
+
+
+# Source behind the shared BUILTINS entries, for calls made outside an evaluator
+DEFAULT = RandomSource()
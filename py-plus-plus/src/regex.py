@@ -0,0 +1,162 @@
+"""Regular expressions for py++.
+
+Patterns given as strings are compiled once and kept in a bounded LRU
+cache, so a script that calls search(line, "...") in a loop compiles the
+pattern on the first call only. regex(pattern) returns a Regex handle that
+holds its compiled pattern and skips the cache lookup altogether.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+from .advanced import PyPPArray, StrView, as_str
+from .errors import RuntimeError as PyPPRuntimeError, TypeError as PyPPTypeError
+
+# Compiled patterns kept by default
+CACHE_SIZE = 256
+
+# regex() flag letters -> re flags
+FLAGS = {'i': re.IGNORECASE, 'm': re.MULTILINE, 's': re.DOTALL, 'x': re.VERBOSE}
+
+
+def parse_flags(flags: str) -> int:
+    """re flags for a string of flag letters, e.g. "im"."""
+    value = 0
+    for letter in flags:
+        try:
+            value |= FLAGS[letter]
+        except KeyError:
+            raise PyPPRuntimeError(f"Unknown regex flag: {letter}")
+    return value
+
+def compile_pattern(pattern: str, flags: str = '') -> re.Pattern:
+    """Compile a pattern, raising a py++ error if it is invalid."""
+    try:
+        return re.compile(pattern, parse_flags(flags))
+    except re.error as e:
+        raise PyPPRuntimeError(f"Invalid regex {pattern!r}: {e}")
+
+
+class PatternCache:
+    """Least-recently-used cache of compiled patterns, keyed by (pattern, flags).
+    
+    Hits and misses are counted for runtimeStats(). A size of 0 turns the
+    cache off: every lookup compiles.
+    """
+    
+    def __init__(self, size: int = CACHE_SIZE):
+        self.size = size
+        self.patterns: 'OrderedDict[Tuple[str, str], re.Pattern]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+    
+    def compile(self, pattern: str, flags: str = '') -> re.Pattern:
+        """Compiled pattern, from the cache when possible."""
+        key = (pattern, flags)
+        with self.lock:
+            compiled = self.patterns.get(key)
+            if compiled is not None:
+                self.hits += 1
+                self.patterns.move_to_end(key)
+                return compiled
+            self.misses += 1
+        compiled = compile_pattern(pattern, flags)
+        with self.lock:
+            if self.size > 0:
+                self.patterns[key] = compiled
+                while len(self.patterns) > self.size:
+                    self.patterns.popitem(last=False)
+        return compiled
+    
+    def resize(self, size: int) -> int:
+        """Set the maximum number of patterns kept; returns the old size."""
+        if type(size) is not int or size < 0:
+            raise PyPPRuntimeError(f"Regex cache size must be a non-negative int, got {size}")
+        with self.lock:
+            old, self.size = self.size, size
+            while len(self.patterns) > size:
+                self.patterns.popitem(last=False)
+        return old
+    
+    def clear(self) -> None:
+        """Drop every cached pattern and reset the counters."""
+        with self.lock:
+            self.patterns.clear()
+            self.hits = self.misses = 0
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            'regexCacheHits': self.hits,
+            'regexCacheMisses': self.misses,
+            'regexCacheEntries': len(self.patterns),
+            'regexCacheSize': self.size,
+        }
+
+
+# Cache shared by every evaluator, as re's own cache is
+PATTERNS = PatternCache()
+
+
+class Regex:
+    """A compiled pattern, made by regex(pattern, flags)."""
+    
+    __slots__ = ('compiled', 'flags')
+    
+    def __init__(self, pattern: str, flags: str = ''):
+        self.compiled = compile_pattern(pattern, flags)
+        self.flags = flags
+    
+    def __str__(self) -> str:
+        return f"/{self.compiled.pattern}/{self.flags}"
+    
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+def pattern_of(pattern: Any, name: str) -> re.Pattern:
+    """Compiled pattern for a Regex handle or a pattern string."""
+    if type(pattern) is Regex:
+        return pattern.compiled
+    if isinstance(pattern, (str, StrView)):
+        return PATTERNS.compile(str(pattern))
+    raise PyPPTypeError(f"{name}() requires a pattern string or regex, got {type(pattern).__name__}")
+
+def text_of(text: Any, name: str) -> str:
+    text = as_str(text)
+    if type(text) is not str:
+        raise PyPPTypeError(f"{name}() requires a string, got {type(text).__name__}")
+    return text
+
+def groups(match: re.Match) -> PyPPArray:
+    """Array of the whole match followed by each group (null if it did not take part)."""
+    return PyPPArray([match.group(0), *match.groups()])
+
+def match(text: Any, pattern: Any) -> Any:
+    """Groups of a match at the start of text, or None."""
+    found = pattern_of(pattern, 'match').match(text_of(text, 'match'))
+    return groups(found) if found is not None else None
+
+def search(text: Any, pattern: Any) -> Any:
+    """Groups of the first match anywhere in text, or None."""
+    found = pattern_of(pattern, 'search').search(text_of(text, 'search'))
+    return groups(found) if found is not None else None
+
+def find_all(text: Any, pattern: Any) -> PyPPArray:
+    """Every match: whole matches, the group if there is one, else arrays of groups."""
+    found = pattern_of(pattern, 'findAll').findall(text_of(text, 'findAll'))
+    if found and type(found[0]) is tuple:
+        return PyPPArray([PyPPArray(list(item)) for item in found])
+    return PyPPArray(found)
+
+def replace(text: Any, pattern: Any, replacement: Any, count: int = 0) -> str:
+    """text with matches replaced by a template (\\1, \\g<name>) or by fn(groups)."""
+    compiled = pattern_of(pattern, 'regexReplace')
+    if callable(replacement):
+        return compiled.sub(lambda found: str(replacement(groups(found))), text_of(text, 'regexReplace'), count)
+    return compiled.sub(text_of(replacement, 'regexReplace'), text_of(text, 'regexReplace'), count)
+
+def split(text: Any, pattern: Any, limit: int = 0) -> PyPPArray:
+    """text split at each match, at most limit times (0 for no limit)."""
+    return PyPPArray(pattern_of(pattern, 'regexSplit').split(text_of(text, 'regexSplit'), limit))
@@ -0,0 +1,216 @@
+"""Arrays in shared memory, for handing data to worker processes without copying.
+
+A SharedArray is a PyPPArray of ints or floats whose storage is a
+memoryview of a multiprocessing.shared_memory segment, so the array
+builtins work on it as on any compact array. Pickling one sends only the
+segment's name: pmap() workers, and the functions they run, attach to the
+same memory instead of receiving a copy, and a write made by any process
+is seen by all of them.
+
+A segment has a fixed size, so push, pop, shift and unshift raise, as
+does storing a value of the wrong type. The process that made a segment
+owns it; the segment is freed by release(arr), at the end of the
+interpret() call that made it (whether or not the script raised), or when
+the interpreter exits.
+"""
+
+import atexit
+import operator
+import os
+import threading
+from array import array
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator
+from .advanced import PyPPArray, TYPECODE_TYPES, typecode_of
+from .errors import RuntimeError as PyPPRuntimeError, TypeError as PyPPTypeError
+
+# sharedArray() element type -> typecode
+KINDS = {'int': 'q', 'float': 'd'}
+
+# Bytes per element for both typecodes
+ITEM_SIZE = 8
+
+
+class SharedArray(PyPPArray):
+    """Fixed-length int or float array stored in a shared memory segment."""
+    
+    def __init__(self, segment: shared_memory.SharedMemory, typecode: str, length: int,
+                 owner: bool = False):
+        self.segment = segment
+        self.typecode = typecode
+        # Only the process that created the segment unlinks it
+        self.owner = owner
+        self.pid = os.getpid()
+        self._storage = segment.buf[:length * ITEM_SIZE].cast(typecode)
+        self._head = 0
+    
+    @property
+    def name(self) -> str:
+        """Name other processes attach to the segment by."""
+        return self.segment.name
+    
+    @property
+    def released(self) -> bool:
+        return self._storage is None
+    
+    @property
+    def _items(self):
+        # The mapped segment, until release() drops it
+        if self._storage is None:
+            raise PyPPRuntimeError("Shared array has been released")
+        return self._storage
+    
+    @_items.setter
+    def _items(self, value):
+        # Whole-array writes (sort, permute) copy into the segment
+        storage = self._items
+        if len(value) != len(storage):
+            raise PyPPRuntimeError("Shared arrays have a fixed length")
+        if type(value) is not array or value.typecode != self.typecode:
+            value = array(self.typecode, map(self.coerce, value))
+        storage[:] = value
+    
+    def coerce(self, item: Any) -> Any:
+        """item as this array's element type, or raise."""
+        if type(item) is TYPECODE_TYPES[self.typecode]:
+            return item
+        if self.typecode == 'd' and type(item) is int:
+            return float(item)
+        kind = 'int' if self.typecode == 'q' else 'float'
+        raise PyPPTypeError(f"Shared {kind} array cannot hold {type(item).__name__}")
+    
+    def set(self, index: int, value: Any) -> None:
+        try:
+            super().set(index, self.coerce(value))
+        except ValueError:
+            raise PyPPRuntimeError(f"Value out of range for a shared int array: {value}")
+    
+    def push(self, item: Any) -> None:
+        raise PyPPRuntimeError("Shared arrays have a fixed length")
+    
+    def pop(self) -> Any:
+        raise PyPPRuntimeError("Shared arrays have a fixed length")
+    
+    def shift(self) -> Any:
+        raise PyPPRuntimeError("Shared arrays have a fixed length")
+    
+    def unshift(self, item: Any) -> None:
+        raise PyPPRuntimeError("Shared arrays have a fixed length")
+    
+    def reverse(self) -> None:
+        if self._views:
+            self._detach_views()
+        self.items = array(self.typecode, reversed(self.items))
+    
+    def indexOf(self, item: Any) -> int:
+        try:
+            return operator.indexOf(self.items, item)
+        except ValueError:
+            return -1
+    
+    def release(self) -> None:
+        """Stop using the segment; the owner also frees it. Safe to call twice."""
+        if self._storage is None:
+            return
+        if self._views:
+            self._detach_views()
+        storage, self._storage = self._storage, None
+        try:
+            storage.release()
+            self.segment.close()
+        except BufferError:
+            # An ndarray over the storage is still alive; the mapping goes with it
+            pass
+        if self.owner and self.pid == os.getpid():
+            self.segment.unlink()
+            SEGMENTS.discard(self)
+    
+    def __reduce__(self):
+        # Pickled by name, so another process attaches instead of copying
+        return attach, (self.name, self.typecode, self.length())
+    
+    def __enter__(self) -> 'SharedArray':
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+def attach(name: str, typecode: str, length: int) -> SharedArray:
+    """SharedArray over an existing segment, made by another SharedArray."""
+    try:
+        segment = shared_memory.SharedMemory(name)
+    except FileNotFoundError:
+        raise PyPPRuntimeError(f"Shared array {name} has been released")
+    return SharedArray(segment, typecode, length)
+
+def create(length: int, kind: str = 'float') -> SharedArray:
+    """New zero-filled SharedArray of length ints or floats, owned by this process."""
+    if type(length) is not int or length < 0:
+        raise PyPPRuntimeError(f"sharedArray() length must be a non-negative int, got {length}")
+    typecode = KINDS.get(kind)
+    if typecode is None:
+        raise PyPPTypeError(f"sharedArray() type must be \"int\" or \"float\", got {kind}")
+    # A segment cannot be empty
+    segment = shared_memory.SharedMemory(create=True, size=max(length * ITEM_SIZE, 1))
+    arr = SharedArray(segment, typecode, length, owner=True)
+    SEGMENTS.add(arr)
+    return arr
+
+def share(arr: PyPPArray) -> SharedArray:
+    """Copy of a numeric array in a new SharedArray."""
+    if not isinstance(arr, PyPPArray):
+        raise PyPPTypeError(f"share() requires an array, got {type(arr).__name__}")
+    items = arr.items
+    typecode = 'q' if type(items) is range else typecode_of(items)
+    if typecode is None:
+        if items:
+            raise PyPPTypeError("share() requires an array of only ints or only floats")
+        typecode = 'd'
+    result = create(len(items), 'int' if typecode == 'q' else 'float')
+    if type(items) is range:
+        items = array('q', items)
+    result._storage[:] = items
+    return result
+
+
+class Segments:
+    """Shared arrays this process made and has not released yet."""
+    
+    def __init__(self):
+        self.owned: Dict[str, SharedArray] = {}
+        self.lock = threading.Lock()
+    
+    def add(self, arr: SharedArray) -> None:
+        with self.lock:
+            self.owned[arr.name] = arr
+    
+    def discard(self, arr: SharedArray) -> None:
+        with self.lock:
+            self.owned.pop(arr.name, None)
+    
+    def release_all(self) -> None:
+        """Release every segment still owned."""
+        with self.lock:
+            arrays = list(self.owned.values())
+        for arr in arrays:
+            arr.release()
+    
+    @contextmanager
+    def session(self) -> Iterator[None]:
+        """Release the segments made inside the block when it exits, even on error."""
+        with self.lock:
+            before = set(self.owned)
+        try:
+            yield
+        finally:
+            with self.lock:
+                made = [arr for name, arr in self.owned.items() if name not in before]
+            for arr in made:
+                arr.release()
+
+
+# Segments owned by this process
+SEGMENTS = Segments()
+atexit.register(SEGMENTS.release_all)
@@ -0,0 +1,65 @@
+"""Timing for py++: monotonic clocks and an in-language micro-benchmark.
+
+bench() runs a function in batches the way timeit does: after a warmup,
+it picks a batch size that takes at least min_time, times several batches
+and reports statistics of the time per call.
+"""
+
+import math
+import statistics
+import time
+from itertools import repeat
+from typing import Callable, Dict
+from .errors import RuntimeError as PyPPRuntimeError
+
+# bench() defaults
+WARMUP = 10
+MIN_TIME = 0.1
+REPEAT = 5
+
+
+def time_batch(call: Callable, count: int) -> int:
+    """Nanoseconds taken by count calls."""
+    start = time.perf_counter_ns()
+    for _ in repeat(None, count):
+        call()
+    return time.perf_counter_ns() - start
+
+def calibrate(call: Callable, min_time: float) -> int:
+    """Calls per batch: the first of 1, 2, 5, 10, 20, 50, ... taking min_time or more."""
+    target = min_time * 1e9
+    scale = 1
+    while True:
+        for count in (scale, 2 * scale, 5 * scale):
+            if time_batch(call, count) >= target:
+                return count
+        scale *= 10
+
+def percentile(ordered: list, fraction: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return ordered[max(1, math.ceil(len(ordered) * fraction)) - 1]
+
+def bench(call: Callable, warmup: int = WARMUP, min_time: float = MIN_TIME,
+          repetitions: int = REPEAT, iterations: int = None) -> Dict[str, float]:
+    """Time call(); returns per-call seconds (min, median, p95, mean) and ops/sec.
+    
+    iterations fixes the calls per batch instead of calibrating it.
+    """
+    if repetitions < 1:
+        raise PyPPRuntimeError("bench() needs at least 1 repetition")
+    if iterations is not None and iterations < 1:
+        raise PyPPRuntimeError("bench() needs at least 1 iteration")
+    for _ in repeat(None, warmup):
+        call()
+    count = iterations or calibrate(call, min_time)
+    per_call = sorted(time_batch(call, count) / count / 1e9 for _ in range(repetitions))
+    median = statistics.median(per_call)
+    return {
+        'iterations': count,
+        'repetitions': repetitions,
+        'min': per_call[0],
+        'median': median,
+        'p95': percentile(per_call, 0.95),
+        'mean': statistics.fmean(per_call),
+        'opsPerSec': 1 / median if median > 0 else float('inf'),
+    }
@@ -1,11 +1,16 @@
 """Tests for advanced features."""
 
+import gc
+import pickle
 import unittest
 import sys
-sys.path.insert(0, 'src')
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from advanced import PyPPArray, PyPPObject, PyPPSet, AdvancedMath, StringUtils
-from errors import RuntimeError as PyPPRuntimeError
+from array import array
+from src import advanced
+from src.advanced import PyPPArray, PyPPRange, PyPPIter, ArrayView, StrView, PyPPObject, Shape, PyPPSet, PyPPTable, Memoized, AdvancedMath, ArrayMath, StringUtils
+from src.errors import RuntimeError as PyPPRuntimeError
 
 
 class TestPyPPArray(unittest.TestCase):
@@ -29,6 +34,32 @@ class TestPyPPArray(unittest.TestCase):
         val = arr.shift()
         self.assertEqual(val, 1)
     
+    def test_queue_operations(self):
+        arr = PyPPArray()
+        for i in range(100):
+            arr.push(i)
+        for i in range(60):
+            self.assertEqual(arr.shift(), i)
+        self.assertEqual(arr.length(), 40)
+        self.assertEqual(arr.get(0), 60)
+        arr.set(1, -1)
+        self.assertEqual(arr.slice(0, 3).join(","), "60,-1,62")
+        for i in range(40):
+            arr.shift()
+        self.assertRaises(PyPPRuntimeError, arr.shift)
+    
+    def test_repeated_unshift(self):
+        arr = PyPPArray([1.5])
+        for i in range(50):
+            arr.unshift(float(i))
+        self.assertEqual(arr.length(), 51)
+        self.assertEqual(arr.get(0), 49.0)
+        self.assertEqual(arr.items.typecode, 'd')
+        arr.unshift("front")
+        self.assertEqual(arr.get(0), "front")
+        self.assertEqual(arr.get(51), 1.5)
+        self.assertEqual(arr.pop(), 1.5)
+    
     def test_reverse(self):
         arr = PyPPArray([1, 2, 3, 4])
         arr.reverse()
@@ -61,6 +92,37 @@ class TestPyPPArray(unittest.TestCase):
         arr = PyPPArray(["a", "b", "c"])
         result = arr.join(",")
         self.assertEqual(result, "a,b,c")
+    
+    def test_compact_storage(self):
+        self.assertEqual(PyPPArray([1, 2, 3]).items.typecode, 'q')
+        self.assertEqual(PyPPArray([1.5, 2.5]).items.typecode, 'd')
+        self.assertIsInstance(PyPPArray([1, 2.5]).items, list)
+        self.assertIsInstance(PyPPArray([True, False]).items, list)
+        self.assertIsInstance(PyPPArray([2 ** 70]).items, list)
+    
+    def test_compact_fallback_on_push(self):
+        arr = PyPPArray([3, 1, 2])
+        arr.push(4)
+        self.assertIsInstance(arr.items, array)
+        arr.push("x")
+        self.assertIsInstance(arr.items, list)
+        self.assertEqual(arr.join(","), "3,1,2,4,x")
+    
+    def test_compact_fallback_on_set(self):
+        arr = PyPPArray([1, 2, 3])
+        arr.set(0, 2 ** 64)
+        self.assertIsInstance(arr.items, list)
+        self.assertEqual(arr.get(0), 2 ** 64)
+        arr = PyPPArray([1.0, 2.0])
+        arr.set(1, 2)
+        self.assertEqual(type(arr.get(1)), int)
+    
+    def test_compact_sort_and_slice(self):
+        arr = PyPPArray([3, 1, 2])
+        arr.sort()
+        self.assertEqual(arr.items.typecode, 'q')
+        self.assertEqual(str(arr), "[1, 2, 3]")
+        self.assertEqual(arr.slice(1, 3).items.typecode, 'q')
 
 
 class TestPyPPObject(unittest.TestCase):
@@ -101,6 +163,54 @@ class TestPyPPObject(unittest.TestCase):
         self.assertEqual(merged.get("a"), 1)
         self.assertEqual(merged.get("b"), 3)  # obj2 overrides
         self.assertEqual(merged.get("c"), 4)
+    
+    def test_shared_shape(self):
+        obj1 = PyPPObject({"a": 1, "b": 2})
+        obj2 = PyPPObject()
+        obj2.set("a", 3)
+        obj2.set("b", 4)
+        self.assertIs(obj1.shape, obj2.shape)
+        self.assertIsNot(PyPPObject({"b": 1, "a": 2}).shape, obj1.shape)
+        obj2.set("a", 5)
+        self.assertEqual(obj2.properties, {"a": 5, "b": 4})
+    
+    def test_delete_keeps_order(self):
+        obj = PyPPObject({"a": 1, "b": 2, "c": 3})
+        obj.delete("b")
+        obj.set("b", 4)
+        self.assertEqual(obj.keys(), ["a", "c", "b"])
+        self.assertIs(obj.shape, Shape.for_keys(["a", "c", "b"]))
+        self.assertFalse(obj.delete("z"))
+    
+    def test_dictionary_mode(self):
+        obj = PyPPObject()
+        for i in range(PyPPObject.MAX_SHAPE_KEYS + 1):
+            obj.set(f"k{i}", i)
+        self.assertIsNone(obj.shape)
+        self.assertEqual(obj.get("k0"), 0)
+        self.assertEqual(len(obj.keys()), PyPPObject.MAX_SHAPE_KEYS + 1)
+        obj.delete("k0")
+        self.assertIsNotNone(obj.shape)
+        self.assertEqual(obj.keys()[0], "k1")
+    
+    def test_pickle_round_trip(self):
+        obj = PyPPObject({"a": 1, "b": PyPPObject({"c": [2]})})
+        copy = pickle.loads(pickle.dumps(obj))
+        self.assertEqual(copy.keys(), ["a", "b"])
+        self.assertIs(copy.shape, obj.shape)
+        self.assertEqual(copy.get("b").get("c"), [2])
+        table = pickle.loads(pickle.dumps(PyPPTable({"x": PyPPArray([1, 2])})))
+        self.assertIsInstance(table, PyPPTable)
+        self.assertEqual(table.get("x").items.tolist(), [1, 2])
+    
+    def test_unused_shapes_are_freed(self):
+        shape = Shape.for_keys(["only", "here"]).parent
+        self.assertNotIn("here", shape.transitions)
+        obj = PyPPObject({"only": 1, "here": 2})
+        self.assertIn("here", shape.transitions)
+        del obj
+        gc.collect()
+        self.assertNotIn("here", shape.transitions)
 
 
 class TestPyPPSet(unittest.TestCase):
@@ -175,6 +285,295 @@ class TestAdvancedMath(unittest.TestCase):
         self.assertEqual(AdvancedMath.lcm(100, 50), 100)
 
 
+class TestLazyArrays(unittest.TestCase):
+    """Test lazy ranges and fused pipelines."""
+    
+    def test_range_reads_without_storage(self):
+        r = PyPPRange(range(10 ** 12))
+        self.assertEqual(r.length(), 10 ** 12)
+        self.assertEqual(r.get(123456789), 123456789)
+        self.assertTrue(r.includes(10 ** 12 - 1))
+        self.assertEqual(r.indexOf(42), 42)
+        self.assertIsInstance(r.slice(5, 8), PyPPRange)
+        self.assertEqual(ArrayMath.sum(r.take(101)), 5050)
+        self.assertTrue(r.lazy)
+    
+    def test_range_mutation_materializes(self):
+        r = PyPPRange(range(5))
+        self.assertEqual(r.shift(), 0)
+        self.assertEqual(r.pop(), 4)
+        self.assertTrue(r.lazy)
+        r.push(7)
+        self.assertFalse(r.lazy)
+        self.assertEqual(r.items.typecode, 'q')
+        self.assertEqual(str(r), "[1, 2, 3, 7]")
+    
+    def test_pipeline_is_fused(self):
+        calls = []
+        
+        def square(x):
+            calls.append(x)
+            return x * x
+        
+        p = PyPPRange(range(10 ** 9)).map(square).filter(lambda x: x % 2).take(3)
+        self.assertIsInstance(p, PyPPIter)
+        self.assertEqual(len(p.stages), 3)
+        self.assertEqual(calls, [])
+        self.assertEqual(p.join(","), "1,9,25")
+        self.assertEqual(calls, [0, 1, 2, 3, 4, 5])
+    
+    def test_pipeline_streams_and_materializes(self):
+        p = PyPPRange(range(1, 5)).map(lambda x: x * 0.5)
+        self.assertEqual(ArrayMath.sum(p), 5.0)
+        self.assertEqual(ArrayMath.mean(p), 1.25)
+        self.assertTrue(p.includes(1.5))
+        self.assertTrue(p.lazy)
+        self.assertEqual(p.get(3), 2.0)
+        self.assertFalse(p.lazy)
+        self.assertEqual(p.items.typecode, 'd')
+        p.push("x")
+        self.assertEqual(str(p), "[0.5, 1.0, 1.5, 2.0, x]")
+
+
+class TestViews(unittest.TestCase):
+    """Test zero-copy array and string slices."""
+    
+    def test_array_view_shares_storage(self):
+        arr = PyPPArray(list(range(1000)))
+        view = arr.slice(100, 900)
+        self.assertIsInstance(view, ArrayView)
+        self.assertTrue(view.lazy)
+        self.assertEqual(view.length(), 800)
+        self.assertEqual(view.get(0), 100)
+        self.assertEqual(view.indexOf(150), 50)
+        self.assertTrue(view.includes(899))
+        inner = view.slice(-100, -1)
+        self.assertEqual(inner.get(0), 800)
+        self.assertTrue(view.lazy and inner.lazy)
+        self.assertIsInstance(arr.slice(0, 3).items, array)
+    
+    def test_array_view_copy_on_write(self):
+        arr = PyPPArray(list(range(1000)))
+        view = arr.slice(0, 500)
+        view.set(0, -1)
+        self.assertFalse(view.lazy)
+        self.assertEqual(arr.get(0), 0)
+        
+        other = arr.slice(0, 500)
+        inner = other.slice(10, 100)
+        arr.set(10, "x")
+        arr.shift()
+        self.assertFalse(other.lazy or inner.lazy)
+        self.assertEqual(other.get(10), 10)
+        self.assertEqual(inner.get(0), 10)
+        self.assertEqual(other.items.typecode, 'q')
+    
+    def test_str_view(self):
+        text = "ab" * 1000
+        view = StringUtils.substring(text, 10, 1010)
+        self.assertIsInstance(view, StrView)
+        self.assertEqual(len(view), 1000)
+        self.assertEqual(view, text[10:1010])
+        self.assertEqual(hash(view), hash(text[10:1010]))
+        self.assertEqual(view.find("ba"), 1)
+        self.assertTrue(view.startswith("abab"))
+        self.assertEqual("<" + view[0:2], "<ab")
+        inner = StringUtils.substring(view, 500)
+        self.assertEqual((inner.start, inner.stop), (510, 1010))
+        self.assertEqual(StringUtils.substring(view, 2, 4), "ab")
+        self.assertEqual({text[10:1010]: 1}[view], 1)
+
+
+class TestArrayMath(unittest.TestCase):
+    """Test bulk numeric array operations."""
+    
+    def check_both_paths(self, fn):
+        """Run fn with and without NumPy and require identical results."""
+        results = [fn()]
+        if advanced.np is not None:
+            saved, advanced.np = advanced.np, None
+            try:
+                results.append(fn())
+            finally:
+                advanced.np = saved
+        for result in results[1:]:
+            self.assertEqual(str(result), str(results[0]))
+        return results[0]
+    
+    def test_sum_mean(self):
+        self.assertEqual(ArrayMath.sum(PyPPArray([1, 2, 3])), 6)
+        self.assertEqual(ArrayMath.sum(PyPPArray([0.1] * 10)), 1.0)
+        self.assertEqual(ArrayMath.mean(PyPPArray([1, 2, 3, 4])), 2.5)
+        self.assertRaises(PyPPRuntimeError, ArrayMath.mean, PyPPArray())
+    
+    def test_dot(self):
+        self.assertEqual(ArrayMath.dot(PyPPArray([1, 2, 3]), PyPPArray([4, 5, 6])), 32)
+        result = self.check_both_paths(
+            lambda: ArrayMath.dot(PyPPArray([0.5, 1.5]), PyPPArray([2.0, 4.0])))
+        self.assertEqual(result, 7.0)
+        self.assertRaises(PyPPRuntimeError, ArrayMath.dot, PyPPArray([1]), PyPPArray([1, 2]))
+    
+    def test_elementwise(self):
+        a = PyPPArray([1.5, 2.5, 3.5])
+        b = PyPPArray([0.5, 0.5, 0.5])
+        self.assertEqual(str(self.check_both_paths(lambda: ArrayMath.add(a, b))), "[2.0, 3.0, 4.0]")
+        self.assertEqual(str(self.check_both_paths(lambda: ArrayMath.mul(a, 2))), "[3.0, 5.0, 7.0]")
+        ints = ArrayMath.add(PyPPArray([1, 2]), 1)
+        self.assertEqual(ints.items.typecode, 'q')
+        self.assertIsInstance(ArrayMath.mul(PyPPArray([2 ** 62]), 4).items, list)
+    
+    def test_cumsum_argmax(self):
+        self.assertEqual(str(ArrayMath.cumsum(PyPPArray([1, 2, 3]))), "[1, 3, 6]")
+        result = self.check_both_paths(lambda: ArrayMath.cumsum(PyPPArray([0.1, 0.2, 0.3])))
+        self.assertEqual(result.get(2), 0.1 + 0.2 + 0.3)
+        self.assertEqual(ArrayMath.argmax(PyPPArray([3, 9, 2, 9])), 1)
+    
+    def test_unary(self):
+        self.assertEqual(str(self.check_both_paths(lambda: ArrayMath.sqrt(PyPPArray([4, 9])))), "[2.0, 3.0]")
+        self.assertEqual(ArrayMath.log(PyPPArray([100.0])).get(0), 2.0)
+        self.assertEqual(ArrayMath.exp(PyPPArray([0])).get(0), 1.0)
+        self.assertRaises(PyPPRuntimeError, ArrayMath.sqrt, PyPPArray([-1.0]))
+    
+    def test_requires_numbers(self):
+        from src.errors import TypeError as PyPPTypeError
+        self.assertRaises(PyPPTypeError, ArrayMath.sum, PyPPArray(["a"]))
+        self.assertRaises(PyPPTypeError, ArrayMath.sum, 5)
+
+
+class TestPyPPTable(unittest.TestCase):
+    """Test column tables, filters, sorts and group-by."""
+    
+    def make_table(self):
+        return PyPPTable({
+            'city': PyPPArray(["b", "a", "b", "c", "a"]),
+            'qty': PyPPArray([3, 1, 4, 1, 5]),
+            'price': PyPPArray([2.5, 1.0, 0.5, 4.0, 1.5]),
+        })
+    
+    def check_both_paths(self, fn):
+        """Run fn with and without NumPy and require identical tables."""
+        results = [fn()]
+        if advanced.np is not None:
+            saved, advanced.np = advanced.np, None
+            try:
+                results.append(fn())
+            finally:
+                advanced.np = saved
+        for result in results[1:]:
+            self.assertEqual(result.properties.keys(), results[0].properties.keys())
+            for name in result.keys():
+                self.assertEqual(list(result.get(name)), list(results[0].get(name)))
+        return results[0]
+    
+    def test_columns(self):
+        from src.errors import TypeError as PyPPTypeError
+        table = self.make_table()
+        self.assertEqual(table.rows(), 5)
+        self.assertEqual(table.schema(), {'city': 'string', 'qty': 'int', 'price': 'float'})
+        self.assertRaises(PyPPRuntimeError, PyPPTable, {'a': PyPPArray([1]), 'b': PyPPArray([1, 2])})
+        self.assertRaises(PyPPTypeError, PyPPTable, {'a': [1]})
+        self.assertRaises(PyPPRuntimeError, table.storage, 'missing')
+        self.assertEqual(table.select(['price', 'city']).keys(), ['price', 'city'])
+    
+    def test_where(self):
+        table = self.make_table()
+        cheap = self.check_both_paths(lambda: table.where('price', '<', 2.0))
+        self.assertEqual(list(cheap.get('qty')), [1, 4, 5])
+        self.assertEqual(cheap.get('qty').items.typecode, 'q')
+        self.assertEqual(list(table.where('city', '==', 'a').get('qty')), [1, 5])
+        self.assertEqual(list(table.where('qty', '>', 3.5).get('city')), ['b', 'a'])
+        self.assertEqual(list(table.where_values('city', lambda c: c != 'b').get('qty')), [1, 1, 5])
+        big = table.where_rows(lambda row: row.get('qty') * row.get('price') > 2)
+        self.assertEqual(list(big.get('city')), ['b', 'c', 'a'])
+        self.assertRaises(PyPPRuntimeError, table.where, 'qty', '=~', 1)
+    
+    def test_sort_by_is_stable(self):
+        table = self.make_table()
+        up = self.check_both_paths(lambda: table.sort_by('qty'))
+        self.assertEqual(list(up.get('city')), ['a', 'c', 'b', 'b', 'a'])
+        down = self.check_both_paths(lambda: table.sort_by('qty', descending=True))
+        self.assertEqual(list(down.get('qty')), [5, 4, 3, 1, 1])
+        self.assertEqual(list(down.get('city')), ['a', 'b', 'b', 'a', 'c'])
+        self.assertEqual(list(table.sort_by('city').get('qty')), [1, 5, 3, 4, 1])
+    
+    def test_group_by_agg(self):
+        groups = self.make_table().group_by('city')
+        self.assertEqual(groups.keys, ['b', 'a', 'c'])
+        report = groups.agg([('qty', 'sum'), ('price', 'mean'), ('qty', 'count'),
+                             ('price', 'min'), ('qty', 'max')])
+        self.assertEqual(report.keys(), ['city', 'qty_sum', 'price_mean', 'qty_count', 'price_min', 'qty_max'])
+        self.assertEqual(list(report.get('qty_sum')), [7, 6, 1])
+        self.assertEqual(list(report.get('price_mean')), [1.5, 1.25, 4.0])
+        self.assertEqual(list(report.get('qty_count')), [2, 2, 1])
+        self.assertEqual(list(report.get('price_min')), [0.5, 1.0, 4.0])
+        self.assertEqual(report.get('qty_max').items.typecode, 'q')
+        self.assertEqual(list(PyPPTable({'g': PyPPArray([0] * 10), 'x': PyPPArray([0.1] * 10)})
+                              .group_by('g').agg([('x', 'sum')]).get('x_sum')), [1.0])
+        self.assertRaises(PyPPRuntimeError, groups.agg, [('qty', 'median')])
+    
+    def test_builtins(self):
+        import io
+        from contextlib import redirect_stdout
+        from interpreter import interpret
+        code = """
+        let t = table(parse("{\\"city\\": [\\"b\\", \\"a\\", \\"b\\"], \\"qty\\": [3, 1, 4]}"));
+        let report = sortBy(agg(groupBy(where(t, "qty", ">=", 1), "city"), "qty", "sum"), "qty_sum", true);
+        print(type(t), len(t), get(schema(t), "qty"));
+        print(get(report, "city"), get(report, "qty_sum"));
+        """
+        f = io.StringIO()
+        with redirect_stdout(f):
+            interpret(code)
+        self.assertEqual(f.getvalue().splitlines(), ["table 3 int", "[b, a] [7, 1]"])
+
+
+class TestMemoized(unittest.TestCase):
+    """Test the memoizing decorator."""
+    
+    def test_caches_by_value(self):
+        calls = []
+        square = Memoized(lambda x: calls.append(x) or x * x)
+        assert [square(3), square(3), square(4)] == [9, 9, 16]
+        assert calls == [3, 4]
+        total = Memoized(lambda arr: calls.append(arr) or ArrayMath.sum(arr))
+        assert total(PyPPArray([1, 2])) == total(PyPPArray([1, 2])) == 3
+        total(PyPPArray([5]))
+        assert total.info()['hits'] == 1 and total.info()['misses'] == 2
+        from src.errors import TypeError as PyPPTypeError
+        self.assertRaises(PyPPTypeError, total, [1])
+    
+    def test_lru_eviction(self):
+        ident = Memoized(lambda x: x, maxsize=2)
+        ident(1)
+        ident(2)
+        ident(1)
+        ident(3)
+        assert list(ident.cache) == [(1,), (3,)]
+        assert ident.info() == {'hits': 1, 'misses': 3, 'evictions': 1, 'size': 2, 'maxsize': 2, 'ttl': None}
+        unbounded = Memoized(lambda x: x, maxsize=None)
+        for i in range(500):
+            unbounded(i)
+        assert unbounded.info()['size'] == 500
+        off = Memoized(lambda x: x, maxsize=0)
+        off(1)
+        assert off.info()['size'] == 0
+        self.assertRaises(PyPPRuntimeError, Memoized, abs, -1)
+    
+    def test_ttl(self):
+        now = [100.0]
+        saved = advanced.time.monotonic
+        advanced.time.monotonic = lambda: now[0]
+        try:
+            calls = []
+            stamp = Memoized(lambda x: calls.append(x) or len(calls), ttl=10)
+            assert stamp("a") == stamp("a") == 1
+            now[0] += 11
+            assert stamp("a") == 2
+        finally:
+            advanced.time.monotonic = saved
+        self.assertRaises(PyPPRuntimeError, Memoized, abs, 8, 0)
+
+
 class TestStringUtils(unittest.TestCase):
     """Test string utilities."""
     
@@ -0,0 +1,61 @@
+"""Tests for async functions and the awaitable builtins."""
+
+import unittest
+import sys
+import os
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interpreter import interpret
+from src.advanced import PyPPArray
+from src.errors import RuntimeError as PyPPRuntimeError, TypeError as PyPPTypeError
+
+class TestAsync(unittest.TestCase):
+    
+    def test_waits_overlap(self):
+        code = """
+        async fn wait(i) {
+            await sleepAsync(0.2);
+            return i;
+        }
+        let tasks = array();
+        for (let i = 0; i < 50; i = i + 1) {
+            push(tasks, wait(i));
+        }
+        await gather(tasks);
+        """
+        start = time.perf_counter()
+        result = interpret(code)
+        elapsed = time.perf_counter() - start
+        self.assertIsInstance(result, PyPPArray)
+        self.assertEqual(list(result), list(range(50)))
+        self.assertLess(elapsed, 2)
+    
+    def test_file_and_process(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'a.txt')
+            with open(path, 'w') as f:
+                f.write("hello")
+            code = f"""
+            let texts = await gather(readTextAsync("{path}"), readTextAsync("{path}"));
+            let run = await execAsync(array("{sys.executable}", "-c", "import sys; print(sys.stdin.read().upper())"), get(texts, 0));
+            get(run, "stdout");
+            """
+            self.assertEqual(interpret(code).strip(), "HELLO")
+            self.assertEqual(bytes(interpret(f'await readBytesAsync("{path}");')), b"hello")
+    
+    def test_errors(self):
+        with self.assertRaises(PyPPRuntimeError):
+            interpret('async fn f() { await sleepAsync(0); return missing; } await gather(f());')
+        with self.assertRaises(PyPPTypeError):
+            interpret('await gather(1);')
+        with self.assertRaises(PyPPTypeError):
+            interpret('await sleepAsync("1");')
+        with self.assertRaises(PyPPRuntimeError):
+            interpret('await execAsync(array("/nonexistent/program"));')
+        with self.assertRaises(PyPPTypeError):
+            interpret('async fn f(x) { return x; } pmap(f, range(3));')
+
+if __name__ == '__main__':
+    unittest.main()
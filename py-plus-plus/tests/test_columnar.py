@@ -0,0 +1,89 @@
+"""Tests for the columnar CSV reader."""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from array import array
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import columnar
+from src.advanced import PyPPIter, PyPPTable
+from src.builtins_advanced import builtin_read_csv, builtin_json_parse
+from src.errors import RuntimeError as PyPPRuntimeError, TypeError as PyPPTypeError
+
+class TestReadCsv(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'data.csv')
+        self.write("id,price,name,zip\n1,2.5,a,007\n2,3,b,010\n3,4.25,\"c,d\",100\n")
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+    
+    def write(self, text):
+        with open(self.path, 'w') as f:
+            f.write(text)
+    
+    def test_typed_columns(self):
+        table = builtin_read_csv(self.path)
+        assert isinstance(table, PyPPTable)
+        assert table.keys() == ['id', 'price', 'name', 'zip']
+        ids = table.get('id')
+        assert type(ids.items) is array and ids.items.typecode == 'q'
+        assert table.get('price').items == array('d', [2.5, 3.0, 4.25])
+        assert table.get('name').items == ['a', 'b', 'c,d']
+        assert table.get('zip').items.tolist() == [7, 10, 100]
+    
+    def test_options(self):
+        options = builtin_json_parse('{"types": {"zip": "string"}}')
+        assert builtin_read_csv(self.path, options).get('zip').items == ['007', '010', '100']
+        self.write("1;x\n2;y\n")
+        table = builtin_read_csv(self.path, builtin_json_parse('{"header": false, "delimiter": ";"}'))
+        assert table.keys() == ['c0', 'c1']
+        with self.assertRaises(PyPPTypeError):
+            builtin_read_csv(self.path, builtin_json_parse('{"header": false, "delimiter": ";", "types": {"c1": "int"}}'))
+    
+    def test_kinds_widen_across_batches(self):
+        self.write("a,b\n1,1\n2,2\n3.5,x\n")
+        names, kinds, columns = columnar.CsvFile(self.path, batch_rows=2).read()
+        assert kinds == ['float', 'string']
+        assert columns[0] == array('d', [1, 2, 3.5])
+        assert columns[1] == ['1', '2', 'x']
+    
+    def test_strings_keep_their_text_whatever_the_batch_size(self):
+        self.write("zip,n\n01234,1\n00500,2\nA1,3.50\n")
+        for batch_rows in (1, 2, 3):
+            names, kinds, columns = columnar.CsvFile(self.path, batch_rows=batch_rows).read()
+            assert kinds == ['string', 'float']
+            assert columns[0] == ['01234', '00500', 'A1']
+            assert columns[1] == array('d', [1, 2, 3.5])
+    
+    def test_blank_lines_are_skipped(self):
+        self.write("a,b\n1,2\n\n3,4\n\n")
+        table = builtin_read_csv(self.path, builtin_json_parse('{"chunkSize": 1}'))
+        assert [chunk.get('a').items.tolist() for chunk in table] == [[1], [3]]
+        assert builtin_read_csv(self.path).get('b').items.tolist() == [2, 4]
+        self.write("a,b\n\n1,2\n\n3\n")
+        with self.assertRaisesRegex(PyPPRuntimeError, "line 5"):
+            builtin_read_csv(self.path)
+    
+    def test_chunks(self):
+        chunks = builtin_read_csv(self.path, builtin_json_parse('{"chunkSize": 2}'))
+        assert isinstance(chunks, PyPPIter) and chunks.lazy
+        sizes = [chunk.get('id').length() for chunk in chunks]
+        assert sizes == [2, 1]
+        assert chunks.get(1).get('name').items == ['c,d']
+    
+    def test_ragged_rows_and_empty_files(self):
+        self.write("a,b\n1,2\n3\n")
+        with self.assertRaisesRegex(PyPPRuntimeError, "line 3"):
+            builtin_read_csv(self.path)
+        self.write("a,b\n")
+        table = builtin_read_csv(self.path)
+        assert table.keys() == ['a', 'b'] and table.get('a').length() == 0
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,9 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from interpreter import interpret
+from src.lexer import Lexer
+from src.parser import Parser
+from src.evaluator import Evaluator
 
 class TestEvaluator(unittest.TestCase):
     
@@ -72,6 +75,198 @@ class TestEvaluator(unittest.TestCase):
         assert "0" in output
         assert "1" in output
         assert "2" in output
+    
+    def test_builtins_layer(self):
+        from src.evaluator import Evaluator
+        evaluator = Evaluator()
+        assert evaluator.globals == {}
+        assert evaluator.get_variable('len') is Evaluator.builtins['len']
+        
+        code = """
+        fn len(x) { return 42; }
+        print(len("abc"));
+        """
+        import io
+        from contextlib import redirect_stdout
+        f = io.StringIO()
+        with redirect_stdout(f):
+            interpret(code)
+        assert "42" in f.getvalue()
+    
+    def test_array_math_builtins(self):
+        code = """
+        let xs = range(1, 5);
+        print(sum(xs), mean(xs), dot(xs, xs), argmax(xs));
+        print(add(xs, 1), mul(xs, xs), cumsum(xs));
+        let s = set(1);
+        add(s, 2);
+        print(size(s));
+        """
+        import io
+        from contextlib import redirect_stdout
+        f = io.StringIO()
+        with redirect_stdout(f):
+            interpret(code)
+        lines = f.getvalue().splitlines()
+        assert lines[0] == "10 2.5 30 3"
+        assert lines[1] == "[2, 3, 4, 5] [1, 4, 9, 16] [1, 3, 6, 10]"
+        assert lines[2] == "2"
+    
+    def test_higher_order_builtins(self):
+        code = """
+        fn double(x) { let y = x * 2; return y; }
+        fn odd(x) { return x % 2; }
+        fn plus(a, b) { return a + b; }
+        fn neg(x) { return -x; }
+        let xs = array(3, 1, 2);
+        print(map(xs, double), filter(xs, odd), reduce(xs, plus), reduce(xs, plus, 10));
+        forEach(xs, print);
+        sort(xs, neg);
+        print(xs);
+        """
+        import io
+        from contextlib import redirect_stdout
+        f = io.StringIO()
+        with redirect_stdout(f):
+            interpret(code)
+        lines = f.getvalue().splitlines()
+        assert lines[0] == "[6, 2, 4] [3, 1] 6 16"
+        assert lines[1:4] == ["3", "1", "2"]
+        assert lines[4] == "[3, 2, 1]"
+    
+    def test_callback_frame_is_reset(self):
+        code = """
+        fn make() {
+            let count = 0;
+            fn bump(x) { count = count + x; return count; }
+            return bump;
+        }
+        print(map(array(1, 2, 3), make()));
+        """
+        import io
+        from contextlib import redirect_stdout
+        f = io.StringIO()
+        with redirect_stdout(f):
+            interpret(code)
+        assert f.getvalue().strip() == "[1, 2, 3]"
+    
+    def test_lazy_range_pipeline(self):
+        code = """
+        fn sq(x) { return x * x; }
+        fn odd(x) { return x % 2; }
+        let big = range(1000000000);
+        let p = take(filter(map(big, sq), odd), 3);
+        print(len(big), get(big, 7), includes(big, 5), sum(big));
+        print(p, sum(p), len(p), typeof(p));
+        """
+        import io
+        from contextlib import redirect_stdout
+        f = io.StringIO()
+        with redirect_stdout(f):
+            interpret(code)
+        lines = f.getvalue().splitlines()
+        assert lines[0] == "1000000000 7 True 499999999500000000"
+        assert lines[1] == "[1, 9, 25] 35 3 array"
+    
+    def test_slice_views(self):
+        code = """
+        let text = repeat("key=value;", 100);
+        let rest = substring(text, 4);
+        let head = substring(rest, 0, 100);
+        print(len(rest), typeof(rest), startsWith(rest, "value"), indexOf(head, ";"));
+        print(head == substring(text, 4, 104), substring(head, 0, 5) + "!", isString(head));
+        let xs = range(0, 1000);
+        push(xs, 1000);
+        let ys = slice(xs, 500);
+        set(xs, 600, -1);
+        print(len(ys), get(ys, 100), includes(ys, -1), sum(ys));
+        """
+        import io
+        from contextlib import redirect_stdout
+        f = io.StringIO()
+        with redirect_stdout(f):
+            interpret(code)
+        lines = f.getvalue().splitlines()
+        assert lines[0] == "996 str True 5"
+        assert lines[1] == "True value! True"
+        assert lines[2] == "501 600 False 375750"
+    
+    def test_string_accumulation_in_loop(self):
+        code = """
+        let s = "";
+        let n = 0;
+        for (let i = 0; i < 4; i = i + 1) {
+            s = s + str(i);
+            n = n + i;
+            if (i == 1) { print(s); }
+        }
+        fn twice(x) {
+            let r = x;
+            let i = 0;
+            while (i < 2) { r = r + r; i = i + 1; }
+            return r;
+        }
+        print(s, n, typeof(s), twice("ab"));
+        let sb = builder("<");
+        append(sb, 1);
+        append(sb, ">");
+        print(toString(sb), len(sb));
+        """
+        import io
+        from contextlib import redirect_stdout
+        f = io.StringIO()
+        evaluator = Evaluator()
+        with redirect_stdout(f):
+            evaluator.eval(Parser(Lexer(code).tokenize()).parse())
+        assert f.getvalue().splitlines() == ["01", "0123 6 str abababab", "<1> 3"]
+        assert evaluator.globals['s'] == "0123"
+        assert evaluator.ropes == []
+    
+    def test_decorated_function(self):
+        code = """
+        fn twice(f) { return f; }
+        @memo
+        fn fib(n) {
+            if (n <= 1) { return n; }
+            return fib(n - 1) + fib(n - 2);
+        }
+        @twice @memo(2)
+        fn sq(x) { return x * x; }
+        print(fib(80), typeof(fib));
+        print(sq(3), sq(4), sq(5), sq(5), get(cacheInfo(sq), "evictions"));
+        """
+        import io
+        from contextlib import redirect_stdout
+        f = io.StringIO()
+        evaluator = Evaluator()
+        with redirect_stdout(f):
+            evaluator.eval(Parser(Lexer(code).tokenize()).parse())
+        assert f.getvalue().splitlines() == ["23416728348467685 function", "9 16 25 25 1"]
+        info = evaluator.globals['fib'].info()
+        assert (info['misses'], info['hits']) == (81, 78)
+    
+    def test_async_functions(self):
+        code = """
+        let g = 10;
+        async fn worker(name, n) {
+            let acc = "";
+            for (let i = 0; i < n; i = i + 1) {
+                await sleepAsync(0.01);
+                acc = acc + str(i + g);
+            }
+            return name + acc;
+        }
+        async fn outer() { return await worker("c", 1); }
+        let pending = worker("a", 3);
+        let results = await gather(pending, worker("b", 2), outer());
+        """
+        evaluator = Evaluator()
+        evaluator.eval(Parser(Lexer(code).tokenize()).parse())
+        assert list(evaluator.globals['results']) == ["a101112", "b1011", "c10"]
+        # Interleaved tasks leave no frames or Ropes behind
+        assert len(evaluator.locals_stack) == 1
+        assert evaluator.loop_depth == 0 and evaluator.ropes == []
+        assert interpret("fn f(x) { return x; } await f(await 3);") == 3
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,134 @@
+"""Tests for the Python FFI."""
+
+import unittest
+import sys
+import os
+import math
+import zlib
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.evaluator import Evaluator
+from src.module_loader import ModuleLoader
+from src.advanced import PyPPArray, PyPPObject
+from src.errors import RuntimeError as PyPPRuntimeError, TypeError as PyPPTypeError
+from src.ffi import ForeignModule, bind, from_python, to_python
+
+class TestForeignImport(unittest.TestCase):
+    
+    def run_code(self, code, loader=None):
+        ast = Parser(Lexer(code).tokenize()).parse()
+        evaluator = Evaluator()
+        evaluator.module_loader = loader or ModuleLoader()
+        evaluator.eval(ast)
+        return evaluator
+    
+    def test_untyped_calls_convert_values(self):
+        evaluator = self.run_code("""
+        import py "json" as json;
+        let s = json.dumps(array(1, 2, 3));
+        let o = json.loads("{\\"a\\": [1, 2]}");
+        """)
+        assert evaluator.get_variable('s') == '[1, 2, 3]'
+        o = evaluator.get_variable('o')
+        assert isinstance(o, PyPPObject)
+        assert isinstance(o.get('a'), PyPPArray)
+        assert isinstance(evaluator.get_variable('json'), ForeignModule)
+    
+    def test_declared_signature(self):
+        evaluator = self.run_code("""
+        import py "zlib" as z { crc32(bytes) -> int; compress(bytes) -> bytes; decompress(bytes) -> string; }
+        let c = z.crc32("hello");
+        let s = z.decompress(z.compress("round trip"));
+        """)
+        assert evaluator.get_variable('c') == zlib.crc32(b"hello")
+        assert evaluator.get_variable('s') == "round trip"
+    
+    def test_submodules_and_constants(self):
+        evaluator = self.run_code("""
+        import py "os" as os;
+        import py "math" as m;
+        let p = os.path.join("a", "b");
+        let pi = m.pi;
+        """)
+        assert evaluator.get_variable('p') == os.path.join("a", "b")
+        assert evaluator.get_variable('pi') == 3.141592653589793
+    
+    def test_callbacks_reach_python(self):
+        evaluator = self.run_code("""
+        import py "functools" as ft;
+        fn add(a, b) { return a + b; }
+        let total = ft.reduce(add, array(1, 2, 3));
+        """)
+        assert evaluator.get_variable('total') == 6
+    
+    def test_errors(self):
+        with self.assertRaises(PyPPRuntimeError):
+            self.run_code('import py "no_such_module_here" as x;')
+        with self.assertRaises(PyPPRuntimeError):
+            self.run_code('import py "zlib" as z { nope(int) -> int; }')
+        with self.assertRaises(PyPPTypeError):
+            self.run_code('import py "zlib" as z { crc32(blob) -> int; }')
+    
+    def test_wrong_arity_and_type_in_scripts(self):
+        loader = ModuleLoader()
+        prelude = 'import py "zlib" as z { crc32(bytes) -> int; } import py "math" as m { floor(float) -> int; } '
+        for call in ('z.crc32("abc", 1, 2);', 'z.crc32();', 'm.floor("x");', 'm.floor(1.5, 2);'):
+            with self.assertRaises(PyPPTypeError):
+                self.run_code(prelude + call, loader)
+    
+    def test_register_python(self):
+        loader = ModuleLoader()
+        loader.register_python('hashing', {'digest': lambda s: s.upper(), 'pair': lambda a, b: [a, b]},
+                               {'digest': (['string'], 'string')})
+        evaluator = self.run_code("import hashing; let d = digest(\"ab\"); let p = pair(1, 2);", loader)
+        assert evaluator.get_variable('d') == "AB"
+        assert isinstance(evaluator.get_variable('p'), PyPPArray)
+
+
+class TestBind(unittest.TestCase):
+    
+    def test_pass_through_signature_is_still_checked(self):
+        floor = bind(math.floor, ['float'], 'int', 'math.floor')
+        assert floor(2.5) == 2
+        with self.assertRaisesRegex(PyPPTypeError, "math.floor"):
+            floor("x")
+        with self.assertRaisesRegex(PyPPTypeError, "expects 1 args, got 2"):
+            floor(1.0, 2.0)
+    
+    def test_converters_chosen_once(self):
+        total = bind(sum, ['array'], 'int')
+        assert total(PyPPArray([1, 2, 3])) == 6
+        keys = bind(sorted, ['object'], 'array')
+        result = keys(PyPPObject({'b': 1, 'a': 2}))
+        assert isinstance(result, PyPPArray) and result.items == ['a', 'b']
+    
+    def test_arity_checked(self):
+        call = bind(max, ['int', 'int', 'any'], 'int')
+        assert call(1, 5, 3) == 5
+        with self.assertRaises(PyPPTypeError):
+            call(1, 2)
+    
+    def test_python_errors_become_pypp_errors(self):
+        evaluator = Evaluator()
+        evaluator.module_loader = ModuleLoader()
+        evaluator.eval(Parser(Lexer('import py "zlib" as z;').tokenize()).parse())
+        crc32 = evaluator.get_variable('z').member('crc32')
+        with self.assertRaisesRegex(PyPPTypeError, "zlib.crc32"):
+            crc32("abc")
+        keys = bind(sorted, ['object'], 'array')
+        with self.assertRaisesRegex(PyPPTypeError, "sorted"):
+            keys(PyPPArray([1]))
+        with self.assertRaisesRegex(PyPPRuntimeError, "int"):
+            bind(int, ['string'], 'int')("x")
+    
+    def test_round_trip(self):
+        value = PyPPObject({'a': PyPPArray([1, PyPPObject({'b': 2})])})
+        data = to_python(value)
+        assert data == {'a': [1, {'b': 2}]}
+        back = from_python(data)
+        assert back.get('a').get(1).get('b') == 2
+
+if __name__ == '__main__':
+    unittest.main()
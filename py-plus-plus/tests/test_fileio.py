@@ -0,0 +1,107 @@
+"""Tests for file I/O builtins."""
+
+import unittest
+import sys
+import os
+import io
+import mmap
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interpreter import interpret
+from src import fileio
+from src.advanced import PyPPArray, PyPPIter
+from src.builtins_advanced import (builtin_read_bytes, builtin_read_lines, builtin_write_lines,
+                                   builtin_array_slice, builtin_decode)
+from src.errors import RuntimeError as PyPPRuntimeError
+
+class TestFileIO(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'data.txt')
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+    
+    def write(self, data):
+        with open(self.path, 'wb') as f:
+            f.write(data)
+    
+    def test_lines_round_trip(self):
+        assert builtin_write_lines(self.path, PyPPArray(["a", 1, 2.5])) == 3
+        lines = builtin_read_lines(self.path)
+        assert isinstance(lines, PyPPIter) and lines.lazy
+        assert list(lines) == ["a", "1", "2.5"]
+        # Iterating again reads the file again
+        assert list(lines) == ["a", "1", "2.5"]
+    
+    def test_lines_across_buffers(self):
+        self.write(b"first line\r\nsecond\n\nlast without newline")
+        buffer_size = fileio.BUFFER_SIZE
+        fileio.BUFFER_SIZE = 4
+        try:
+            assert list(builtin_read_lines(self.path)) == ["first line", "second", "", "last without newline"]
+        finally:
+            fileio.BUFFER_SIZE = buffer_size
+    
+    def test_read_bytes(self):
+        self.write(b"hello world")
+        data = builtin_read_bytes(self.path)
+        assert isinstance(data, memoryview) and data.readonly
+        assert builtin_decode(builtin_array_slice(data, 6, 11)) == "world"
+    
+    def test_large_files_are_mapped(self):
+        self.write(b"0123456789" * 10)
+        threshold = fileio.MMAP_THRESHOLD
+        fileio.MMAP_THRESHOLD = 50
+        try:
+            data = builtin_read_bytes(self.path)
+        finally:
+            fileio.MMAP_THRESHOLD = threshold
+        assert isinstance(data.obj, mmap.mmap)
+        part = builtin_array_slice(data, 10, 20)
+        assert part.obj is data.obj
+        assert bytes(part) == b"0123456789"
+    
+    def test_large_text_is_decoded_from_a_mapping(self):
+        self.write("first line\r\nsecond\rthird, much longer than a buffer\n\ncaf\u00e9\nlast".encode())
+        expected = ["first line", "second", "third, much longer than a buffer", "", "caf\u00e9", "last"]
+        small = (list(builtin_read_lines(self.path)), fileio.read_text(self.path))
+        threshold, buffer_size = fileio.MMAP_THRESHOLD, fileio.BUFFER_SIZE
+        fileio.MMAP_THRESHOLD, fileio.BUFFER_SIZE = 10, 8
+        try:
+            with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                chunks = list(fileio.mapped_chunks(mapped))
+            large = (list(builtin_read_lines(self.path)), fileio.read_text(self.path))
+        finally:
+            fileio.MMAP_THRESHOLD, fileio.BUFFER_SIZE = threshold, buffer_size
+        assert len(chunks) > 1 and all(chunk.endswith('\n') for chunk in chunks[:-1])
+        assert large == small
+        assert large[0] == expected
+        assert large[1] == "\n".join(expected)
+    
+    def test_missing_file(self):
+        missing = os.path.join(self.tmpdir, 'missing.txt')
+        for read in (fileio.read_text, builtin_read_lines, builtin_read_bytes):
+            with self.assertRaises(PyPPRuntimeError):
+                read(missing)
+    
+    def test_builtins(self):
+        code = f"""
+        writeText("{self.path}", "a\\nbb\\n");
+        appendText("{self.path}", "ccc\\n");
+        print(readText("{self.path}") == "a\\nbb\\nccc\\n");
+        print(sum(map(readLines("{self.path}"), len)));
+        let b = readBytes("{self.path}");
+        print(type(b), len(b), get(b, 0));
+        """
+        f = io.StringIO()
+        with redirect_stdout(f):
+            interpret(code)
+        assert f.getvalue().split('\n')[:3] == ["True", "6", "bytes 9 97"]
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""Tests for JSON parsing, stringify and NDJSON streaming."""
+
+import unittest
+import sys
+import os
+import io
+import json
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interpreter import interpret
+from src.advanced import PyPPArray, PyPPObject, PyPPSet
+from src.builtins_advanced import builtin_json_parse, builtin_json_stringify
+from src.errors import TypeError as PyPPTypeError
+from src.jsonio import JsonObject, NdjsonFile, dump, write_ndjson
+
+class TestLazyJson(unittest.TestCase):
+    
+    def test_nested_values_convert_on_access(self):
+        obj = builtin_json_parse('{"a": {"b": [1, {"c": 2}]}, "n": 3}')
+        assert isinstance(obj, JsonObject)
+        assert type(obj.raw()['a']) is dict
+        inner = obj.get('a')
+        assert isinstance(inner, PyPPObject)
+        assert obj.raw() is None
+        # Only the level that was touched is wrapped
+        assert type(inner.raw()['b']) is list
+        array = inner.get('b')
+        assert isinstance(array, PyPPArray)
+        assert array.get(1).get('c') == 2
+        assert obj.get('n') == 3
+    
+    def test_records_share_a_shape_once_touched(self):
+        first = builtin_json_parse('{"id": 1, "name": "a"}')
+        second = builtin_json_parse('{"id": 2, "name": "b"}')
+        assert first.get('id') == 1 and second.get('name') == "b"
+        assert first.shape is not None and first.shape is second.shape
+        assert first.shape is PyPPObject({'id': 0, 'name': ''}).shape
+        wide = builtin_json_parse(json.dumps({f"k{i}": i for i in range(PyPPObject.MAX_SHAPE_KEYS + 1)}))
+        assert wide.get('k0') == 0 and wide.shape is None
+    
+    def test_wrapped_values_behave_like_arrays_and_objects(self):
+        obj = builtin_json_parse('{"xs": [3, 1, 2], "o": {"k": 1}}')
+        xs = obj.get('xs')
+        xs.push(0)
+        xs.sort()
+        assert xs.items == [0, 1, 2, 3]
+        o = obj.get('o')
+        o.set('m', 2)
+        assert o.delete('k')
+        assert o.properties == {'m': 2}
+        assert str(obj) == "{xs: [0, 1, 2, 3], o: {m: 2}}"
+    
+    def test_stringify(self):
+        value = PyPPObject({'a': PyPPArray([1, 2.5]), 's': PyPPSet([1]), 'o': PyPPObject({'k': None})})
+        assert json.loads(builtin_json_stringify(value)) == {'a': [1, 2.5], 's': [1], 'o': {'k': None}}
+        text = '{"a": [1, {"b": 2}], "c": "x"}'
+        assert builtin_json_stringify(builtin_json_parse(text)) == text
+        with self.assertRaises(PyPPTypeError):
+            builtin_json_stringify(PyPPArray([object()]))
+    
+    def test_dump_streams_chunks(self):
+        out = io.StringIO()
+        dump(PyPPArray(list(range(5))), out)
+        assert out.getvalue() == "[0, 1, 2, 3, 4]"
+
+
+class TestNdjson(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'rows.ndjson')
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+    
+    def test_round_trip(self):
+        rows = [PyPPObject({'id': i, 'tags': PyPPArray(['a'])}) for i in range(3)]
+        assert write_ndjson(self.path, rows) == 3
+        with open(self.path, 'a') as f:
+            f.write('\n')
+        records = list(NdjsonFile(self.path))
+        assert [r.get('id') for r in records] == [0, 1, 2]
+        assert records[0].get('tags').items == ['a']
+    
+    def test_builtins_stream_records(self):
+        code = f"""
+        fn row(i) {{ return parse(stringify(array(i, i * 10))); }}
+        writeNdjson("{self.path}", map(range(0, 100), row));
+        fn second(r) {{ return get(r, 1); }}
+        let rows = readNdjson("{self.path}");
+        print(sum(map(rows, second)));
+        print(take(rows, 2));
+        """
+        f = io.StringIO()
+        with redirect_stdout(f):
+            interpret(code)
+        assert f.getvalue().split('\n')[:2] == ["49500", "[[0, 0], [1, 10]]"]
+    
+    def test_write_json_takes_the_path_first(self):
+        code = f"""
+        writeJson("{self.path}", parse("{{\\"a\\": [1, 2]}}"));
+        print(readText("{self.path}"));
+        """
+        f = io.StringIO()
+        with redirect_stdout(f):
+            interpret(code)
+        assert json.loads(f.getvalue()) == {'a': [1, 2]}
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,272 @@
+"""Tests for module loader."""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import types
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.evaluator import Evaluator, LazyExport
+from src.builtins_advanced import PyPPFunction, builtin_abs
+from src.module_loader import ModuleLoader
+from src.errors import NameError as PyPPNameError, TypeError as PyPPTypeError
+
+class TestModuleLoader(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.write_module('shapes', """
+        let loads = 1;
+        fn square(x) { return x * x; }
+        fn cube(x) { return x * x * x; }
+        """)
+        self.write_module('broken', "fn oops( {")
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+    
+    def write_module(self, name, source):
+        with open(os.path.join(self.tmpdir, name + '.pypp'), 'w') as f:
+            f.write(source)
+    
+    def run_code(self, code, lazy_imports=False):
+        ast = Parser(Lexer(code).tokenize()).parse()
+        evaluator = Evaluator(lazy_imports=lazy_imports)
+        evaluator.module_loader = ModuleLoader([self.tmpdir])
+        evaluator.eval(ast)
+        return evaluator
+    
+    def test_eager_import(self):
+        evaluator = self.run_code("import shapes; let y = square(4);")
+        assert evaluator.get_variable('y') == 16
+        assert 'shapes' in evaluator.module_loader.loaded_modules
+    
+    def test_exports_exclude_builtins(self):
+        loader = ModuleLoader([self.tmpdir])
+        exports = loader.load_module('shapes')
+        assert sorted(exports) == ['cube', 'loads', 'square']
+    
+    def test_scan_exports(self):
+        loader = ModuleLoader([self.tmpdir])
+        assert loader.scan_exports('shapes') == ['loads', 'square', 'cube']
+        assert 'shapes' not in loader.loaded_modules
+    
+    def test_lazy_import_defers_loading(self):
+        evaluator = self.run_code("import lazy shapes;")
+        assert 'shapes' not in evaluator.module_loader.loaded_modules
+        assert type(evaluator.globals['square']) is LazyExport
+    
+    def test_lazy_import_loads_on_first_use(self):
+        evaluator = self.run_code("import lazy shapes; let y = cube(2);")
+        assert evaluator.get_variable('y') == 8
+        assert 'shapes' in evaluator.module_loader.loaded_modules
+        # Every placeholder from the module is rebound after the first load
+        assert type(evaluator.globals['square']) is not LazyExport
+    
+    def test_lazy_import_of_module_using_python(self):
+        self.write_module('checksum', """
+        import py "zlib" as z { crc32(bytes) -> int; }
+        fn crc(s) { return z.crc32(s); }
+        """)
+        loader = ModuleLoader([self.tmpdir])
+        assert loader.scan_exports('checksum') == ['z', 'crc']
+        evaluator = self.run_code('import lazy checksum; let c = crc("abc");')
+        assert evaluator.get_variable('c') == 891568578
+    
+    def test_lazy_import_binds_what_an_eager_one_does(self):
+        # Neither y nor hidden is a top-level fn or let, so no placeholder covers them
+        self.write_module('extra', "let x = 1; y = 7; if (true) { let hidden = 5; }")
+        eager = self.run_code("import extra;")
+        assert eager.get_variable('hidden') == 5 and eager.get_variable('y') == 7
+        for code in ("import lazy extra; let h = hidden; let a = x;",
+                     "import lazy extra; let a = x; let h = hidden;"):
+            evaluator = self.run_code(code)
+            assert evaluator.get_variable('h') == 5 and evaluator.get_variable('a') == 1
+            assert evaluator.get_variable('y') == 7
+        evaluator = self.run_code("import lazy extra;")
+        with self.assertRaises(PyPPNameError):
+            evaluator.get_variable('nowhere')
+        assert 'extra' in evaluator.module_loader.loaded_modules
+    
+    def test_lazy_imports_flag(self):
+        evaluator = self.run_code("import broken; import shapes; let y = square(3);",
+                                  lazy_imports=True)
+        assert evaluator.get_variable('y') == 9
+        assert 'broken' not in evaluator.module_loader.loaded_modules
+
+
+class TestModuleReload(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.write_module('base', "fn rate() { return 2; }")
+        self.write_module('mid', "import base; fn scaled(x) { return x * rate(); }")
+        self.write_module('other', "fn other() { return 7; }")
+        code = "import mid; import other;"
+        self.evaluator = Evaluator()
+        self.loader = ModuleLoader([self.tmpdir])
+        self.evaluator.module_loader = self.loader
+        self.evaluator.eval(Parser(Lexer(code).tokenize()).parse())
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+    
+    def write_module(self, name, source):
+        path = os.path.join(self.tmpdir, name + '.pypp')
+        with open(path, 'w') as f:
+            f.write(source)
+        # Make sure the change is visible even on coarse mtime clocks
+        stamp = os.path.getmtime(path) + getattr(self, 'bump', 0)
+        os.utime(path, (stamp, stamp))
+        self.bump = getattr(self, 'bump', 0) + 10
+    
+    def call(self, name, *args):
+        return self.evaluator.call_function(self.evaluator.get_variable(name), list(args))
+    
+    def test_import_graph(self):
+        assert self.loader.dependents['base'] == {'mid'}
+        assert self.loader.imports['mid'] == {'base'}
+        assert self.loader.reload_order(['base']) == ['base', 'mid']
+    
+    def test_reload_rebinds_dependents(self):
+        assert self.call('scaled', 5) == 10
+        mid_ast = self.loader.module_asts['mid']
+        other_ast = self.loader.module_asts['other']
+        other_fn = self.evaluator.get_variable('other')
+        
+        self.write_module('base', "fn rate() { return 3; }")
+        assert self.loader.reload('base') == ['base', 'mid']
+        assert self.call('scaled', 5) == 15
+        # Dependents re-run from their cached AST; unrelated modules are untouched
+        assert self.loader.module_asts['mid'] is mid_ast
+        assert self.loader.module_asts['other'] is other_ast
+        assert self.evaluator.get_variable('other') is other_fn
+    
+    def test_reload_rebinds_closures(self):
+        # Imported inside make(), so inner() holds scaled in its closure
+        code = "fn make() { import mid; fn inner(x) { return scaled(x); } return inner; } let run = make();"
+        self.evaluator.eval(Parser(Lexer(code).tokenize()).parse())
+        assert self.call('run', 5) == 10
+        self.write_module('base', "fn rate() { return 3; }")
+        self.loader.reload('base')
+        assert self.call('run', 5) == 15
+    
+    def test_reload_keeps_importer_settings(self):
+        evaluator = Evaluator(lazy_imports=True)
+        evaluator.module_loader = loader = ModuleLoader([self.tmpdir])
+        evaluator.eval(Parser(Lexer("import mid; let y = scaled(1);").tokenize()).parse())
+        self.write_module('mid', "import base; fn scaled(x) { return x * rate() * 10; }")
+        loader.reload('mid')
+        scaled = evaluator.get_variable('scaled')
+        assert scaled.evaluator.lazy_imports and scaled.evaluator.rng is evaluator.rng
+        assert evaluator.call_function(scaled, [1]) == 20
+    
+    def test_reload_changed_uses_mtimes(self):
+        assert self.loader.reload_changed() == []
+        self.write_module('mid', "import base; fn scaled(x) { return x + rate(); }")
+        assert self.loader.reload_changed() == ['mid']
+        assert self.call('scaled', 5) == 7
+    
+    def test_failed_reload_keeps_old_exports(self):
+        self.write_module('base', "fn rate( {")
+        with self.assertRaises(Exception):
+            self.loader.reload('base')
+        assert self.call('scaled', 5) == 10
+        assert self.loader.dependents['base'] == {'mid'}
+
+
+class TestPrefetch(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.write_module('top', "import middle; fn top() { return middle() + 1; }")
+        self.write_module('middle', "fn middle() { import leaf; return leaf(); }")
+        self.write_module('leaf', "fn leaf() { return 41; }")
+        self.write_module('unused', "fn unused() { return 0; }")
+        self.write_module('broken', "fn oops( {")
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+    
+    def write_module(self, name, source):
+        with open(os.path.join(self.tmpdir, name + '.pypp'), 'w') as f:
+            f.write(source)
+    
+    def test_prefetch_parses_import_graph(self):
+        code = "import top; import lazy unused; import missing; import broken;"
+        ast = Parser(Lexer(code).tokenize()).parse()
+        loader = ModuleLoader([self.tmpdir])
+        assert sorted(loader.prefetch(ast)) == ['leaf', 'middle', 'top']
+        assert loader.loaded_modules == {}
+        assert 'unused' not in loader.module_asts
+    
+    def test_execution_uses_prefetched_asts(self):
+        ast = Parser(Lexer("import top; let y = top();").tokenize()).parse()
+        evaluator = Evaluator()
+        evaluator.module_loader = ModuleLoader([self.tmpdir])
+        evaluator.module_loader.prefetch(ast)
+        for name in ('top', 'middle', 'leaf'):
+            os.remove(os.path.join(self.tmpdir, name + '.pypp'))
+        evaluator.eval(ast)
+        assert evaluator.get_variable('y') == 42
+
+
+class TestNativeModules(unittest.TestCase):
+    
+    STDLIB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'stdlib')
+    CODE = """
+    import math; import string;
+    let a = power(3, 5); let b = power(2, -1); let c = abs(-4); let d = max(2, 9);
+    let e = repeat("ab", 3); let f = length(concat("x", "yz"));
+    """
+    
+    def run_code(self, code, loader):
+        ast = Parser(Lexer(code).tokenize()).parse()
+        evaluator = Evaluator()
+        evaluator.module_loader = loader
+        evaluator.eval(ast)
+        return evaluator
+    
+    def results(self, evaluator):
+        return [evaluator.get_variable(n) for n in 'abcdef']
+    
+    def test_native_modules_match_pypp_fallbacks(self):
+        native = self.run_code(self.CODE, ModuleLoader([self.STDLIB]))
+        interpreted = self.run_code(self.CODE, ModuleLoader([self.STDLIB], native=False))
+        assert self.results(native) == self.results(interpreted) == [243, 0.5, 4, 9, 'ababab', 3]
+        assert native.globals['abs'] is builtin_abs
+        assert isinstance(interpreted.globals['abs'], PyPPFunction)
+    
+    def test_native_repeat_checks_its_count(self):
+        for count in ('1.5', '"2"', 'true'):
+            with self.assertRaisesRegex(PyPPTypeError, "repeat\\(\\) count must be an int"):
+                self.run_code(f'import string; let s = repeat("ab", {count});', ModuleLoader([self.STDLIB]))
+    
+    def test_native_module_takes_precedence(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        with open(os.path.join(tmpdir, 'math.pypp'), 'w') as f:
+            f.write("fn square(x) { return 0; }")
+        evaluator = self.run_code("import math; let y = square(3);", ModuleLoader([tmpdir]))
+        assert evaluator.get_variable('y') == 9
+    
+    def test_register_native(self):
+        loader = ModuleLoader([self.STDLIB])
+        loader.register_native('geo', types.SimpleNamespace(EXPORTS={'area': lambda w, h: w * h}))
+        assert loader.scan_exports('geo') == ['area']
+        evaluator = self.run_code("import lazy geo; let y = area(3, 4);", loader)
+        assert evaluator.get_variable('y') == 12
+    
+    def test_failed_native_import_falls_back(self):
+        loader = ModuleLoader([self.STDLIB])
+        loader.register_native('math', 'src.native.missing')
+        evaluator = self.run_code("import math; let y = cube(2);", loader)
+        assert evaluator.get_variable('y') == 8
+        assert isinstance(evaluator.globals['cube'], PyPPFunction)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""Tests for pmap and shipping functions to worker processes."""
+
+import unittest
+import sys
+import os
+import pickle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import parallel
+from src.advanced import PyPPArray, PyPPObject
+from src.evaluator import Evaluator
+from src.lexer import Lexer
+from src.parser import Parser
+from src.errors import RuntimeError as PyPPRuntimeError, TypeError as PyPPTypeError
+
+def run(evaluator, source):
+    return evaluator.eval(Parser(Lexer(source).tokenize()).parse())
+
+class TestShip(unittest.TestCase):
+    
+    def test_ship_captures_used_names(self):
+        evaluator = Evaluator()
+        run(evaluator, """
+let k = 3;
+let unused = 99;
+fn helper(x) { return x * k; }
+fn fact(n) { if (n <= 1) { return 1; } return n * fact(n - 1); }
+fn work(x) { return helper(x) + fact(3); }
+""")
+        shipped = parallel.ship(evaluator.get_variable('work'))
+        self.assertEqual(set(shipped.scope), {'helper', 'fact'})
+        self.assertEqual(shipped.scope['helper'].scope, {'k': 3})
+        # Recursion ships as a reference back to the same function
+        fact = shipped.scope['fact']
+        self.assertIs(fact.scope['fact'], fact)
+        
+        worker = Evaluator()
+        rebuilt = parallel.rebuild(pickle.loads(pickle.dumps(shipped)), worker)
+        self.assertEqual(worker.invoker(rebuilt)(2), 12)
+
+class TestPmap(unittest.TestCase):
+    
+    def setUp(self):
+        self.evaluator = Evaluator()
+        run(self.evaluator, """
+let k = 10;
+fn scale(x) { return x * k; }
+fn fact(n) { if (n <= 1) { return 1; } return n * fact(n - 1); }
+fn work(x) { return scale(x) + fact(4); }
+fn label(r) { return parse("{\\"id\\": 1}"); }
+fn bad(x) { return missing + x; }
+""")
+    
+    def pmap(self, fn, arr, options):
+        return run(self.evaluator, f'pmap({fn}, {arr}, parse("{options}"));')
+    
+    def test_order_and_chunks(self):
+        expected = [x * 10 + 24 for x in range(25)]
+        for options in ('{\\"workers\\": 2}', '{\\"workers\\": 3, \\"chunkSize\\": 4}',
+                        '{\\"workers\\": 2, \\"chunkSize\\": 100}'):
+            result = self.pmap('work', 'range(25)', options)
+            self.assertIsInstance(result, PyPPArray)
+            self.assertEqual(list(result), expected)
+    
+    def test_in_process(self):
+        # One worker runs in this process, where globals are live
+        result = self.pmap('scale', 'range(3)', '{\\"workers\\": 1}')
+        self.assertEqual(list(result), [0, 10, 20])
+        self.assertEqual(list(self.pmap('scale', 'array()', '{\\"workers\\": 2}')), [])
+    
+    def test_values_round_trip(self):
+        result = self.pmap('label', 'array("a", "b")', '{\\"workers\\": 2}')
+        self.assertIsInstance(result.get(0), PyPPObject)
+        self.assertEqual(result.get(1).properties, {'id': 1})
+        self.assertEqual(list(self.pmap('sqrt', 'array(4, 9)', '{\\"workers\\": 2}')), [2.0, 3.0])
+    
+    def test_errors(self):
+        with self.assertRaises(PyPPRuntimeError):
+            self.pmap('bad', 'range(4)', '{\\"workers\\": 2}')
+        with self.assertRaises(PyPPRuntimeError):
+            self.pmap('work', 'range(4)', '{\\"workers\\": 0}')
+        with self.assertRaises(PyPPRuntimeError):
+            self.pmap('work', 'range(4)', '{\\"chunkSize\\": -1}')
+        with self.assertRaises(PyPPTypeError):
+            run(self.evaluator, 'pmap(work, 5);')
+        with self.assertRaises(PyPPTypeError):
+            run(self.evaluator, 'pmap(5, range(3), parse("{\\"workers\\": 2}"));')
+
+if __name__ == '__main__':
+    unittest.main()
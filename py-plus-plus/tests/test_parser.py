@@ -8,6 +8,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.lexer import Lexer
 from src.parser import Parser
 from src.ast_nodes import *
+from src.errors import ParserError
 
 class TestParser(unittest.TestCase):
     
@@ -48,6 +49,52 @@ class TestParser(unittest.TestCase):
         stmt = ast.statements[0]
         assert isinstance(stmt.value, BinaryOp)
         assert stmt.value.op == '+'
+    
+    def test_lazy_import(self):
+        ast = self.parse_code("import lazy math; import lazy;")
+        assert ast.statements[0].module_name == 'math'
+        assert ast.statements[0].lazy
+        assert ast.statements[1].module_name == 'lazy'
+        assert not ast.statements[1].lazy
+    
+    def test_import_keyword_module_name(self):
+        ast = self.parse_code("import string; import lazy string;")
+        assert ast.statements[0].module_name == 'string'
+        assert ast.statements[1].lazy
+    
+    def test_foreign_import(self):
+        ast = self.parse_code('import py "zlib" as z { crc32(bytes) -> int; flush(); } import py;')
+        node = ast.statements[0]
+        assert (node.path, node.alias) == ('zlib', 'z')
+        assert node.signatures == {'crc32': (['bytes'], 'int'), 'flush': ([], None)}
+        assert ast.statements[1].module_name == 'py'
+    
+    def test_decorators(self):
+        ast = self.parse_code("@trace @memo(100, 5) fn f(n) { return n; } fn g() {}")
+        decl = ast.statements[0]
+        assert isinstance(decl, FunctionDecl) and decl.name == 'f'
+        assert [d.func.name for d in decl.decorators] == ['trace', 'memo']
+        assert [arg.value for arg in decl.decorators[1].args] == [100, 5]
+        assert decl.decorators[0].args == []
+        assert ast.statements[1].decorators == []
+        with self.assertRaises(ParserError):
+            self.parse_code("@memo let x = 1;")
+    
+    def test_async_await(self):
+        ast = self.parse_code("async fn f(x) { return await g(x); } @memo async fn h() {} let y = await f(1);")
+        decl = ast.statements[0]
+        assert isinstance(decl, FunctionDecl) and decl.is_async
+        ret = decl.body.statements[0]
+        assert isinstance(ret.value, AwaitExpression)
+        assert isinstance(ret.value.value, CallExpression)
+        assert ast.statements[1].is_async and ast.statements[1].decorators
+        # Top-level await is allowed; await in a plain fn is not
+        assert isinstance(ast.statements[2].value, AwaitExpression)
+        assert not self.parse_code("fn g() {}").statements[0].is_async
+        with self.assertRaises(ParserError):
+            self.parse_code("fn f() { return await g(); }")
+        with self.assertRaises(ParserError):
+            self.parse_code("async fn f() { fn g() { await h(); } }")
 
 if __name__ == '__main__':
     unittest.main()
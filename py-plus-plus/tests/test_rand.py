@@ -0,0 +1,102 @@
+"""Tests for seedable and bulk random generation."""
+
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import rand
+from src.advanced import PyPPArray, PyPPRange
+from src.evaluator import Evaluator
+from src.module_loader import ModuleLoader
+from src.lexer import Lexer
+from src.parser import Parser
+from src.errors import RuntimeError as PyPPRuntimeError, TypeError as PyPPTypeError
+
+def run(evaluator, source):
+    return evaluator.eval(Parser(Lexer(source).tokenize()).parse())
+
+class TestRandomSource(unittest.TestCase):
+    
+    def check_both_paths(self, fn):
+        """Run fn with and without NumPy; each must be reproducible from a seed."""
+        results = [fn(), fn()]
+        if rand.np is not None:
+            saved, rand.np = rand.np, None
+            try:
+                results += [fn(), fn()]
+            finally:
+                rand.np = saved
+        for first, second in zip(results[::2], results[1::2]):
+            self.assertEqual(first, second)
+        return results[0]
+    
+    def test_seeded_bulk_draws(self):
+        def draw():
+            source = rand.RandomSource(7)
+            return (list(source.random_array(100)), list(source.randint_array(100, -3, 3)),
+                    source.random(), source.randint(1, 6))
+        floats, ints, _, _ = self.check_both_paths(draw)
+        assert all(0 <= x < 1 for x in floats)
+        assert set(ints) <= set(range(-3, 4)) and len(set(ints)) > 1
+    
+    def test_compact_storage(self):
+        source = rand.RandomSource(1)
+        assert source.random_array(3).items.typecode == 'd'
+        assert source.randint_array(3, 0, 9).items.typecode == 'q'
+        assert source.random_array(0).length() == 0
+        big = source.randint_array(3, 2 ** 70, 2 ** 70 + 1)
+        assert all(2 ** 70 <= x <= 2 ** 70 + 1 for x in big)
+    
+    def test_shuffle_sample_choice(self):
+        def draw():
+            source = rand.RandomSource(3)
+            numbers = PyPPRange(range(20))
+            words = PyPPArray(["a", "b", "c", "d", "e"])
+            assert source.shuffle(numbers) is numbers
+            source.shuffle(words)
+            picked = source.sample(PyPPArray([1.5, 2.5, 3.5, 4.5]), 3)
+            return list(numbers), list(words), list(picked), source.choice(words)
+        numbers, words, picked, chosen = self.check_both_paths(draw)
+        assert sorted(numbers) == list(range(20)) and numbers != list(range(20))
+        assert sorted(words) == ["a", "b", "c", "d", "e"]
+        assert len(set(picked)) == 3 and set(picked) <= {1.5, 2.5, 3.5, 4.5}
+        assert chosen in words
+    
+    def test_errors(self):
+        source = rand.RandomSource()
+        self.assertRaises(PyPPRuntimeError, source.seed, -1)
+        self.assertRaises(PyPPRuntimeError, source.random_array, -1)
+        self.assertRaises(PyPPTypeError, source.random_array, 2.5)
+        self.assertRaises(PyPPRuntimeError, source.randint_array, 3, 5, 1)
+        self.assertRaises(PyPPRuntimeError, source.sample, PyPPArray([1]), 2)
+        self.assertRaises(PyPPRuntimeError, source.choice, PyPPArray())
+        self.assertRaises(PyPPTypeError, source.shuffle, "abc")
+
+class TestEvaluatorRandom(unittest.TestCase):
+    
+    def test_seed_is_per_evaluator(self):
+        first, second = Evaluator(), Evaluator()
+        source = "seed(5); let xs = randomArray(4); let r = randint(1, 100);"
+        run(first, source)
+        run(second, "seed(6);")
+        run(second, source)
+        assert list(first.get_variable('xs')) == list(second.get_variable('xs'))
+        assert first.get_variable('r') == second.get_variable('r')
+        assert first.get_variable('random') is not second.get_variable('random')
+    
+    def test_modules_share_importer_generator(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, 'dice.pypp'), 'w') as f:
+                f.write("fn roll() { return randint(1, 1000000); }")
+            results = []
+            for _ in range(2):
+                evaluator = Evaluator()
+                evaluator.module_loader = ModuleLoader([tmpdir])
+                run(evaluator, "import dice; seed(9); let r = roll();")
+                results.append(evaluator.get_variable('r'))
+            assert results[0] == results[1]
+
+if __name__ == '__main__':
+    unittest.main()
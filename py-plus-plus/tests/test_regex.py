@@ -0,0 +1,93 @@
+"""Tests for the regex builtins and the compiled-pattern cache."""
+
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import regex
+from src.advanced import StrView
+from src.builtins_advanced import BUILTINS
+from src.errors import RuntimeError as PyPPRuntimeError, TypeError as PyPPTypeError
+
+LINE = "2024-01-05 ERROR disk full on /dev/sda1"
+
+class TestRegexBuiltins(unittest.TestCase):
+    
+    def setUp(self):
+        regex.PATTERNS.clear()
+    
+    def test_match_and_search(self):
+        assert str(BUILTINS['match'](LINE, r"(\d+)-(\d+)")) == "[2024-01, 2024, 01]"
+        assert BUILTINS['match'](LINE, "ERROR") is None
+        assert list(BUILTINS['search'](LINE, r"(ERROR|WARN) (\w+)(x)?")) == ["ERROR disk", "ERROR", "disk", None]
+        assert BUILTINS['search'](StrView(LINE, 11, 16), "^ERROR$") is not None
+    
+    def test_find_all(self):
+        assert list(BUILTINS['findAll'](LINE, r"\d+")) == ["2024", "01", "05", "1"]
+        assert list(BUILTINS['findAll'](LINE, r"/(\w+)")) == ["dev", "sda1"]
+        pairs = BUILTINS['findAll']("a=1 b=2", r"(\w)=(\d)")
+        assert [list(pair) for pair in pairs] == [["a", "1"], ["b", "2"]]
+    
+    def test_replace_and_split(self):
+        assert BUILTINS['regexReplace']("a1b22", r"\d+", "#") == "a#b#"
+        assert BUILTINS['regexReplace']("a1b22", r"(\d)", r"<\1>", 1) == "a<1>b22"
+        assert BUILTINS['regexReplace']("a1b22", r"\d+", lambda groups: len(groups.get(0))) == "a1b2"
+        assert list(BUILTINS['regexSplit']("a, b;c", r"[,;]\s*")) == ["a", "b", "c"]
+        assert list(BUILTINS['regexSplit']("a,b,c", ",", 1)) == ["a", "b,c"]
+    
+    def test_handle(self):
+        handle = BUILTINS['regex']("error", "i")
+        assert BUILTINS['type'](handle) == "regex"
+        assert str(handle) == "/error/i"
+        assert BUILTINS['search'](LINE, handle).get(0) == "ERROR"
+        # Handles never go through the cache
+        assert regex.PATTERNS.stats()['regexCacheMisses'] == 0
+        self.assertRaises(PyPPRuntimeError, BUILTINS['regex'], "a", "q")
+    
+    def test_errors(self):
+        self.assertRaises(PyPPRuntimeError, BUILTINS['search'], LINE, "(")
+        self.assertRaises(PyPPTypeError, BUILTINS['search'], LINE, 5)
+        self.assertRaises(PyPPTypeError, BUILTINS['search'], 5, "x")
+
+class TestPatternCache(unittest.TestCase):
+    
+    def test_counts_hits_and_misses(self):
+        cache = regex.PatternCache()
+        first = cache.compile(r"\d+")
+        assert cache.compile(r"\d+") is first
+        cache.compile(r"\d+", "i")
+        assert (cache.hits, cache.misses) == (1, 2)
+    
+    def test_evicts_least_recently_used(self):
+        cache = regex.PatternCache(size=2)
+        cache.compile("a")
+        cache.compile("b")
+        cache.compile("a")
+        cache.compile("c")
+        assert list(cache.patterns) == [("a", ""), ("c", "")]
+        assert cache.resize(1) == 2
+        assert list(cache.patterns) == [("c", "")]
+        self.assertRaises(PyPPRuntimeError, cache.resize, -1)
+    
+    def test_size_zero_disables(self):
+        cache = regex.PatternCache(size=0)
+        cache.compile("a")
+        cache.compile("a")
+        assert cache.stats()['regexCacheMisses'] == 2 and not cache.patterns
+    
+    def test_runtime_stats(self):
+        regex.PATTERNS.clear()
+        old = BUILTINS['regexCacheSize'](8)
+        try:
+            for _ in range(3):
+                BUILTINS['search'](LINE, "disk")
+            stats = BUILTINS['runtimeStats']()
+            assert stats.get('regexCacheHits') == 2
+            assert stats.get('regexCacheMisses') == 1
+            assert stats.get('regexCacheSize') == 8
+        finally:
+            BUILTINS['regexCacheSize'](old)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""Tests for arrays in shared memory."""
+
+import unittest
+import sys
+import os
+import pickle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import shared
+from src.advanced import PyPPArray, ArrayMath
+from src.evaluator import Evaluator
+from src.lexer import Lexer
+from src.parser import Parser
+from src.errors import RuntimeError as PyPPRuntimeError, TypeError as PyPPTypeError
+from interpreter import interpret
+
+def run(evaluator, source):
+    return evaluator.eval(Parser(Lexer(source).tokenize()).parse())
+
+class TestSharedArray(unittest.TestCase):
+    
+    def setUp(self):
+        self.ints = shared.share(PyPPArray([3, 1, 2]))
+        self.floats = shared.create(4)
+    
+    def tearDown(self):
+        self.ints.release()
+        self.floats.release()
+    
+    def test_array_operations(self):
+        self.assertEqual(list(self.ints), [3, 1, 2])
+        self.assertEqual(list(self.floats), [0.0] * 4)
+        self.assertEqual(ArrayMath.sum(self.ints), 6)
+        self.assertEqual(ArrayMath.argmax(self.ints), 0)
+        self.assertEqual(self.ints.indexOf(2), 2)
+        self.assertTrue(self.ints.includes(1))
+        self.ints.sort()
+        self.assertEqual(list(self.ints), [1, 2, 3])
+        self.ints.reverse()
+        self.assertEqual(list(self.ints), [3, 2, 1])
+        self.floats.set(1, 2)
+        self.assertEqual(self.floats.get(1), 2.0)
+        self.assertEqual(list(ArrayMath.add(self.floats, 1.0)), [1.0, 3.0, 1.0, 1.0])
+    
+    def test_fixed_length_and_type(self):
+        with self.assertRaises(PyPPRuntimeError):
+            self.ints.push(4)
+        with self.assertRaises(PyPPRuntimeError):
+            self.ints.shift()
+        with self.assertRaises(PyPPTypeError):
+            self.ints.set(0, 1.5)
+        with self.assertRaises(PyPPRuntimeError):
+            self.ints.set(0, 2 ** 70)
+        with self.assertRaises(PyPPTypeError):
+            shared.share(PyPPArray(["a"]))
+    
+    def test_pickle_attaches(self):
+        other = pickle.loads(pickle.dumps(self.ints))
+        self.assertFalse(other.owner)
+        other.set(0, 30)
+        self.assertEqual(self.ints.get(0), 30)
+        other.release()
+        # Releasing an attached copy leaves the segment to its owner
+        self.assertEqual(self.ints.get(0), 30)
+    
+    def test_release(self):
+        name = self.ints.name
+        view = self.ints.slice(0, 3)
+        self.ints.release()
+        self.ints.release()
+        self.assertTrue(self.ints.released)
+        self.assertNotIn(name, shared.SEGMENTS.owned)
+        with self.assertRaises(PyPPRuntimeError):
+            self.ints.length()
+        self.assertEqual(list(view), [3, 1, 2])
+        with self.assertRaises(PyPPRuntimeError):
+            shared.attach(name, 'q', 3)
+
+class TestSharedBuiltins(unittest.TestCase):
+    
+    def test_script(self):
+        evaluator = Evaluator()
+        result = run(evaluator, """
+let data = share(range(20));
+let weights = sharedArray(2, "int");
+fn work(x) { return x * 2 + sum(weights); }
+let doubled = pmap(work, data, parse("{\\"workers\\": 2, \\"chunkSize\\": 3}"));
+sum(data) + sum(doubled);
+""")
+        self.assertEqual(result, 190 * 3)
+        data = evaluator.get_variable('data')
+        self.assertIsInstance(data, shared.SharedArray)
+        run(evaluator, 'release(data); release(weights);')
+        self.assertTrue(data.released)
+        with self.assertRaises(PyPPTypeError):
+            run(evaluator, 'release(array(1));')
+    
+    def test_released_when_script_fails(self):
+        before = set(shared.SEGMENTS.owned)
+        with self.assertRaises(PyPPRuntimeError):
+            interpret('let a = sharedArray(10); push(a, 1.0);')
+        self.assertEqual(set(shared.SEGMENTS.owned), before)
+
+if __name__ == '__main__':
+    unittest.main()
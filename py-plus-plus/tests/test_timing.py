@@ -0,0 +1,60 @@
+"""Tests for the timing builtins."""
+
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import timing
+from src.builtins_advanced import BUILTINS, builtin_json_parse
+from src.errors import RuntimeError as PyPPRuntimeError, TypeError as PyPPTypeError
+
+class TestClocks(unittest.TestCase):
+    
+    def test_monotonic(self):
+        assert type(BUILTINS['monotonicNs']()) is int
+        first, second = BUILTINS['perfNow'](), BUILTINS['perfNow']()
+        assert second >= first
+
+class TestBench(unittest.TestCase):
+    
+    def test_fixed_iterations(self):
+        calls = []
+        options = builtin_json_parse('{"warmup": 2, "iterations": 3, "repeat": 4}')
+        result = BUILTINS['bench'](lambda: calls.append(1), options)
+        assert len(calls) == 2 + 3 * 4
+        assert result.get('iterations') == 3 and result.get('repetitions') == 4
+        assert result.get('min') <= result.get('median') <= result.get('p95')
+        assert result.get('opsPerSec') > 0
+    
+    def test_calibrates_to_min_time(self):
+        count = timing.calibrate(lambda: None, 0.001)
+        assert count in (1, 2, 5) or str(count).strip('0') in ('1', '2', '5')
+        assert timing.time_batch(lambda: None, count) > 0
+    
+    def test_percentile(self):
+        assert timing.percentile([1, 2, 3, 4], 0.5) == 2
+        assert timing.percentile([1, 2, 3, 4], 0.95) == 4
+        assert timing.percentile([7], 0.95) == 7
+    
+    def test_errors(self):
+        self.assertRaises(PyPPTypeError, BUILTINS['bench'], 5)
+        self.assertRaises(PyPPTypeError, BUILTINS['bench'], lambda: None, 5)
+        self.assertRaises(PyPPRuntimeError, timing.bench, lambda: None, repetitions=0)
+    
+    def test_from_source(self):
+        import io
+        from contextlib import redirect_stdout
+        from interpreter import interpret
+        code = """
+        fn work() { return 1 + 1; }
+        let r = bench(work, parse("{\\"minTime\\": 0.001, \\"repeat\\": 3}"));
+        print(get(r, "repetitions"), get(r, "min") > 0);
+        """
+        f = io.StringIO()
+        with redirect_stdout(f):
+            interpret(code)
+        assert f.getvalue().strip() == "3 True"
+
+if __name__ == '__main__':
+    unittest.main()